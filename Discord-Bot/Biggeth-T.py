@@ -1,81 +1,112 @@
 import nextcord
 from nextcord.ext import commands
 from nextcord import Activity, ActivityType
-import json
 import time
+import math
 import random
 from datetime import datetime, timedelta, timezone
-import asyncio
 import os
-
-# Load and save JSON functions (same as before)
-def load_json(file_path):
-    try:
-        with open(file_path, 'r') as file:
-            return json.load(file)
-    except FileNotFoundError:
-        return {"players": {}}
-    except json.JSONDecodeError:
-        return {"players": {}}
-
-def save_json(file_path, data):
-    try:
-        with open(file_path, 'w') as file:
-            json.dump(data, file, indent=4)
-    except Exception as e:
-        print(f"Error saving data to {file_path}: {e}")
+import functools
+
+from player_store import PlayerStore, JsonBackend
+from sqlite_backend import SqliteBackend
+from sharded_backend import ShardedJsonBackend
+from binary_backend import BinaryBackend
+from scheduler import Scheduler
+from cooldowns import CooldownStore
+from rate_limit import RateLimiter
+from lag_monitor import LagMonitor
+from upgrades import UPGRADES
+from drop_table import FARM_RESOURCES, FarmRoller
+from game_rules import (COINFLIP_BETS, COINFLIP_REBIRTHS, COINFLIP_SIDES, DAILY_MONEY, DAILY_RESOURCES, MAX_BET_IN_DEBT,
+                        PLINKO_OUTCOMES, PLINKO_REBIRTHS, PLINKO_WEIGHTS, SELL_PRICES, TREASURE_PRICES,
+                        MILK_PRICE_PER_LEVEL, REBIRTH_MULTIPLIER, daily_reward, milk_price, rebirth_price, sell_price)
+from player_schema import Player, migrate_player, new_player, pack_player
+
+# Where players are stored: "json" (DATA_FILE plus JOURNAL_FILE), "sqlite" (DATABASE_FILE),
+# "sharded" (one file per shard in SHARD_DIR) or "binary" (RECORDS_FILE plus RECORDS_SIDE_FILE).
+# Use migrate_to_sqlite.py, reshard.py or migrate_to_binary.py to copy an existing data.json over first.
+STORAGE_BACKEND = "json"
 
 # Example of loading and saving with a custom file path
 DATA_FILE = os.path.join(os.getcwd(), 'data.json')
-
-# Ensure the path is correct
-if not os.path.exists(DATA_FILE):
-    print(f"File {DATA_FILE} does not exist. It will be created.")
-
-# Load existing data
-config = load_json(DATA_FILE)
+DATABASE_FILE = os.path.join(os.getcwd(), 'data.db')
+SCHEDULE_FILE = os.path.join(os.getcwd(), 'schedule.json')
+COOLDOWN_FILE = os.path.join(os.getcwd(), 'cooldowns.json')
+SHARD_DIR = os.path.join(os.getcwd(), 'players')
+RECORDS_FILE = os.path.join(os.getcwd(), 'players.bin')
+RECORDS_SIDE_FILE = os.path.join(os.getcwd(), 'players.side.json')
+
+# Number of shards for a new SHARD_DIR; an existing one keeps its count (change it with reshard.py)
+SHARD_COUNT = 16
+
+# Changed players are appended to this journal instead of rewriting DATA_FILE each time.
+# Set to None to rewrite the whole DATA_FILE on every flush instead.
+JOURNAL_FILE = DATA_FILE + ".journal"
+
+# Indentation of DATA_FILE; None writes compact JSON (smaller and faster), 4 is easier to edit by hand
+DATA_FILE_INDENT = None
+
+# How often (in seconds) changed players are written out (one fsync per batch)
+FLUSH_INTERVAL = 1
+
+# How often (in seconds) the journal (or SQLite WAL) is folded back into a fresh snapshot
+COMPACT_INTERVAL = 300
+
+if STORAGE_BACKEND == "sqlite":
+    backend = SqliteBackend(DATABASE_FILE, pack=pack_player)
+elif STORAGE_BACKEND == "binary":
+    backend = BinaryBackend(RECORDS_FILE, RECORDS_SIDE_FILE)
+elif STORAGE_BACKEND == "sharded":
+    backend = ShardedJsonBackend(SHARD_DIR, shard_count=SHARD_COUNT, pack=pack_player, indent=DATA_FILE_INDENT)
+else:
+    # Ensure the path is correct
+    if not os.path.exists(DATA_FILE):
+        print(f"File {DATA_FILE} does not exist. It will be created.")
+    # Records are written without their default-valued fields; migrate_player fills them back in on load.
+    # watch=True picks up records edited by hand in DATA_FILE (e.g. a ban) while the bot is running.
+    backend = JsonBackend(DATA_FILE, journal_path=JOURNAL_FILE, pack=pack_player, indent=DATA_FILE_INDENT, watch=True)
+
+# Stats shown on /leaderboard; the store keeps a ranked index for each
+LEADERBOARD_CATEGORIES = ("rebirths", "money", "daily_streak")
+
+# Stats the store mirrors into NumPy columns for /economy (skipped when numpy isn't installed)
+ECONOMY_STATS = ("money", "debt", "rebirths", "total_earnings", "total_gambled", "total_earned_or_lost", "farm_usage_count")
+
+# Load existing data once; all commands read and update this in-memory store
+store = PlayerStore(backend, flush_interval=FLUSH_INTERVAL, compact_interval=COMPACT_INTERVAL, ranked_stats=LEADERBOARD_CATEGORIES,
+                    migrate=migrate_player, record=Player.from_dict,  # Commands work on Player objects
+                    column_stats=ECONOMY_STATS, flag_fields=("has_registered", "banned"))
+
+# Every timed game event (cow full, daily streak expiry, ...) runs from this one scheduler
+scheduler = Scheduler(SCHEDULE_FILE)
+
+# Warns whenever something holds up the event loop (and with it the gateway heartbeat) for too long
+LAG_WARNING = 0.25
+lag_monitor = LagMonitor(warn_after=LAG_WARNING)
+
+# Token buckets checked before any command runs: each player holds up to USER_BURST tokens, refilling at
+# USER_RATE per second, and everyone shares GLOBAL_BURST tokens refilling at GLOBAL_RATE per second.
+# A command costs 1 token unless it sets cost= in player_command.
+USER_RATE = 2
+USER_BURST = 10
+GLOBAL_RATE = 100
+GLOBAL_BURST = 300
+rate_limiter = RateLimiter(USER_RATE, USER_BURST, GLOBAL_RATE, GLOBAL_BURST)
+config = store.data
 
 intents = nextcord.Intents.default()
 intents.message_content = True
 
 client = commands.Bot(command_prefix="!", intents=intents)
-farming_cooldowns = {}
-
-def get_player_data(user_id, interaction=None):
-    data = load_json(DATA_FILE)
-    user_id_str = str(user_id)
-
-    # Default stats for a new player
-    default_stats = {
-        "wheat": 0, "wood": 0, "money": 0,
-        "stone": 0, "hardwood": 0, "iron_ore": 0, "silver_ore": 0, "gold_ore": 0, 
-        "rebirths": 0, "rebirth_multiplier": 1,
-        "farming_cooldown_level": 0, "wheat_upgrade_level": 0, "wood_upgrade_level": 0,
-        "wheat_price_upgrade_level": 0, "wood_price_upgrade_level": 0,
-        "stone_upgrade_level": 0, "hardwood_upgrade_level": 0, "iron_ore_upgrade_level": 0,
-        "silver_ore_upgrade_level": 0, "gold_ore_upgrade_level": 0,
-        "stone_price_upgrade_level": 0, "hardwood_price_upgrade_level": 0,
-        "iron_ore_price_upgrade_level": 0, "silver_ore_price_upgrade_level": 0,
-        "gold_ore_price_upgrade_level": 0, "milk_price_upgrade_level": 0, 
-    }
 
-    if user_id_str not in data["players"]:
-        # Create new data for the user
-        data["players"][user_id_str] = default_stats
-        
-        if interaction:
-            data["players"][user_id_str]["username"] = interaction.user.display_name
-    else:
-        # Ensure all default stats are present
-        for key, value in default_stats.items():
-            if key not in data["players"][user_id_str]:
-                data["players"][user_id_str][key] = value
-        if "username" not in data["players"][user_id_str] and interaction:
-            data["players"][user_id_str]["username"] = interaction.user.display_name
+# Running /farm cooldowns, saved to COOLDOWN_FILE on shutdown (set it to None to start fresh after every restart)
+farming_cooldowns = CooldownStore(COOLDOWN_FILE)
+farming_cooldowns.load()
 
-    # Save the updated data
-    save_json(DATA_FILE, data)
-    return data["players"][user_id_str], data
+# Set to a number to make every /farm replayable from (FARM_SEED, user ID, farm number)
+FARM_SEED = None
+farm_roller = FarmRoller(seed=FARM_SEED)
 
 
 @client.event
@@ -83,15 +114,139 @@ async def on_ready():
     print(f"Bot is connected as {client.user}")
     activity = Activity(type=ActivityType.playing, name="Farming the lands!")
     await client.change_presence(activity=activity)
+    store.start()  # Begin writing changed players back in the background
+    scheduler.start()  # Begin running timed events (overdue ones fire right away)
+    lag_monitor.start()
+
+# Enforce user registration check for all commands
+def is_registered(user_id):
+    """Check if a user has registered."""
+    return str(user_id) in store.flagged["has_registered"]
+
+# Enforce user isn't banned for all commands
+# To ban a user, add the key below to the user's data.
+# "banned": true
+# With the JSON backend this works while the bot is running: the edit is picked up within FLUSH_INTERVAL seconds.
+def is_banned(user_id):
+    """Check if a user is banned."""
+    return str(user_id) in store.flagged["banned"]
+
+
+class CommandContext:
+    """What a player_command handler gets instead of the bare interaction."""
+
+    __slots__ = ("interaction", "user_id", "player")
+
+    def __init__(self, interaction, user_id, player):
+        self.interaction = interaction
+        self.user_id = user_id
+        self.player = player  # The caller's record (a read-only view unless writes=True), or None
+
+
+class HeldResponse:
+    """Stands in for interaction.response while a writing handler holds the player's lock.
+
+    The handler's send_message() is only recorded; player_command sends it once
+    the transaction has committed, so a slow Discord round-trip never keeps the
+    player locked (and their timed events waiting).
+    """
+
+    __slots__ = ("reply",)
+
+    def __init__(self):
+        self.reply = None  # (args, kwargs) of the held send_message call
+
+    async def send_message(self, *args, **kwargs):
+        self.reply = (args, kwargs)
+
+
+class HeldInteraction:
+    """An interaction whose response is a HeldResponse; everything else comes from the real one."""
+
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self.response = HeldResponse()
+
+    def __getattr__(self, name):
+        return getattr(self._interaction, name)
+
+    async def send_reply(self):
+        if self.response.reply is not None:
+            args, kwargs = self.response.reply
+            await self._interaction.response.send_message(*args, **kwargs)
+
+
+# Calls that take longer than this (in seconds) get logged
+SLOW_COMMAND = 0.5
+
+# Per-command timings: name -> [calls, total seconds, slowest call]
+command_timings = {}
+
+def record_timing(name, elapsed):
+    timing = command_timings.get(name)
+    if timing is None:
+        timing = command_timings[name] = [0, 0.0, 0.0]
+    timing[0] += 1
+    timing[1] += elapsed
+    timing[2] = max(timing[2], elapsed)
+    if elapsed > SLOW_COMMAND:
+        print(f"Slow command /{name}: {elapsed * 1000:.0f} ms")
+
+
+def player_command(name, description, registered=True, writes=False, cost=1):
+    """Register a slash command behind the checks every command shares.
+
+    The caller is turned away, with nothing looked up in the store, if the rate
+    limiter is short of cost tokens for them, then if they aren't registered
+    (unless registered=False) or are banned. Their record is looked up once and the handler is called with
+    a CommandContext instead of the interaction; any other options are passed
+    through. With writes=True the handler gets the live record inside a
+    store.transaction(), so the player is marked dirty once after it returns and
+    the record is rolled back if it raises; its reply is held back (see
+    HeldInteraction) and sent after the commit. Otherwise it gets a read-only
+    view. Every call is timed into command_timings.
+    """
+    def decorator(handler):
+        # functools.wraps keeps the handler's signature, which nextcord reads the options from
+        @functools.wraps(handler)
+        async def command(interaction: nextcord.Interaction, *args, **kwargs):
+            started = time.perf_counter()
+            user_id = interaction.user.id
+            try:
+                limited = rate_limiter.check(user_id, cost)
+                if limited == "user":
+                    await interaction.response.send_message(f"🐢 Slow down! Try again in {math.ceil(rate_limiter.wait_time(user_id, cost) * 10) / 10}s.", ephemeral=True)
+                    return
+                if limited == "global":
+                    await interaction.response.send_message("🚦 The bot is busy right now, please try again in a moment.", ephemeral=True)
+                    return
+
+                if registered and not is_registered(user_id):
+                    await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
+                    return
+                if is_banned(user_id):
+                    await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
+                    return
+
+                if writes and store.get(user_id) is not None:
+                    held = HeldInteraction(interaction)
+                    async with store.transaction(user_id) as player_data:
+                        await handler(CommandContext(held, user_id, player_data), *args, **kwargs)
+                    await held.send_reply()
+                else:
+                    player_data = None if writes else store.view(user_id)  # /register has no record yet
+                    await handler(CommandContext(interaction, user_id, player_data), *args, **kwargs)
+            finally:
+                record_timing(name, time.perf_counter() - started)
+
+        return client.slash_command(name=name, description=description)(command)
+    return decorator
+
+
+@player_command(name="help", description="Show all available commands.", registered=False)
+async def help_command(ctx):
+    interaction = ctx.interaction
 
-@client.slash_command(name="help", description="Show all available commands.")
-async def help_command(interaction: nextcord.Interaction):
-    user_id = interaction.user.id
-    data = load_json("data.json")
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
     help_message = """
     **🌟 Bot Commands:**
     📝 **/register** - Register to create your account!  
@@ -113,6 +268,7 @@ async def help_command(interaction: nextcord.Interaction):
 
     🔥 **/streak** - Check your current and highest streak!  
     🏆 **/leaderboard** - See the top players with the most rebirths, money, or highest daily streak! 
+    📊 **/economy** - See how much money is out there and how it's spread!
 
     🎰 **/plinko** - Gamble your money for a chance to win big! (7 rebirths required to use.) 
     🪙 **/coinflip** - Flip a coin and and have a chance to win alot of money! (12 rebirths required to use.)
@@ -123,253 +279,73 @@ async def help_command(interaction: nextcord.Interaction):
     await interaction.response.send_message(help_message)
 
 
-@client.slash_command(name="register", description="Register a new player and add your stats to the game")
-async def register(interaction: nextcord.Interaction):
+@player_command(name="register", description="Register a new player and add your stats to the game", registered=False, writes=True)
+async def register(ctx):
     """Register a new player and add their default stats to the data.json file"""
-    
-    # Default stats for a new player (inside the /register command)
-    default_stats = {
-    # General player information
-    "has_registered": True,
-    "username": "",  # Display name, can be added later
-    "total_earnings": 0,
-
-    # Resources and upgrades
-    "wheat": 0,
-    "wood": 0,
-    "stone": 0,
-    "hardwood": 0,
-    "iron_ore": 0,
-    "silver_ore": 0,
-    "gold_ore": 0,
-    "money": 0,
-    "debt": 0,
-    
-    # Upgrade levels
-    "wheat_upgrade_level": 0,
-    "wood_upgrade_level": 0,
-    "stone_upgrade_level": 0,
-    "hardwood_upgrade_level": 0,
-    "iron_ore_upgrade_level": 0,
-    "silver_ore_upgrade_level": 0,
-    "gold_ore_upgrade_level": 0,
-    "wheat_price_upgrade_level": 0,
-    "wood_price_upgrade_level": 0,
-    "stone_price_upgrade_level": 0,
-    "hardwood_price_upgrade_level": 0,
-    "iron_ore_price_upgrade_level": 0,
-    "silver_ore_price_upgrade_level": 0,
-    "gold_ore_price_upgrade_level": 0,
-    
-    # Rebirth & multipliers
-    "rebirths": 0,
-    "rebirth_multiplier": 1,
-
-    # Rare items
-    "candy": 0,
-    "weed": 0,
-    "rare_artifacts": 0,
-    "cucumber": 0,
-    "total_candy": 0,
-    "total_weed": 0,
-    "total_rare_artifacts": 0,
-    "total_cucumber": 0,
-    
-    # Farming stats
-    "farm_usage_count": 0,
-    "farming_cooldown_level": 0,
-    
-    # Daily streaks and claims
-    "daily_streak": 0,
-    "longest_streak": 0,
-    "total_claims": 0,
-    "last_daily_claim": None,
-
-    # Milk stats
-    "milk": 0,
-    "stored_milk": 0,
-    "total_milk": 0,
-    "milk_price_upgrade_level": 0,
-
-    # Cow ownership & production status
-    "cow_owned": False,
-    "production_on": False,
-    "cow_time_started": None,
-
-    # Gambling stats
-    "total_gambled": 0,
-    "total_earned_or_lost": 0,
-    "coinflip_uses": 0,
-
-}
-
+    interaction = ctx.interaction
     user_id_str = str(interaction.user.id)  # Get the user's ID as a string
 
-    # Load the existing data from the JSON file
-    data = load_json(DATA_FILE)
-
     # Check if the player is already registered
-    if user_id_str in data["players"]:
-        player_data = data["players"][user_id_str]
-
-        # If the player is registered but missing key data, treat it as incomplete
-        if "has_registered" in player_data and player_data["has_registered"]:
-            # Check if the player is fully registered (has necessary keys)
-            missing_keys = [key for key, value in default_stats.items() if key not in player_data]
-            
-            if missing_keys:
-                # Update missing keys
-                for key in missing_keys:
-                    player_data[key] = default_stats[key]
-                
-                # Save the updated data back to the JSON file
-                save_json(DATA_FILE, data)
-                await interaction.response.send_message(f"{interaction.user.display_name}, your data has been updated!", ephemeral=True)
-            else:
-                await interaction.response.send_message(f"{interaction.user.display_name}, you are already fully registered.", ephemeral=True)
+    player_data = store.get(user_id_str)
+    if player_data is not None:
+        if player_data.has_registered:
+            await interaction.response.send_message(f"{interaction.user.display_name}, you are already fully registered.", ephemeral=True)
         else:
-            # If the player is not fully registered, update their data
-            for key, value in default_stats.items():
-                if key not in player_data:
-                    player_data[key] = value
-            player_data["username"] = interaction.user.display_name  # Ensure the username is set
-
-            # Save the updated data back to the JSON file
-            save_json(DATA_FILE, data)
+            # Records are migrated to the full schema at load, so only the registration itself is missing
+            player_data.has_registered = True
+            player_data.username = interaction.user.display_name  # Ensure the username is set
+            store.mark_dirty(user_id_str)
             await interaction.response.send_message(f"{interaction.user.display_name}, you have been successfully registered!", ephemeral=True)
         return
 
     # If the player is not in the data at all, add them as a new player
-    data["players"][user_id_str] = default_stats
-    data["players"][user_id_str]["username"] = interaction.user.display_name  # Store their display name as the username
-
-    # Save the updated data back to the JSON file
-    save_json(DATA_FILE, data)
+    player_data = new_player(interaction.user.display_name)
+    player_data["has_registered"] = True
+    store.add(user_id_str, player_data)  # Fill the record in first: add() is what updates the registered set
 
     # Confirm registration to the player
     await interaction.response.send_message(f"Welcome {interaction.user.display_name}! You have been successfully registered.", ephemeral=True)
 
 
-# Enforce user registration check for all commands
-def is_registered(user_id, data):
-    """Check if a user has registered."""
-    user_id_str = str(user_id)
-    if user_id_str in data["players"]:
-        return data["players"][user_id_str].get("has_registered", False)
-    return False
-
-# Enforce user isn't banned for all commands
-# To ban a user, add the key below to the user's data.
-# "banned": true
-def is_banned(user_id, data):
-    """Check if a user is banned."""
-    user_id_str = str(user_id)
-    return data["players"].get(user_id_str, {}).get("banned", False)
-
-
 # Farm command
-@client.slash_command(name="farm", description="Farm resources!")
-async def farm(interaction: nextcord.Interaction):
-    user_id = interaction.user.id
-    data = load_json("data.json")
-    
-    # Check if the user is registered
-    if not is_registered(user_id, data):
-        await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
-        return
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
-    
-   
-    
-    player_data = data["players"][str(user_id)]
-    current_time = int(time.time())
-
-    # Track farm usage
-    player_data["farm_usage_count"] = player_data.get("farm_usage_count", 0) + 1
+@player_command(name="farm", description="Farm resources!", writes=True)
+async def farm(ctx):
+    interaction, user_id, player_data = ctx.interaction, ctx.user_id, ctx.player
 
-    cooldown_time = max(1, 5 - (player_data["farming_cooldown_level"] * 0.2))
+    cooldown_time = max(1, 5 - (player_data.farming_cooldown_level * 0.2))
 
-    if user_id in farming_cooldowns and current_time - farming_cooldowns[user_id] < cooldown_time:
-        time_left = round(cooldown_time - (current_time - farming_cooldowns[user_id]), 1)
-        await interaction.response.send_message(f"⏳ Wait {time_left}s before farming again.", ephemeral=True)
+    time_left = farming_cooldowns.remaining(user_id)
+    if time_left > 0:
+        await interaction.response.send_message(f"⏳ Wait {math.ceil(time_left * 10) / 10}s before farming again.", ephemeral=True)
         return
-    
-    wheat = int((random.randint(1, 10) + player_data["wheat_upgrade_level"] // 5) * player_data["rebirth_multiplier"]) + (player_data["wheat_upgrade_level"] * 2)
-    wood = int((random.randint(0, 4) + player_data["wood_upgrade_level"] // 5) * player_data["rebirth_multiplier"]) + (player_data["wood_upgrade_level"] * 2)
-
-    # Apply multiplier and upgrade levels to resources that are unlocked based on rebirth count
-    stone = int((random.randint(0, 2) + player_data["stone_upgrade_level"] // 5) * player_data["rebirth_multiplier"]) + (player_data["stone_upgrade_level"] * 2) if player_data["rebirths"] >= 5 else 0
-    hardwood = int((random.randint(0, 2) + player_data["hardwood_upgrade_level"] // 5) * player_data["rebirth_multiplier"]) + (player_data["hardwood_upgrade_level"] * 2) if player_data["rebirths"] >= 10 else 0
-    iron_ore = int((random.randint(0, 2) + player_data["iron_ore_upgrade_level"] // 5) * player_data["rebirth_multiplier"]) + (player_data["iron_ore_upgrade_level"] * 2) if player_data["rebirths"] >= 15 else 0
-    silver_ore = int((random.randint(0, 1) + player_data["silver_ore_upgrade_level"] // 5) * player_data["rebirth_multiplier"]) + (player_data["silver_ore_upgrade_level"] * 2) if player_data["rebirths"] >= 20 else 0
-    gold_ore = int((random.randint(0, 1) + player_data["gold_ore_upgrade_level"] // 5) * player_data["rebirth_multiplier"]) + (player_data["gold_ore_upgrade_level"] * 2) if player_data["rebirths"] >= 25 else 0
-
-
-
-    # Rare item drops
-    rare_artifact = 1 if random.randint(1, 1000) == 1 else 0
-    candy = 1 if random.randint(1, 250) == 1 else 0
-    weed = 1 if random.randint(1, 500) == 1 else 0
-    cucumber = 1 if random.randint(1, 100) == 1 else 0
-
-    # Update rare items in player data
-    if rare_artifact:
-        player_data["total_rare_artifacts"] = player_data.get("total_rare_artifacts", 0) + 1
-    if candy:
-        player_data["total_candy"] = player_data.get("total_candy", 0) + 1
-    if weed:
-        player_data["total_weed"] = player_data.get("total_weed", 0) + 1
-    if cucumber:
-        player_data["total_cucumber"] = player_data.get("total_cucumber", 0) + 1
-
-    player_data["rare_artifacts"] = player_data.get("rare_artifacts", 0) + rare_artifact
-    player_data["candy"] = player_data.get("candy", 0) + candy
-    player_data["weed"] = player_data.get("weed", 0) + weed
-    player_data["cucumber"] = player_data.get("cucumber", 0) + cucumber
-
-    # Update resources in player data
-    player_data["wheat"] += wheat
-    player_data["wood"] += wood
-    player_data["stone"] += stone
-    player_data["hardwood"] += hardwood
-    player_data["iron_ore"] += iron_ore
-    player_data["silver_ore"] += silver_ore
-    player_data["gold_ore"] += gold_ore
-
-    farming_cooldowns[user_id] = current_time
-    save_json("data.json", data)
-
-    # Construct response message dynamically
-    resources = {
-        "🌾 Wheat": (wheat, player_data["wheat"]),
-        "🪵 Wood": (wood, player_data["wood"]),
-        "🪨 Stone": (stone, player_data["stone"]),
-        "🌲 Hardwood": (hardwood, player_data["hardwood"]),
-        "⛏️ Iron Ore": (iron_ore, player_data["iron_ore"]),
-        "🥈 Silver Ore": (silver_ore, player_data["silver_ore"]),
-        "🥇 Gold Ore": (gold_ore, player_data["gold_ore"]),
-    }
 
-    resource_message = "\n".join(
-    [f"**{name}:** {amount} (*Total:* {total})" for name, (amount, total) in resources.items() if amount > 0]
-)
-
-    # Handle rare item drops with both current and total amounts
+    # Track farm usage (only farms that went through, so a rejected attempt changes nothing that needs saving)
+    player_data.farm_usage_count += 1
+    
+    # Resources and rare drops, rolled from pre-drawn random numbers (see drop_table.py)
+    gathered, found = farm_roller.roll(player_data, user_id, player_data.farm_usage_count)
+
+    # Update resources in player data, with a message line for each one gathered
+    # (getattr/setattr rather than player_data[key]: this runs for every resource on every farm)
+    resource_lines = []
+    for resource, amount in zip(FARM_RESOURCES, gathered):
+        if amount > 0:
+            total = getattr(player_data, resource.key) + amount
+            setattr(player_data, resource.key, total)
+            resource_lines.append(resource.line.format(amount, total))
+    resource_message = "\n".join(resource_lines)
+
+    # Update rare items in player data, with both current and total amounts for the message
     rare_items = []
-    if cucumber:
-        rare_items.append(f"🥒 **Wow! You found Larry the Cucumber! How the fuck can he talk..** \n   **Current Amount:** {player_data['cucumber']} | **Total cucumber Found:** {player_data['total_cucumber']}")
-    if candy:
-        rare_items.append(f"🍬 **Nice!! You found some Candy!** \n   **Current Amount:** {player_data['candy']} | **Total Candy Found:** {player_data['total_candy']}")
-    if weed:
-        rare_items.append(f"🍃 **Congratulations!!! You found some Weed!** \n   **Current Amount:** {player_data['weed']} | **Total Weed Found:** {player_data['total_weed']}")
-    if rare_artifact:
-        rare_items.append(f"🎉 **OH MY GOD!!!!! You found a Rare Artifact!** 🏺 \n   **Current Amount:** {player_data['rare_artifacts']} | **Total Rare Artifacts Found:** {player_data['total_rare_artifacts']}")
+    for drop in found:
+        player_data[drop.key] += 1
+        player_data[drop.total_key] += 1
+        rare_items.append(drop.message.format(player_data[drop.key], player_data[drop.total_key]))
+
+    farming_cooldowns.start(user_id, cooldown_time)
 
     # Track total farming usage
-    total_farmed_message = f"\n🚜 **Total Times Farmed:** {player_data['farm_usage_count']}"
+    total_farmed_message = f"\n🚜 **Total Times Farmed:** {player_data.farm_usage_count}"
 
     # Construct final message
     message = "🚜 **You gathered:**\n\n" + resource_message if resource_message else "😢 You didn't gather any resources!"
@@ -383,52 +359,77 @@ async def farm(interaction: nextcord.Interaction):
     await interaction.response.send_message(message, ephemeral=True)
 
 
-# Cow command
-@client.slash_command(name="cow", description="Collect milk from your cow!")
-async def cow(interaction: nextcord.Interaction):
-    user_id = interaction.user.id
-    data = load_json("data.json")
-    
-    # Check if the user is registered
-    if not is_registered(user_id, data):
-        await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
-        return
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
+# Milk production: a producing cow makes 1 milk every MILK_INTERVAL seconds, up to MILK_CAPACITY.
+# Nothing runs in the background; the amount is worked out from cow_time_started when needed.
+MILK_INTERVAL = 30
+MILK_CAPACITY = 300
+
+def get_stored_milk(player_data, now=None):
+    """Milk currently waiting in the player's cow."""
+    stored = player_data.stored_milk
+    started = player_data.cow_time_started
+    if not player_data.production_on or started is None:
+        return stored
+
+    if now is None:
+        now = time.time()
+    produced = int(max(0, now - started) // MILK_INTERVAL)
+    return min(MILK_CAPACITY, stored + produced)
+
+def settle_milk(player_data, now=None):
+    """Move the milk produced since cow_time_started into stored_milk."""
+    if now is None:
+        now = time.time()
+    started = player_data.cow_time_started
+    stored = get_stored_milk(player_data, now)
+
+    if player_data.production_on and started is not None:
+        # Keep the partial progress towards the next milk
+        produced = stored - player_data.stored_milk
+        player_data.cow_time_started = started + produced * MILK_INTERVAL
+
+    player_data.stored_milk = stored
+    if stored >= MILK_CAPACITY:
+        player_data.production_on = False  # Stop when full
+    return stored
+
+def schedule_milk_full(user_id, player_data):
+    """Queue the moment a settled, producing cow fills up so production switches off on time."""
+    if player_data.production_on:
+        missing = MILK_CAPACITY - player_data.stored_milk
+        scheduler.schedule("milk_full", str(user_id), player_data.cow_time_started + missing * MILK_INTERVAL)
+    else:
+        scheduler.cancel("milk_full", str(user_id))
+
+async def on_milk_full(user_id, payload):
+    if store.get(user_id) is None:
         return
+    async with store.transaction(user_id) as player_data:
+        settle_milk(player_data)
 
-    player_data = data["players"][str(user_id)]
+scheduler.register("milk_full", on_milk_full)
 
-    # Initialize total_milk if it doesn't exist
-    if "total_milk" not in player_data:
-        player_data["total_milk"] = 0
 
-    if not player_data.get("cow_owned", False):
+# Cow command
+@player_command(name="cow", description="Collect milk from your cow!", writes=True)
+async def cow(ctx):
+    interaction, user_id, player_data = ctx.interaction, ctx.user_id, ctx.player
+
+    if not player_data.cow_owned:
         await interaction.response.send_message("❌ You don't have a cow! It costs 50,000 coins.", ephemeral=True)
         return
 
-    # Ensure "stored_milk" exists
-    if "stored_milk" not in player_data:
-        player_data["stored_milk"] = 0
-
-    # Ensure "production_on" exists
-    if "production_on" not in player_data:
-        player_data["production_on"] = False
-
-    # Ensure "cow_time_started" exists
-    if "cow_time_started" not in player_data:
-        player_data["cow_time_started"] = time.time()
-
-    save_json("data.json", data)  # Save updates
+    # Bank the milk made so far (this also switches production off once the cow is full)
+    settle_milk(player_data)
+    schedule_milk_full(user_id, player_data)
 
     class MilkCollectView(nextcord.ui.View):
-        def __init__(self):
+        def __init__(self, player_data):
             super().__init__()
 
             # Update button color and text dynamically
-            button_label = "Stop Production" if player_data["production_on"] else "Start Producing"
-            button_style = nextcord.ButtonStyle.red if player_data["production_on"] else nextcord.ButtonStyle.blurple
+            button_label = "Stop Production" if player_data.production_on else "Start Producing"
+            button_style = nextcord.ButtonStyle.red if player_data.production_on else nextcord.ButtonStyle.blurple
 
             self.start_stop_button = nextcord.ui.Button(label=button_label, style=button_style, row=0)
             self.start_stop_button.callback = self.start_stop_production  # Bind button action
@@ -440,132 +441,102 @@ async def cow(interaction: nextcord.Interaction):
             self.add_item(self.collect_button)
 
         async def start_stop_production(self, interaction: nextcord.Interaction):
-            player_data["production_on"] = not player_data["production_on"]
-            save_json("data.json", data)
-
-            if player_data["production_on"]:
-                player_data["cow_time_started"] = time.time()  # Reset timer when starting
+            # Work on the player's current record, not the one captured when /cow ran
+            async with store.transaction(user_id) as player_data:
+                settle_milk(player_data)  # Keep what was made before the toggle
+                player_data.production_on = not player_data.production_on
+                if player_data.production_on:
+                    player_data.cow_time_started = time.time()  # Reset timer when starting
+                schedule_milk_full(user_id, player_data)
+
+            if player_data.production_on:
                 await interaction.response.send_message("✅ Milk production has started!", ephemeral=True)
-                asyncio.create_task(produce_milk(user_id))  # Start background task
             else:
                 await interaction.response.send_message("❌ Milk production has been stopped.", ephemeral=True)
 
             # Instead of editing interaction.message, send a new response
             await interaction.followup.send(
-                content=f"🥛 Your cow has produced {player_data['stored_milk']} milk. Click the button to collect or stop production.",
-                view=MilkCollectView(),
+                content=f"🥛 Your cow has produced {get_stored_milk(player_data)} milk. Click the button to collect or stop production.",
+                view=MilkCollectView(player_data),
                 ephemeral=True
             )
 
         async def collect_milk(self, interaction: nextcord.Interaction):
             await interaction.response.defer()  # Acknowledge the interaction first
 
-            collected_milk = player_data["stored_milk"]
-            player_data["milk"] += collected_milk
-            player_data["total_milk"] += collected_milk  # Increment total milk collected
-            player_data["stored_milk"] = 0
-            player_data["cow_time_started"] = time.time()
-
-            save_json("data.json", data)
+            async with store.transaction(user_id) as player_data:
+                settle_milk(player_data)
+                collected_milk = player_data.stored_milk
+                player_data.milk += collected_milk
+                player_data.total_milk += collected_milk  # Increment total milk collected
+                player_data.stored_milk = 0
+                player_data.cow_time_started = time.time()
+                schedule_milk_full(user_id, player_data)
 
             # Send a follow-up message with the updated milk count and no buttons (view=None)
             await interaction.followup.send(
-                content=f"✅ You collected {collected_milk} milk! Now you have {player_data['milk']} milk.",
+                content=f"✅ You collected {collected_milk} milk! Now you have {player_data.milk} milk.",
                 ephemeral=True
             )
 
             # Send another follow-up with updated status and the buttons again
             await interaction.followup.send(
-                content=f"🥛 Your cow has produced {player_data['stored_milk']} milk. Click the button to collect or start production.",
-                view=MilkCollectView(),  # This will display the buttons again
+                content=f"🥛 Your cow has produced {get_stored_milk(player_data)} milk. Click the button to collect or start production.",
+                view=MilkCollectView(player_data),  # This will display the buttons again
                 ephemeral=True
             )
 
-    # ⏳ Background Milk Production Task (defined inside the command)
-    async def produce_milk(user_id):
-        while True:
-            await asyncio.sleep(30)  # Wait 30 seconds
-
-            player_data, data = get_player_data(user_id)
-
-            if not player_data["production_on"]:
-                break  # Stop if production is turned off
-
-            if player_data["stored_milk"] >= 300:
-                player_data["production_on"] = False  # Stop when full
-                save_json("data.json", data)
-                break  
-
-            player_data["stored_milk"] += 1
-            save_json("data.json", data)  # Save progress
-
     # Create the MilkCollectView instance and display the buttons to the user
     await interaction.response.send_message(
-        content=f"🥛 Your cow has produced {player_data['stored_milk']} milk. Click the button to collect or start production.",
-        view=MilkCollectView(),
+        content=f"🥛 Your cow has produced {player_data.stored_milk} milk. Click the button to collect or start production.",
+        view=MilkCollectView(player_data),
         ephemeral=True
     )
 
 
-@client.slash_command(name="inventory", description="Check your current resources.")
-async def inventory(interaction: nextcord.Interaction):
-    user_id = interaction.user.id
-
-    # Check if the user has registered
-    data = load_json("data.json")
-    if not is_registered(user_id, data):
-        await interaction.response.send_message(
-            "⚠️ You need to register first! Please use `/register` to create an account.",
-            ephemeral=True
-        )
-        return
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
-
-    # Fetch the player data
-    player_data, _ = get_player_data(user_id)
+@player_command(name="inventory", description="Check your current resources.")
+async def inventory(ctx):
+    interaction, player_data = ctx.interaction, ctx.player
 
     inventory_items = {
-        "🌾 **Wheat:**": player_data.get("wheat", 0),
-        "🪵 **Wood:**": player_data.get("wood", 0),
-        "🪨 **Stone:**": player_data.get("stone", 0),
-        "🌳 **Hardwood:**": player_data.get("hardwood", 0),
-        "⛏ **Iron Ore:**": player_data.get("iron_ore", 0),
-        "🥈 **Silver Ore:**": player_data.get("silver_ore", 0),
-        "🏆 **Gold Ore:**": player_data.get("gold_ore", 0),
+        "🌾 **Wheat:**": player_data.wheat,
+        "🪵 **Wood:**": player_data.wood,
+        "🪨 **Stone:**": player_data.stone,
+        "🌳 **Hardwood:**": player_data.hardwood,
+        "⛏ **Iron Ore:**": player_data.iron_ore,
+        "🥈 **Silver Ore:**": player_data.silver_ore,
+        "🏆 **Gold Ore:**": player_data.gold_ore,
     }
 
     # Filter out items with a value of 0 (excluding money)
     filtered_items = [f"{icon} {amount}" for icon, amount in inventory_items.items() if amount > 0]
 
     # Always show milk if player has it
-    if player_data.get("milk", 0) > 0:
-        filtered_items.append(f"\n🥛 **Milk:** {player_data['milk']} \n")
+    if player_data.milk > 0:
+        filtered_items.append(f"\n🥛 **Milk:** {player_data.milk} \n")
 
     # Always show money
-    money_display = f"💰 **Money:** {player_data.get('money', 0)}"
+    money_display = f"💰 **Money:** {player_data.money}"
 
     # Always show debt if player has any
-    if player_data.get("debt", 0) > 0:
-        money_display += f" | 💸 **Debt:** {player_data['debt']}"
+    if player_data.debt > 0:
+        money_display += f" | 💸 **Debt:** {player_data.debt}"
     
     # Check for rare artifacts
-    if player_data.get("rare_artifacts", 0) > 0:
-        filtered_items.append(f"🏺 **Rare Artifacts:** {player_data['rare_artifacts']}")
+    if player_data.rare_artifacts > 0:
+        filtered_items.append(f"🏺 **Rare Artifacts:** {player_data.rare_artifacts}")
 
     # Check for cucumber
-    if player_data.get("cucumber", 0) > 0:
-        filtered_items.append(f"🥒 **Larry the MF Cucumbers:** {player_data['cucumber']}")
+    if player_data.cucumber > 0:
+        filtered_items.append(f"🥒 **Larry the MF Cucumbers:** {player_data.cucumber}")
         
     # Check for candy
-    if player_data.get("candy", 0) > 0:
-        filtered_items.append(f"🍬 **Candy:** {player_data['candy']}")
+    if player_data.candy > 0:
+        filtered_items.append(f"🍬 **Candy:** {player_data.candy}")
 
     # Check for weed
-    if player_data.get("weed", 0) > 0:
-        filtered_items.append(f"🍃 **Weed:** {player_data['weed']}")
+    if player_data.weed > 0:
+        filtered_items.append(f"🍃 **Weed:** {player_data.weed}")
 
     # If no resources but money exists
     if not filtered_items:
@@ -580,17 +551,10 @@ async def inventory(interaction: nextcord.Interaction):
     await interaction.response.send_message(message, ephemeral=True)
 
 
-@client.slash_command(name="profile", description="View your profile or look up another player's stats.")
-async def profile(interaction: nextcord.Interaction, user: str = None):
+@player_command(name="profile", description="View your profile or look up another player's stats.", registered=False, cost=2)
+async def profile(ctx, user: str = None):
+    interaction, user_id = ctx.interaction, ctx.user_id
     try:
-        data = load_json("data.json")  # Load data.json at the start
-        user_id = interaction.user.id
-
-
-        if is_banned(user_id, data):
-            await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-            return
-
         # Determine the target user
         if user is None:
             target_user = interaction.user
@@ -608,55 +572,34 @@ async def profile(interaction: nextcord.Interaction, user: str = None):
             return
 
         # Check if the user is registered
-        if not is_registered(user_id, data):
+        if not is_registered(user_id):
             await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
             return
 
         # Fetch player data
-        player_data = data["players"][str(user_id)]
-
-        # Extract values safely to prevent missing key errors
-        player_data.setdefault("total_earnings", 0)
-        player_data.setdefault("milk", 0)
-        player_data.setdefault("milk_price_upgrade_level", 0)
-        player_data.setdefault("rare_artifacts", 0)
-        player_data.setdefault("total_rare_artifacts", 0)
-        player_data.setdefault("cucumber", 0)
-        player_data.setdefault("total_cucumber", 0)
-        player_data.setdefault("candy", 0)
-        player_data.setdefault("total_candy", 0)
-        player_data.setdefault("weed", 0)
-        player_data.setdefault("total_weed", 0)
-        player_data.setdefault("daily_streak", 0)
-        player_data.setdefault("longest_streak", 0)
-        player_data.setdefault("total_claims", 0)
-        player_data.setdefault("farm_usage_count", 0)
-        player_data.setdefault("debt", 0)
-        player_data.setdefault("total_earned_or_lost", 0)
-        player_data.setdefault("total_gambled", 0)
-        player_data.setdefault("coinflip_uses", 0)
+        player_data = store.view(user_id)
 
         # Calculate total upgrades
         total_upgrades = sum([
-            player_data.get("farming_cooldown_level", 0),
-            player_data.get("wheat_upgrade_level", 0),
-            player_data.get("wood_upgrade_level", 0),
-            player_data.get("stone_upgrade_level", 0),
-            player_data.get("hardwood_upgrade_level", 0),
-            player_data.get("iron_ore_upgrade_level", 0),
-            player_data.get("silver_ore_upgrade_level", 0),
-            player_data.get("gold_ore_upgrade_level", 0),
-            player_data.get("wheat_price_upgrade_level", 0),
-            player_data.get("wood_price_upgrade_level", 0),
-            player_data.get("stone_price_upgrade_level", 0),
-            player_data.get("hardwood_price_upgrade_level", 0),
-            player_data.get("iron_ore_price_upgrade_level", 0),
-            player_data.get("silver_ore_price_upgrade_level", 0),
-            player_data.get("gold_ore_price_upgrade_level", 0),
-            player_data.get("milk_price_upgrade_level", 0),
+            player_data.farming_cooldown_level,
+            player_data.wheat_upgrade_level,
+            player_data.wood_upgrade_level,
+            player_data.stone_upgrade_level,
+            player_data.hardwood_upgrade_level,
+            player_data.iron_ore_upgrade_level,
+            player_data.silver_ore_upgrade_level,
+            player_data.gold_ore_upgrade_level,
+            player_data.wheat_price_upgrade_level,
+            player_data.wood_price_upgrade_level,
+            player_data.stone_price_upgrade_level,
+            player_data.hardwood_price_upgrade_level,
+            player_data.iron_ore_price_upgrade_level,
+            player_data.silver_ore_price_upgrade_level,
+            player_data.gold_ore_price_upgrade_level,
+            player_data.milk_price_upgrade_level,
         ])
 
-        if player_data.get("cow_owned", False):
+        if player_data.cow_owned:
             total_upgrades += 1
 
         # Upgrade formatting function
@@ -665,41 +608,30 @@ async def profile(interaction: nextcord.Interaction, user: str = None):
 
         # List of upgrades, divided into categories
         cow_upgrades = [
-            f"🐄 **Cow Purchased:** Yes" if player_data.get("cow_owned", False) else "",
+            f"🐄 **Cow Purchased:** Yes" if player_data.cow_owned else "",
         ]
         farming_cooldown_upgrades = [
-            format_upgrade("Farming Cooldown", player_data.get("farming_cooldown_level", 0), f"-{0.2 * player_data.get('farming_cooldown_level', 0):.1f}s cooldown"),
+            format_upgrade("Farming Cooldown", player_data.farming_cooldown_level, f"-{0.2 * player_data.farming_cooldown_level:.1f}s cooldown"),
         ]
         normal_upgrades = [
-            format_upgrade("Wheat Upgrade", player_data.get("wheat_upgrade_level", 0), f"+{player_data.get('wheat_upgrade_level', 0) * 2} wheat per farm"),
-            format_upgrade("Wood Upgrade", player_data.get("wood_upgrade_level", 0), f"+{player_data.get('wood_upgrade_level', 0) * 2} wood per farm"),
-            format_upgrade("Stone Upgrade", player_data.get("stone_upgrade_level", 0), f"+{player_data.get('stone_upgrade_level', 0) * 2} stone per farm"),
-            format_upgrade("Hardwood Upgrade", player_data.get("hardwood_upgrade_level", 0), f"+{player_data.get('hardwood_upgrade_level', 0) * 2} hardwood per farm"),
-            format_upgrade("Iron Ore Upgrade", player_data.get("iron_ore_upgrade_level", 0), f"+{player_data.get('iron_ore_upgrade_level', 0) * 2} iron ore per farm"),
-            format_upgrade("Silver Ore Upgrade", player_data.get("silver_ore_upgrade_level", 0), f"+{player_data.get('silver_ore_upgrade_level', 0) * 2} silver ore per farm"),
-            format_upgrade("Gold Ore Upgrade", player_data.get("gold_ore_upgrade_level", 0), f"+{player_data.get('gold_ore_upgrade_level', 0) * 2} gold ore per farm"),
+            format_upgrade("Wheat Upgrade", player_data.wheat_upgrade_level, f"+{player_data.wheat_upgrade_level * 2} wheat per farm"),
+            format_upgrade("Wood Upgrade", player_data.wood_upgrade_level, f"+{player_data.wood_upgrade_level * 2} wood per farm"),
+            format_upgrade("Stone Upgrade", player_data.stone_upgrade_level, f"+{player_data.stone_upgrade_level * 2} stone per farm"),
+            format_upgrade("Hardwood Upgrade", player_data.hardwood_upgrade_level, f"+{player_data.hardwood_upgrade_level * 2} hardwood per farm"),
+            format_upgrade("Iron Ore Upgrade", player_data.iron_ore_upgrade_level, f"+{player_data.iron_ore_upgrade_level * 2} iron ore per farm"),
+            format_upgrade("Silver Ore Upgrade", player_data.silver_ore_upgrade_level, f"+{player_data.silver_ore_upgrade_level * 2} silver ore per farm"),
+            format_upgrade("Gold Ore Upgrade", player_data.gold_ore_upgrade_level, f"+{player_data.gold_ore_upgrade_level * 2} gold ore per farm"),
         ]
 
-        rebirth_multiplier = player_data.get("rebirth_multiplier", 1.0)  # Default to 1.0 if no multiplier
-
-        price_upgrades = [
-            format_upgrade("Wheat Price Upgrade", player_data.get("wheat_price_upgrade_level", 0), 
-                        f"Sell value: {int((1 + (player_data.get('wheat_price_upgrade_level', 0) * 2)) * rebirth_multiplier)} coins per wheat"),
-            format_upgrade("Wood Price Upgrade", player_data.get("wood_price_upgrade_level", 0), 
-                        f"Sell value: {int((5 + (player_data.get('wood_price_upgrade_level', 0) * 3)) * rebirth_multiplier)} coins per wood"),
-            format_upgrade("Stone Price Upgrade", player_data.get("stone_price_upgrade_level", 0), 
-                        f"Sell value: {int((25 + (player_data.get('stone_price_upgrade_level', 0) * 10)) * rebirth_multiplier)} coins per stone"),
-            format_upgrade("Hardwood Price Upgrade", player_data.get("hardwood_price_upgrade_level", 0), 
-                        f"Sell value: {int((100 + (player_data.get('hardwood_price_upgrade_level', 0) * 20)) * rebirth_multiplier)} coins per hardwood"),
-            format_upgrade("Iron Ore Price Upgrade", player_data.get("iron_ore_price_upgrade_level", 0), 
-                        f"Sell value: {int((300 + (player_data.get('iron_ore_price_upgrade_level', 0) * 35)) * rebirth_multiplier)} coins per iron ore"),
-            format_upgrade("Silver Ore Price Upgrade", player_data.get("silver_ore_price_upgrade_level", 0), 
-                        f"Sell value: {int((750 + (player_data.get('silver_ore_price_upgrade_level', 0) * 45)) * rebirth_multiplier)} coins per silver ore"),
-            format_upgrade("Gold Ore Price Upgrade", player_data.get("gold_ore_price_upgrade_level", 0), 
-                        f"Sell value: {int((2000 + (player_data.get('gold_ore_price_upgrade_level', 0) * 120)) * rebirth_multiplier)} coins per gold ore"),
-            format_upgrade("Milk Price Upgrade", player_data.get("milk_price_upgrade_level", 0), 
-                        f"Sell value: {int((150 * (1.2 ** player_data.get('milk_price_upgrade_level', 0)) - 150) * rebirth_multiplier)} coins per milk"),
-]
+        rebirth_multiplier = player_data.rebirth_multiplier
+
+        price_upgrades = []
+        for resource in SELL_PRICES:
+            level = player_data[f"{resource}_price_upgrade_level"]
+            price_upgrades.append(format_upgrade(f"{resource.replace('_', ' ').title()} Price Upgrade", level,
+                        f"Sell value: {int(sell_price(resource, level) * rebirth_multiplier)} coins per {resource.replace('_', ' ')}"))
+        price_upgrades.append(format_upgrade("Milk Price Upgrade", player_data.milk_price_upgrade_level,
+                        f"Sell value: {int(milk_price(player_data.milk_price_upgrade_level, rebirth_multiplier))} coins per milk"))
 
         # Combine all the categories with extra space between each group
         upgrades = (
@@ -715,20 +647,33 @@ async def profile(interaction: nextcord.Interaction, user: str = None):
 
         profile_name = target_user.display_name if target_user else f"User ID: {user_id}"
 
+        # Exact leaderboard position in each category
+        rankings = []
+        for category in LEADERBOARD_CATEGORIES:
+            index = store.indexes[category]
+            rank = index.rank(str(user_id))
+            if rank is not None:
+                rankings.append(f"🔸 **{category.replace('_', ' ').capitalize()}:** #{rank + 1} of {len(index)} (top {index.top_percent(str(user_id)):.1f}%)")
+        rankings_text = "\n".join(rankings)
+
         message = f"""
 📜 **__{profile_name}'s Profile__** 📜
 
-🔄 **Rebirths:** `{player_data.get("rebirths", 0)}` \n✖️(**Multiplier:** `{player_data.get("rebirth_multiplier", 1.0):.2f}x`)
+🔄 **Rebirths:** `{player_data.rebirths}` \n✖️(**Multiplier:** `{player_data.rebirth_multiplier:.2f}x`)
 
 💰 **__Money and Net Worth__** 💰
 
-💰 **Money:** `{player_data.get("money", 0)}` coins
-💸 **Debt:** `{player_data.get("debt", 0)}` coins
-💎 **Total Money Earned:** `{player_data.get("total_earnings", 0)}` coins
+💰 **Money:** `{player_data.money}` coins
+💸 **Debt:** `{player_data.debt}` coins
+💎 **Total Money Earned:** `{player_data.total_earnings}` coins
 
 
 🛠 **Total Upgrades:** `{total_upgrades}`
 
+📍 **__Rankings__** 📍
+
+{rankings_text}
+
 ✨ **__Upgrades__** ✨
 
 {upgrades_text}
@@ -738,14 +683,14 @@ async def profile(interaction: nextcord.Interaction, user: str = None):
 
         # Dynamically adding resources only if they exist
         resources = {
-            "🌾 Wheat": player_data.get("wheat", 0),
-            "🪵 Wood": player_data.get("wood", 0),
-            "🪨 Stone": player_data.get("stone", 0),
-            "🌳 Hardwood": player_data.get("hardwood", 0),
-            "⛏ Iron Ore": player_data.get("iron_ore", 0),
-            "🥈 Silver Ore": player_data.get("silver_ore", 0),
-            "🏆 Gold Ore": player_data.get("gold_ore", 0),
-            "🥛 Milk": player_data.get("milk", 0),
+            "🌾 Wheat": player_data.wheat,
+            "🪵 Wood": player_data.wood,
+            "🪨 Stone": player_data.stone,
+            "🌳 Hardwood": player_data.hardwood,
+            "⛏ Iron Ore": player_data.iron_ore,
+            "🥈 Silver Ore": player_data.silver_ore,
+            "🏆 Gold Ore": player_data.gold_ore,
+            "🥛 Milk": player_data.milk,
         }
 
         resource_text = "\n".join(f"{name}: `{amount}`" for name, amount in resources.items() if amount > 0)
@@ -753,57 +698,57 @@ async def profile(interaction: nextcord.Interaction, user: str = None):
         if resource_text:
             message += resource_text + "\n"
 # Gambling stats section (only show if any gambling-related values are greater than 0)
-        if player_data.get("total_earned_or_lost", 0) > 0 or player_data.get("total_gambled", 0) > 0 or player_data.get("coinflip_uses", 0) > 0:
+        if player_data.total_earned_or_lost > 0 or player_data.total_gambled > 0 or player_data.coinflip_uses > 0:
             message += f"""
 🎲**__Gambling__** 🎲
 
-💰 **Total Earned/Lost:** `{player_data.get("total_earned_or_lost", 0)}`
-💸 **Total Plinko Games Played:** `{player_data.get("total_gambled", 0)}`
-🎰 **Coins flipped:** `{player_data.get("coinflip_uses", 0)}`
+💰 **Total Earned/Lost:** `{player_data.total_earned_or_lost}`
+💸 **Total Plinko Games Played:** `{player_data.total_gambled}`
+🎰 **Coins flipped:** `{player_data.coinflip_uses}`
 """
         # Always show streak info
         message += f"""
 🏆 **__Streak Info__** 🏆
 
-📅 **Current Streak:** `{player_data.get("daily_streak", 0)}` days  
-🏅 **Longest Streak:** `{player_data.get("longest_streak", 0)}` days  
-🔄 **Total Daily Claims:** `{player_data.get("total_claims", 0)}` times  
+📅 **Current Streak:** `{player_data.daily_streak}` days  
+🏅 **Longest Streak:** `{player_data.longest_streak}` days  
+🔄 **Total Daily Claims:** `{player_data.total_claims}` times  
 
-🌾 **Times Farmed:** `{player_data.get('farm_usage_count', 0)}`
+🌾 **Times Farmed:** `{player_data.farm_usage_count}`
 """
 
 
         # Rare items section
-        if player_data.get("rare_artifacts", 0) > 0 or player_data.get("cucumber", 0) > 0 or player_data.get("candy", 0) > 0 or player_data.get("weed", 0) > 0:
+        if player_data.rare_artifacts > 0 or player_data.cucumber > 0 or player_data.candy > 0 or player_data.weed > 0:
             message += "**\n💎 Current Rare Items**\n\n"
             
-            if player_data.get("rare_artifacts", 0) > 0:
-                message += f"🏺 **Rare Artifacts:** `{player_data['rare_artifacts']}`\n"
+            if player_data.rare_artifacts > 0:
+                message += f"🏺 **Rare Artifacts:** `{player_data.rare_artifacts}`\n"
 
-            if player_data.get("cucumber", 0) > 0:
-                message += f"🥒 **Larry the Cucumbers:** `{player_data['cucumber']}`\n"
+            if player_data.cucumber > 0:
+                message += f"🥒 **Larry the Cucumbers:** `{player_data.cucumber}`\n"
 
-            if player_data.get("candy", 0) > 0:
-                message += f"🍬 **Candy:** `{player_data['candy']}`\n"
+            if player_data.candy > 0:
+                message += f"🍬 **Candy:** `{player_data.candy}`\n"
             
-            if player_data.get("weed", 0) > 0:
-                message += f"🍃 **Weed:** `{player_data['weed']}`\n\n"
+            if player_data.weed > 0:
+                message += f"🍃 **Weed:** `{player_data.weed}`\n\n"
 
         # Total rare items collected
-        if player_data.get("total_rare_artifacts", 0) > 0 or player_data.get("total_cucumber", 0) > 0 or player_data.get("total_candy", 0) > 0 or player_data.get("total_weed", 0) > 0:
+        if player_data.total_rare_artifacts > 0 or player_data.total_cucumber > 0 or player_data.total_candy > 0 or player_data.total_weed > 0:
             message += "**\n🏆 Total Collected Rare Items**\n\n"
             
-            if player_data.get("total_cucumber", 0) > 0:
-                message += f"🥒 **Total Larries Found:** `{player_data['total_cucumber']}`\n"
+            if player_data.total_cucumber > 0:
+                message += f"🥒 **Total Larries Found:** `{player_data.total_cucumber}`\n"
             
-            if player_data.get("total_candy", 0) > 0:
-                message += f"🍬 **Total Candy Found:** `{player_data['total_candy']}`\n"
+            if player_data.total_candy > 0:
+                message += f"🍬 **Total Candy Found:** `{player_data.total_candy}`\n"
             
-            if player_data.get("total_weed", 0) > 0:
-                message += f"🍃 **Total Weed Found:** `{player_data['total_weed']}`\n"
+            if player_data.total_weed > 0:
+                message += f"🍃 **Total Weed Found:** `{player_data.total_weed}`\n"
 
-            if player_data.get("total_rare_artifacts", 0) > 0:
-                message += f"🏺 **Total Artifacts Found:** `{player_data['total_rare_artifacts']}`\n"
+            if player_data.total_rare_artifacts > 0:
+                message += f"🏺 **Total Artifacts Found:** `{player_data.total_rare_artifacts}`\n"
 
         await interaction.response.send_message(message)
 
@@ -812,9 +757,9 @@ async def profile(interaction: nextcord.Interaction, user: str = None):
 
 
 
-@client.slash_command(name="sell", description="Sell your resources for money!")
+@player_command(name="sell", description="Sell your resources for money!", writes=True)
 async def sell(
-    interaction: nextcord.Interaction,
+    ctx,
     items: str = nextcord.SlashOption(
         name="items",
         description="What to sell. Type 'all' to sell everything, or specify multiple resources separated by commas.",
@@ -826,45 +771,28 @@ async def sell(
         required=False
     )
 ):
-    user_id = interaction.user.id
-
-    # Load the player data from the JSON file using your existing load_json function
-    data = load_json(DATA_FILE)
-
-    # Check if the user is registered
-    if not is_registered(user_id, data):
-        await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
-        return
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
-
-    player_data = data["players"].get(str(user_id))
-
-    if "total_earnings" not in player_data:
-        player_data["total_earnings"] = 0
+    interaction, player_data = ctx.interaction, ctx.player
 
     # Resource Prices with Upgrades (keys are title-case)
     prices = {
-    "Wheat": 1 + (player_data["wheat_price_upgrade_level"] * 2),  # Reduced scaling
-    "Wood": 5 + (player_data["wood_price_upgrade_level"] * 3),
-    "Stone": 25 + (player_data["stone_price_upgrade_level"] * 10),
-    "Hardwood": 100 + (player_data["hardwood_price_upgrade_level"] * 20), 
-    "Iron Ore": 300 + (player_data["iron_ore_price_upgrade_level"] * 35),
-    "Silver Ore": 750 + (player_data["silver_ore_price_upgrade_level"] * 45),
-    "Gold Ore": 2000 + (player_data["gold_ore_price_upgrade_level"] * 120),
+    "Wheat": sell_price("wheat", player_data.wheat_price_upgrade_level),
+    "Wood": sell_price("wood", player_data.wood_price_upgrade_level),
+    "Stone": sell_price("stone", player_data.stone_price_upgrade_level),
+    "Hardwood": sell_price("hardwood", player_data.hardwood_price_upgrade_level),
+    "Iron Ore": sell_price("iron_ore", player_data.iron_ore_price_upgrade_level),
+    "Silver Ore": sell_price("silver_ore", player_data.silver_ore_price_upgrade_level),
+    "Gold Ore": sell_price("gold_ore", player_data.gold_ore_price_upgrade_level),
 }
 
     # Player's inventory (keys are title-case)
     inventory = {
-        "Wheat": player_data.get("wheat", 0),
-        "Wood": player_data.get("wood", 0),
-        "Stone": player_data.get("stone", 0),
-        "Hardwood": player_data.get("hardwood", 0),
-        "Iron Ore": player_data.get("iron_ore", 0),
-        "Silver Ore": player_data.get("silver_ore", 0),
-        "Gold Ore": player_data.get("gold_ore", 0)
+        "Wheat": player_data.wheat,
+        "Wood": player_data.wood,
+        "Stone": player_data.stone,
+        "Hardwood": player_data.hardwood,
+        "Iron Ore": player_data.iron_ore,
+        "Silver Ore": player_data.silver_ore,
+        "Gold Ore": player_data.gold_ore
     }
 
     # Convert all keys to lowercase for easier comparison
@@ -908,8 +836,8 @@ async def sell(
         amount = inventory_lower[item] if amount == "all" else min(int(amount), inventory_lower[item])
 
         # Calculate earnings with rebirth multiplier
-        earnings = int(amount * prices_lower[item] * player_data["rebirth_multiplier"])
-        player_data["total_earnings"] += earnings  # Track the total earnings
+        earnings = int(amount * prices_lower[item] * player_data.rebirth_multiplier)
+        player_data.total_earnings += earnings  # Track the total earnings
         total_earnings += earnings
         sold_items.append(f"{amount} {original_item_name}")
         player_data[original_item_name.lower().replace(" ", "_")] -= amount  # Update inventory
@@ -920,27 +848,24 @@ async def sell(
         return
 
     # Now handle debt first, then add remaining money to user's balance
-    debt = player_data.get("debt", 0)  # Get current debt
+    debt = player_data.debt  # Get current debt
     if debt > 0:
         if total_earnings >= debt:
             # Pay off debt first, then add remaining money
             remaining_money = total_earnings - debt
-            player_data["money"] += remaining_money  # Add remaining money after clearing debt
-            player_data["debt"] = 0  # Clear the debt
+            player_data.money += remaining_money  # Add remaining money after clearing debt
+            player_data.debt = 0  # Clear the debt
             debt_cleared_message = f"Your debt of {debt} coins has been **cleared**!"
         else:
             # All earnings go to pay off the debt
-            player_data["debt"] -= total_earnings
-            player_data["money"] = 0  # No money left, all went to debt
-            debt_cleared_message = f"Your remaining debt is **{player_data['debt']} coins**."
+            player_data.debt -= total_earnings
+            player_data.money = 0  # No money left, all went to debt
+            debt_cleared_message = f"Your remaining debt is **{player_data.debt} coins**."
     else:
         # No debt, just add the money
-        player_data["money"] += total_earnings
+        player_data.money += total_earnings
         debt_cleared_message = ""  # No debt message
 
-    # Save the updated data back to the JSON file
-    save_json(DATA_FILE, data)
-
     sold_list = ", ".join(sold_items)
     reward_message = (
         f"💰 You sold {sold_list} for {total_earnings} coins!\n"
@@ -951,75 +876,57 @@ async def sell(
 
 
 
-@client.slash_command(name="sellmilk", description="Sell your milk for coins!")
-async def sell_milk(interaction: nextcord.Interaction, amount: int = nextcord.SlashOption(name="amount", description="Amount of milk to sell", required=True)):
-    user_id = interaction.user.id
-
-    # Load the player data from the JSON file
-    data = load_json(DATA_FILE)
+@player_command(name="sellmilk", description="Sell your milk for coins!", writes=True)
+async def sell_milk(ctx, amount: int = nextcord.SlashOption(name="amount", description="Amount of milk to sell", required=True)):
+    interaction, player_data = ctx.interaction, ctx.player
 
-    # Check if the user is registered
-    if not is_registered(user_id, data):
-        await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
-        return
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
-
-    player_data = data["players"].get(str(user_id))
-
-    if not player_data.get("cow_owned", False):
+    if not player_data.cow_owned:
         await interaction.response.send_message("❌ You don't have a cow! It costs 50,000 coins.", ephemeral=True)
         return
 
-    if player_data["milk"] == 0:
+    if player_data.milk == 0:
         await interaction.response.send_message("❌ You have no milk to sell!", ephemeral=True)
         return
 
     # Ensure the amount is valid
-    amount = min(amount, player_data["milk"])
+    amount = min(amount, player_data.milk)
     if amount <= 0:
         await interaction.response.send_message("❌ You don't have enough milk to sell!", ephemeral=True)
         return
 
     # Calculate milk price with upgrades and rebirth multiplier
-    milk_price = 150 + (player_data["milk_price_upgrade_level"] * 100)  # Milk price upgrade multiplier
-    milk_price *= player_data["rebirth_multiplier"]  # Rebirth multiplier
+    price = milk_price(player_data.milk_price_upgrade_level, player_data.rebirth_multiplier)
 
     # Sell the milk
-    earnings = int(amount * milk_price)  # Use int() to ensure earnings is an integer
-    player_data["milk"] -= amount
+    earnings = int(amount * price)  # Use int() to ensure earnings is an integer
+    player_data.milk -= amount
 
     # Now handle debt first, then add remaining money to user's balance
-    debt = player_data.get("debt", 0)  # Get current debt
+    debt = player_data.debt  # Get current debt
     if debt > 0:
         if earnings >= debt:
             # Pay off debt first, then add remaining money
             remaining_money = earnings - debt
-            player_data["money"] += remaining_money  # Add remaining money after clearing debt
-            player_data["debt"] = 0  # Clear the debt
+            player_data.money += remaining_money  # Add remaining money after clearing debt
+            player_data.debt = 0  # Clear the debt
             debt_cleared_message = f"Your debt of {debt} coins has been **cleared**!"
         else:
             # All earnings go to pay off the debt
-            player_data["debt"] -= earnings
-            player_data["money"] = 0  # No money left, all went to debt
-            debt_cleared_message = f"Your remaining debt is **{player_data['debt']} coins**."
+            player_data.debt -= earnings
+            player_data.money = 0  # No money left, all went to debt
+            debt_cleared_message = f"Your remaining debt is **{player_data.debt} coins**."
     else:
         # No debt, just add the money
-        player_data["money"] += earnings
+        player_data.money += earnings
         debt_cleared_message = ""  # No debt message
 
-    # Save the updated data to the JSON file
-    save_json(DATA_FILE, data)
-
     await interaction.response.send_message(f"💰 You sold {amount} milk for {earnings} coins!\n{debt_cleared_message}", ephemeral=True)
 
 
 
-@client.slash_command(name="treasuresell", description="???")
+@player_command(name="treasuresell", description="???", writes=True)
 async def treasuresell(
-    interaction: nextcord.Interaction,
+    ctx,
     item: str = nextcord.SlashOption(
         name="item",
         description="Choose what to sell",
@@ -1032,31 +939,14 @@ async def treasuresell(
         required=False
     )
 ):
-    user_id = interaction.user.id
-
-    # Load the player data from the JSON file
-    data = load_json(DATA_FILE)
-
-    # Check if the user is registered
-    if not is_registered(user_id, data):
-        await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
-        return
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
-
-    player_data = data["players"].get(str(user_id))
-
-    if "total_earnings" not in player_data:
-        player_data["total_earnings"] = 0
+    interaction, player_data = ctx.interaction, ctx.player
 
     # Prices per item
     prices = {
-        "Rare Artifact": 50000,
-        "Candy": 10000,
-        "Weed": 25000,
-        "Cucumber": 5000
+        "Rare Artifact": TREASURE_PRICES["rare_artifacts"],
+        "Candy": TREASURE_PRICES["candy"],
+        "Weed": TREASURE_PRICES["weed"],
+        "Cucumber": TREASURE_PRICES["cucumber"]
     }
 
     # Mapping item names to correct keys in player_data
@@ -1068,7 +958,7 @@ async def treasuresell(
     }
 
     # Player's inventory
-    inventory = {key: player_data.get(item_keys[key], 0) for key in item_keys}
+    inventory = {key: player_data[item_keys[key]] for key in item_keys}
 
     total_earnings = 0
     if item == "All":
@@ -1076,8 +966,8 @@ async def treasuresell(
             count = inventory[key]
             if count > 0:
                 # Apply rebirth multiplier only once and calculate earnings
-                earnings = int(count * price * player_data["rebirth_multiplier"])
-                player_data["total_earnings"] += earnings
+                earnings = int(count * price * player_data.rebirth_multiplier)
+                player_data.total_earnings += earnings
                 player_data[item_keys[key]] = 0  # Reset inventory
                 total_earnings += earnings
 
@@ -1094,88 +984,70 @@ async def treasuresell(
             amount = min(amount or inventory[item], inventory[item])
 
             # Calculate earnings with rebirth multiplier (only applied once here)
-            earnings = int(amount * prices[item] * player_data["rebirth_multiplier"])
-            player_data["total_earnings"] += earnings
+            earnings = int(amount * prices[item] * player_data.rebirth_multiplier)
+            player_data.total_earnings += earnings
             player_data[item_keys[item]] -= amount  # Correctly update inventory key
             total_earnings += earnings
 
     # Now handle debt first, then add remaining money to user's balance
-    debt = player_data.get("debt", 0)  # Get current debt
+    debt = player_data.debt  # Get current debt
     if debt > 0:
         if total_earnings >= debt:
             # Pay off debt first, then add remaining money
             remaining_money = total_earnings - debt
-            player_data["money"] += remaining_money  # Add remaining money after clearing debt
-            player_data["debt"] = 0  # Clear the debt
+            player_data.money += remaining_money  # Add remaining money after clearing debt
+            player_data.debt = 0  # Clear the debt
             debt_cleared_message = f"Your debt of {debt} coins has been **cleared**!"
         else:
             # All earnings go to pay off the debt
-            player_data["debt"] -= total_earnings
-            player_data["money"] = 0  # No money left, all went to debt
-            debt_cleared_message = f"Your remaining debt is **{player_data['debt']} coins**."
+            player_data.debt -= total_earnings
+            player_data.money = 0  # No money left, all went to debt
+            debt_cleared_message = f"Your remaining debt is **{player_data.debt} coins**."
     else:
         # No debt, just add the money
-        player_data["money"] += total_earnings
+        player_data.money += total_earnings
         debt_cleared_message = ""  # No debt message
 
-    # Save the updated data to the JSON file
-    save_json(DATA_FILE, data)
-
     await interaction.response.send_message(f"💰 You sold your treasures for {total_earnings} coins!\n{debt_cleared_message}", ephemeral=True)
 
 
 
-@client.slash_command(name="upgrades", description="Check your upgrade levels and their effects.")
-async def upgrades(interaction: nextcord.Interaction):
-    user_id = interaction.user.id
+@player_command(name="upgrades", description="Check your upgrade levels and their effects.")
+async def upgrades(ctx):
+    interaction, player_data = ctx.interaction, ctx.player
 
-    # Load the player data without modifying it
-    data = load_json(DATA_FILE)
-    
-    # Check if the user is registered
-    if not is_registered(user_id, data):
-        await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
-        return
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
-
-    player_data = data["players"].get(str(user_id), {})
+    maxed = lambda level, key: f"**MAX**" if level >= UPGRADES[key].max_level else f"{level}"
 
-    maxed = lambda level, max_level: f"**MAX**" if level >= max_level else f"{level}"
+    farming_cooldown_level = player_data.farming_cooldown_level
+    cow_owned = player_data.cow_owned
 
-    # If player data is missing specific fields, assume they are 0 instead of adding them
-    farming_cooldown_level = player_data.get("farming_cooldown_level", 0)
-    cow_owned = player_data.get("cow_owned", False)
-
-    # Yield Upgrades (Default to 0 if not found)
+    # Yield Upgrades
     yield_upgrades = {
-        "wheat": player_data.get("wheat_upgrade_level", 0),
-        "wood": player_data.get("wood_upgrade_level", 0),
-        "stone": player_data.get("stone_upgrade_level", 0),
-        "hardwood": player_data.get("hardwood_upgrade_level", 0),
-        "iron_ore": player_data.get("iron_ore_upgrade_level", 0),
-        "silver_ore": player_data.get("silver_ore_upgrade_level", 0),
-        "gold_ore": player_data.get("gold_ore_upgrade_level", 0),
+        "wheat": player_data.wheat_upgrade_level,
+        "wood": player_data.wood_upgrade_level,
+        "stone": player_data.stone_upgrade_level,
+        "hardwood": player_data.hardwood_upgrade_level,
+        "iron_ore": player_data.iron_ore_upgrade_level,
+        "silver_ore": player_data.silver_ore_upgrade_level,
+        "gold_ore": player_data.gold_ore_upgrade_level,
     }
 
-    # Price Upgrades (Default to 0 if not found)
+    # Price Upgrades
     price_upgrades = {
-        "wheat": player_data.get("wheat_price_upgrade_level", 0),
-        "wood": player_data.get("wood_price_upgrade_level", 0),
-        "stone": player_data.get("stone_price_upgrade_level", 0),
-        "hardwood": player_data.get("hardwood_price_upgrade_level", 0),
-        "iron_ore": player_data.get("iron_ore_price_upgrade_level", 0),
-        "silver_ore": player_data.get("silver_ore_price_upgrade_level", 0),
-        "gold_ore": player_data.get("gold_ore_price_upgrade_level", 0),
-        "milk": player_data.get("milk_price_upgrade_level", 0),
+        "wheat": player_data.wheat_price_upgrade_level,
+        "wood": player_data.wood_price_upgrade_level,
+        "stone": player_data.stone_price_upgrade_level,
+        "hardwood": player_data.hardwood_price_upgrade_level,
+        "iron_ore": player_data.iron_ore_price_upgrade_level,
+        "silver_ore": player_data.silver_ore_price_upgrade_level,
+        "gold_ore": player_data.gold_ore_price_upgrade_level,
+        "milk": player_data.milk_price_upgrade_level,
     }
 
     # Upgrade Effects
     cooldown_upgrade_effect = f"Reduces farming cooldown by {0.2 * farming_cooldown_level}s."
     cow_purchase_effect = "Allows you to purchase a cow to start producing milk."
-    milk_price_upgrade_effect = f"Increases money from milk sales by {int(150 * (1.2 ** price_upgrades['milk']) - 150)} per milk."
+    milk_price_upgrade_effect = f"Increases money from milk sales by {MILK_PRICE_PER_LEVEL * price_upgrades['milk']} per milk."
 
     # Total Upgrades Calculation
     total_upgrades = farming_cooldown_level + cow_owned + sum(yield_upgrades.values()) + sum(price_upgrades.values())
@@ -1185,54 +1057,33 @@ async def upgrades(interaction: nextcord.Interaction):
     message += f"💡 **Total Upgrades:** {total_upgrades}\n\n"
 
     if farming_cooldown_level > 0:
-        message += f"⏳ **Farming Cooldown Level:** {maxed(farming_cooldown_level, 20)} - {cooldown_upgrade_effect}\n\n"
+        message += f"⏳ **Farming Cooldown Level:** {maxed(farming_cooldown_level, 'farming_cooldown_level')} - {cooldown_upgrade_effect}\n\n"
 
     if cow_owned:
         message += f"🐄 **Cow Purchased:** ✅ - {cow_purchase_effect}\n\n"
 
     for resource, level in yield_upgrades.items():
         if level > 0:
-            message += f"🔼 **{resource.replace('_', ' ').title()} Yield Level:** {maxed(level, 100)} - Increases {resource} yield by {2 * level} per farm.\n"
+            message += f"🔼 **{resource.replace('_', ' ').title()} Yield Level:** {maxed(level, f'{resource}_upgrade_level')} - Increases {resource} yield by {2 * level} per farm.\n"
 
     for resource, level in price_upgrades.items():
         if level > 0:
-            increase = {
-                "wheat": 2, "wood": 3, "stone": 10, "hardwood": 20,
-                "iron_ore": 35, "silver_ore": 45, "gold_ore": 120
-            }.get(resource, 0)
-            
             if resource == "milk":
-                message += f"\n💰 **Milk Price Level:** {maxed(level, 100)} - {milk_price_upgrade_effect}\n"
+                message += f"\n💰 **Milk Price Level:** {maxed(level, 'milk_price_upgrade_level')} - {milk_price_upgrade_effect}\n"
             else:
-                message += f"💰 **{resource.replace('_', ' ').title()} Price Level:** {maxed(level, 100)} - Increases money from {resource} sales by {increase * level} per unit.\n"
+                message += f"💰 **{resource.replace('_', ' ').title()} Price Level:** {maxed(level, f'{resource}_price_upgrade_level')} - Increases money from {resource} sales by {SELL_PRICES[resource][1] * level} per unit.\n"
 
     await interaction.response.send_message(message, ephemeral=True)
 
 
 
-@client.slash_command(name="rebirth", description="Rebirth to gain a multiplier, resetting upgrades and inventory.")
-async def rebirth(interaction: nextcord.Interaction):
-    user_id = interaction.user.id
-    data = load_json("data.json")
+@player_command(name="rebirth", description="Rebirth to gain a multiplier, resetting upgrades and inventory.")
+async def rebirth(ctx):
+    interaction, user_id, player_data = ctx.interaction, ctx.user_id, ctx.player
 
-    # Check if the user is registered
-    if not is_registered(user_id, data):
-        await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
-        return
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
-
-    player_data = data["players"][str(user_id)]
-
-    # Exponential rebirth price formula
-    base_price = 100000
-    growth_factor = 1.4  # Adjust this for a more moderate scaling
-    rebirth_price = int(base_price * (growth_factor ** player_data["rebirths"]))
-
-    # Round to the nearest 10
-    rebirth_price = round(rebirth_price / 1000) * 1000
+    # Exponential rebirth price, rounded to the nearest 1000 (see game_rules.py)
+    price = rebirth_price(player_data.rebirths)
+    rebirths_when_opened = player_data.rebirths
 
     # Create a view for the rebirth button
     class RebirthView(nextcord.ui.View):
@@ -1240,50 +1091,53 @@ async def rebirth(interaction: nextcord.Interaction):
             super().__init__()
 
             # Disable the rebirth button if the user doesn't have enough money
-            if player_data["money"] < rebirth_price:
+            if player_data.money < price:
                 self.children[0].disabled = True
 
-        @nextcord.ui.button(label=f"Rebirth (Cost: {rebirth_price} coins)", style=nextcord.ButtonStyle.green)
+        @nextcord.ui.button(label=f"Rebirth (Cost: {price} coins)", style=nextcord.ButtonStyle.green)
         async def rebirth_button(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            if player_data["money"] < rebirth_price:
-                await interaction.response.send_message(f"❌ You need {rebirth_price} coins to rebirth.", ephemeral=True)
-                return
-
-            # Deduct the rebirth price
-            player_data["money"] -= rebirth_price
-
-            # Clear inventory and upgrades
-            player_data.update({
-                "money": 0, "wheat": 0, "wood": 0, "stone": 0, "hardwood": 0, "iron_ore": 0,
-                "silver_ore": 0, "gold_ore": 0, "farming_cooldown_level": 0, "wheat_upgrade_level": 0,
-                "wood_upgrade_level": 0, "stone_upgrade_level": 0, "hardwood_upgrade_level": 0,
-                "iron_ore_upgrade_level": 0, "silver_ore_upgrade_level": 0, "gold_ore_upgrade_level": 0,
-                "wheat_price_upgrade_level": 0, "wood_price_upgrade_level": 0, "stone_price_upgrade_level": 0,
-                "hardwood_price_upgrade_level": 0, "iron_ore_price_upgrade_level": 0, "silver_ore_price_upgrade_level": 0,
-                "gold_ore_price_upgrade_level": 0, "rare_artifacts": 0, "candy": 0, "weed": 0, "cucumber": 0,
-                "cow_owned": False, "milk": 0, "stored_milk": 0, "milk_price_upgrade_level": 0,
-                "production_on": False, "debt": 0
-            })
-
-            # Apply rebirth effects
-            player_data["rebirths"] += 1
-            player_data["rebirth_multiplier"] *= 1.1  # Apply 1.1x multiplier
-
-            # Save the data after rebirth
-            save_json("data.json", data)
-
-            # Milestone checks
-            milestone_message = ""
-            milestones = {
-                5: "🎉 You've reached 5 rebirths! You can now collect **stone**!",
-                7: "🎉 You've reached 7 rebirths! You can now collect use the **/plinko** command!!",
-                10: "🎉 You've reached 10 rebirths! You can now collect **hardwood**!",
-                12: "🎉 You've reached 12 rebirths! You can now collect use the **/coinflip** command!!",
-                15: "🎉 You've reached 15 rebirths! You can now collect **iron ore**!",
-                20: "🎉 You've reached 20 rebirths! You can now collect **silver ore**!",
-                25: "🎉 You've reached 25 rebirths! You can now collect **gold ore**!"
-            }
-            milestone_message = milestones.get(player_data["rebirths"], "")
+            async with store.transaction(user_id) as player_data:
+                # The price was worked out when the menu opened; refuse if they've rebirthed since
+                if player_data.rebirths != rebirths_when_opened:
+                    await interaction.response.send_message("❌ This rebirth menu is out of date. Use `/rebirth` again.", ephemeral=True)
+                    return
+
+                if player_data.money < price:
+                    await interaction.response.send_message(f"❌ You need {price} coins to rebirth.", ephemeral=True)
+                    return
+
+                # Deduct the rebirth price
+                player_data.money -= price
+
+                # Clear inventory and upgrades
+                player_data.update({
+                    "money": 0, "wheat": 0, "wood": 0, "stone": 0, "hardwood": 0, "iron_ore": 0,
+                    "silver_ore": 0, "gold_ore": 0, "farming_cooldown_level": 0, "wheat_upgrade_level": 0,
+                    "wood_upgrade_level": 0, "stone_upgrade_level": 0, "hardwood_upgrade_level": 0,
+                    "iron_ore_upgrade_level": 0, "silver_ore_upgrade_level": 0, "gold_ore_upgrade_level": 0,
+                    "wheat_price_upgrade_level": 0, "wood_price_upgrade_level": 0, "stone_price_upgrade_level": 0,
+                    "hardwood_price_upgrade_level": 0, "iron_ore_price_upgrade_level": 0, "silver_ore_price_upgrade_level": 0,
+                    "gold_ore_price_upgrade_level": 0, "rare_artifacts": 0, "candy": 0, "weed": 0, "cucumber": 0,
+                    "cow_owned": False, "milk": 0, "stored_milk": 0, "milk_price_upgrade_level": 0,
+                    "production_on": False, "debt": 0
+                })
+
+                # Apply rebirth effects
+                player_data.rebirths += 1
+                player_data.rebirth_multiplier *= REBIRTH_MULTIPLIER  # Apply 1.1x multiplier
+
+                # Milestone checks
+                milestone_message = ""
+                milestones = {
+                    5: "🎉 You've reached 5 rebirths! You can now collect **stone**!",
+                    7: "🎉 You've reached 7 rebirths! You can now collect use the **/plinko** command!!",
+                    10: "🎉 You've reached 10 rebirths! You can now collect **hardwood**!",
+                    12: "🎉 You've reached 12 rebirths! You can now collect use the **/coinflip** command!!",
+                    15: "🎉 You've reached 15 rebirths! You can now collect **iron ore**!",
+                    20: "🎉 You've reached 20 rebirths! You can now collect **silver ore**!",
+                    25: "🎉 You've reached 25 rebirths! You can now collect **gold ore**!"
+                }
+                milestone_message = milestones.get(player_data.rebirths, "")
 
             # Disable the button after rebirth
             self.children[0].disabled = True
@@ -1291,60 +1145,99 @@ async def rebirth(interaction: nextcord.Interaction):
 
             # Confirm rebirth and the new multiplier
             await interaction.response.send_message(
-                f"🔄 **You rebirthed!** New multiplier: {player_data['rebirth_multiplier']:.2f}x\n{milestone_message}",
+                f"🔄 **You rebirthed!** New multiplier: {player_data.rebirth_multiplier:.2f}x\n{milestone_message}",
                 ephemeral=True
             )
 
     # Send the rebirth menu with the button
     await interaction.response.send_message(
-        f"💡 **Rebirth Information:**\n\nYou currently have {player_data['rebirths']} rebirth(s). \nYour current multiplier is: {player_data['rebirth_multiplier']:.2f}x.\n\n💰 **Current Balance:** {player_data['money']} coins\n\nTo rebirth, press the button below.",
+        f"💡 **Rebirth Information:**\n\nYou currently have {player_data.rebirths} rebirth(s). \nYour current multiplier is: {player_data.rebirth_multiplier:.2f}x.\n\n💰 **Current Balance:** {player_data.money} coins\n\nTo rebirth, press the button below.",
         view=RebirthView(),
         ephemeral=True
     )
 
 
 
-@client.slash_command(name="leaderboard", description="View the top 10 players in different categories.")
-async def leaderboard(interaction: nextcord.Interaction):
-    data = load_json(DATA_FILE)
-    user_id = interaction.user.id
+# Rank lookups come from the store's leaderboard indexes, so they cost about as much as the top 10
+def generate_rank_context(user_id, category, radius=5):
+    """Describe a player's position in a category, plus the players just above and below them."""
+    index = store.indexes[category]
+    user_id = str(user_id)
+    rank = index.rank(user_id)
+    if rank is None:
+        return ""
 
+    label = category.replace('_', ' ').capitalize()
+    message = f"\n📍 **Your Position:** #{rank + 1} of {len(index)} (top {index.top_percent(user_id):.1f}%)\n"
 
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
+    if rank >= 10:
+        for position, (neighbour_id, value) in enumerate(index.slice(rank - radius, rank + radius + 1), start=max(0, rank - radius)):
+            if position < 10:
+                continue  # Already shown in the top 10
+            username = store.view(neighbour_id).get("username", f"Unknown User #{neighbour_id}")
+            if neighbour_id == user_id:
+                message += f"➡️ **{position + 1}. {username}** - {value} {label}\n"
+            else:
+                message += f"🔸 {position + 1}. {username} - {value} {label}\n"
 
-    # Function to generate the leaderboard message dynamically
-    def generate_leaderboard_message(category):
-        # Sort players based on the selected category
-        sorted_players = sorted(data["players"].items(), key=lambda x: x[1].get(category, 0), reverse=True)
+    return message
+
+
+# Rendered top 10 per category: category -> (index version, render time, message)
+leaderboard_cache = {}
+
+# Seconds a rendered top 10 may be reused after stats change, so bursts of clicks don't re-render (0 = always fresh)
+LEADERBOARD_MIN_REFRESH = 5
+
+def render_top_10(category):
+    """Top 10 block of the leaderboard, re-rendered only when the category's index changed."""
+    version = store.indexes[category].version
+    now = time.monotonic()
+    cached = leaderboard_cache.get(category)
+    if cached is not None and (cached[0] == version or now - cached[1] < LEADERBOARD_MIN_REFRESH):
+        return cached[2]
 
-        # Limit to top 10 players
-        top_10 = sorted_players[:10]
+    # Top 10 players for the selected category
+    top_10 = store.top(category, 10)
 
-        # Prepare the leaderboard message
-        leaderboard_message = f"🏆 **Top 10 Players by {category.capitalize()}** 🏆\n\n"
+    # Prepare the leaderboard message
+    leaderboard_message = f"🏆 **Top 10 Players by {category.capitalize()}** 🏆\n\n"
+    
+    for rank in range(10):
+        if rank < len(top_10):
+            user_id, player_data = top_10[rank]
+            username = player_data.username
+            value = player_data[category]
+        else:
+            username = f"-- #{rank + 1}"
+            value = 0
         
-        for rank in range(10):
-            if rank < len(top_10):
-                user_id, player_data = top_10[rank]
-                username = player_data.get("username", f"Unknown User #{user_id}")
-                value = player_data.get(category, 0)
-            else:
-                username = f"-- #{rank + 1}"
-                value = 0
-            
-            # Add emojis for ranks
-            if rank == 0:
-                emoji = "🥇"
-            elif rank == 1:
-                emoji = "🥈"
-            elif rank == 2:
-                emoji = "🥉"
-            else:
-                emoji = "🔹"
+        # Add emojis for ranks
+        if rank == 0:
+            emoji = "🥇"
+        elif rank == 1:
+            emoji = "🥈"
+        elif rank == 2:
+            emoji = "🥉"
+        else:
+            emoji = "🔹"
+
+        leaderboard_message += f"{emoji} **{rank + 1}. {username}** - {value} {category.replace('_', ' ').capitalize()}\n"
+
+    leaderboard_cache[category] = (version, now, leaderboard_message)
+    return leaderboard_message
+
+
+@player_command(name="leaderboard", description="View the top 10 players in different categories.", registered=False, cost=2)
+async def leaderboard(ctx):
+    interaction, user_id = ctx.interaction, ctx.user_id
+
+    # Function to generate the leaderboard message dynamically
+    def generate_leaderboard_message(category, viewer_id):
+        leaderboard_message = render_top_10(category)
 
-            leaderboard_message += f"{emoji} **{rank + 1}. {username}** - {value} {category.replace('_', ' ').capitalize()}\n"
+        # Show the viewer where they stand, with their neighbours if they're outside the top 10
+        leaderboard_message += generate_rank_context(viewer_id, category)
 
         return leaderboard_message
 
@@ -1355,7 +1248,7 @@ async def leaderboard(interaction: nextcord.Interaction):
             self.category = "rebirths"  # Default category is "rebirths"
         
         async def update_leaderboard(self, interaction: nextcord.Interaction):
-            leaderboard_message = generate_leaderboard_message(self.category)
+            leaderboard_message = generate_leaderboard_message(self.category, interaction.user.id)
             await interaction.response.edit_message(content=leaderboard_message, view=self)
 
         # Button for "By Rebirths"
@@ -1379,318 +1272,173 @@ async def leaderboard(interaction: nextcord.Interaction):
 
     # Initial leaderboard message based on "rebirths"
     leaderboard_view = LeaderboardView()
-    leaderboard_message = generate_leaderboard_message("rebirths")
+    leaderboard_message = generate_leaderboard_message("rebirths", user_id)
     
     # Send the initial leaderboard message with buttons
     await interaction.response.send_message(leaderboard_message, view=leaderboard_view)
 
 
 
-@client.slash_command(name="shop", description="Buy upgrades to improve farming efficiency!")
-async def shop(interaction: nextcord.Interaction):
-    user_id = interaction.user.id
-    data = load_json("data.json")  # Load player data
-
-    # Check if the user is registered
-    if not is_registered(user_id, data):
-        await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
-        return
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
-
-    player_data = data["players"][str(user_id)]  # Get player data
+@player_command(name="shop", description="Buy upgrades to improve farming efficiency!")
+async def shop(ctx):
+    interaction, user_id, player_data = ctx.interaction, ctx.user_id, ctx.player
 
     class ShopView(nextcord.ui.View):
-        def __init__(self, message):
+        def __init__(self, message, quantity=1):
             super().__init__()
             self.message = message  # Store the message object for editing later
-
-        async def purchase_upgrade(self, interaction, upgrade_key, max_level, price_func):
-            if player_data[upgrade_key] >= max_level:
-                await interaction.response.send_message("❌ Max level reached!", ephemeral=True)
-                return
-
-            price = price_func(player_data[upgrade_key])
-            if player_data["money"] < price:
-                await interaction.response.send_message("❌ Not enough money!", ephemeral=True)
-                return
-
-            # Deduct money and upgrade the stat
-            player_data["money"] -= price
-            player_data[upgrade_key] += 1
-            save_json("data.json", data)
+            self.quantity = quantity  # Levels bought per click (None = as many as affordable)
+
+            # Top row: how many levels each click buys
+            for label, quantity in SHOP_QUANTITIES:
+                style = nextcord.ButtonStyle.green if quantity == self.quantity else nextcord.ButtonStyle.gray
+                button = nextcord.ui.Button(label=label, style=style, row=0)
+                button.callback = self.make_quantity_callback(quantity)
+                self.add_item(button)
+
+            # One button per upgrade, laid out by SHOP_BUTTONS
+            for upgrade_key, emoji, style, row in SHOP_BUTTONS:
+                button = nextcord.ui.Button(label=f"{emoji} {UPGRADES[upgrade_key].name}", style=style, row=row)
+                button.callback = self.make_purchase_callback(upgrade_key)
+                self.add_item(button)
+
+            self.refresh_buttons(store.get(user_id))
+
+        def make_quantity_callback(self, quantity):
+            async def callback(interaction):
+                self.quantity = quantity
+                for button, (_, button_quantity) in zip(self.children, SHOP_QUANTITIES):
+                    button.style = nextcord.ButtonStyle.green if button_quantity == quantity else nextcord.ButtonStyle.gray
+                await self.update_shop_message(interaction, store.get(user_id))
+            return callback
+
+        def make_purchase_callback(self, upgrade_key):
+            async def callback(interaction):
+                await self.purchase_upgrade(interaction, upgrade_key)
+            return callback
+
+        def refresh_buttons(self, player_data):
+            # Disable upgrades that are maxed out or not unlocked yet
+            for button, (upgrade_key, _, _, _) in zip(self.children[len(SHOP_QUANTITIES):], SHOP_BUTTONS):
+                upgrade = UPGRADES[upgrade_key]
+                button.disabled = (player_data[upgrade_key] >= upgrade.max_level
+                                   or player_data.rebirths < upgrade.unlock_rebirths)
+
+        async def purchase_upgrade(self, interaction, upgrade_key):
+            upgrade = UPGRADES[upgrade_key]
+            async with store.transaction(user_id) as player_data:
+                level = player_data[upgrade_key]
+                if level >= upgrade.max_level:
+                    await interaction.response.send_message("❌ Max level reached!", ephemeral=True)
+                    return
+
+                # Binary search the cumulative costs for how many levels the balance covers
+                count = upgrade.affordable(level, player_data.money, self.quantity)
+                if count == 0:
+                    await interaction.response.send_message("❌ Not enough money!", ephemeral=True)
+                    return
+                # Buy x10 buys all the levels its price showed or none; only Buy Max settles for fewer
+                wanted = self.quantity and min(self.quantity, upgrade.max_level - level)
+                if self.quantity is not None and count < wanted:
+                    await interaction.response.send_message(
+                        f"❌ Not enough money for {wanted} levels! You can afford {count}; use Buy Max to buy them.", ephemeral=True)
+                    return
+
+                # Deduct money and upgrade the stat, all levels at once
+                player_data.money -= upgrade.cost(level, count)
+                player_data[upgrade_key] += count
 
             # Update the message with new prices and balance
-            await self.update_shop_message(interaction)
+            self.refresh_buttons(player_data)
+            await self.update_shop_message(interaction, player_data)
 
-        async def update_shop_message(self, interaction):
-            updated_prices = generate_shop_message(player_data)
+        async def update_shop_message(self, interaction, player_data):
+            updated_prices = generate_shop_message(player_data, self.quantity)
             await self.message.edit(content=updated_prices, view=self)
             await interaction.response.defer()  # Prevents "Interaction failed" errors
 
-        # Top Row: Cooldown Upgrade
-        @nextcord.ui.button(label="🛠️ Cooldown Upgrade", style=nextcord.ButtonStyle.green, row=0)
-        async def buy_cooldown(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "farming_cooldown_level", 20, cooldown_upgrade_price)
-
-        # Row 1: Resource Yield Upgrades (blurple buttons)
-        @nextcord.ui.button(label="🌾 Wheat Yield Upgrade", style=nextcord.ButtonStyle.blurple, row=1)
-        async def buy_wheat_yield(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "wheat_upgrade_level", 100, wheat_upgrade_price)
-
-        @nextcord.ui.button(label="🌲 Wood Yield Upgrade", style=nextcord.ButtonStyle.blurple, row=1)
-        async def buy_wood_yield(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "wood_upgrade_level", 100, wood_upgrade_price)
-
-        # Stone Yield Upgrade: Only show after 5 rebirths
-        @nextcord.ui.button(label="⛏️ Stone Yield Upgrade", style=nextcord.ButtonStyle.blurple, row=1)
-        async def buy_stone_yield(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "stone_upgrade_level", 100, stone_upgrade_price)
-
-        # Hardwood Yield Upgrade: Only show after 10 rebirths
-        @nextcord.ui.button(label="🌳 Hardwood Yield Upgrade", style=nextcord.ButtonStyle.blurple, row=1)
-        async def buy_hardwood_yield(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "hardwood_upgrade_level", 100, hardwood_upgrade_price)
-
-        # Iron Ore Yield Upgrade: Only show after 15 rebirths
-        @nextcord.ui.button(label="⛏️ Iron Ore Yield Upgrade", style=nextcord.ButtonStyle.blurple, row=2)
-        async def buy_iron_ore_yield(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "iron_ore_upgrade_level", 100, iron_ore_upgrade_price)
-
-        # Silver Ore Yield Upgrade: Only show after 20 rebirths
-        @nextcord.ui.button(label="💎 Silver Ore Yield Upgrade", style=nextcord.ButtonStyle.blurple, row=2)
-        async def buy_silver_ore_yield(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "silver_ore_upgrade_level", 100, silver_ore_upgrade_price)
-
-        # Gold Ore Yield Upgrade: Only show after 25 rebirths
-        @nextcord.ui.button(label="🏆 Gold Ore Yield Upgrade", style=nextcord.ButtonStyle.blurple, row=2)
-        async def buy_gold_ore_yield(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "gold_ore_upgrade_level", 100, gold_ore_upgrade_price)
-
-        # Row 2: Price Upgrades (green buttons)
-        @nextcord.ui.button(label="💰 Wheat Price Upgrade", style=nextcord.ButtonStyle.gray, row=3)
-        async def buy_wheat_price(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "wheat_price_upgrade_level", 100, wheat_price_upgrade)
-
-        @nextcord.ui.button(label="💰 Wood Price Upgrade", style=nextcord.ButtonStyle.gray, row=3)
-        async def buy_wood_price(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "wood_price_upgrade_level", 100, wood_price_upgrade)
-
-        @nextcord.ui.button(label="💰 Stone Price Upgrade", style=nextcord.ButtonStyle.gray, row=3)
-        async def buy_stone_price(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "stone_price_upgrade_level", 100, stone_price_upgrade)
-
-        @nextcord.ui.button(label="💰 Hardwood Price Upgrade", style=nextcord.ButtonStyle.gray, row=3)
-        async def buy_hardwood_price(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "hardwood_price_upgrade_level", 100, hardwood_price_upgrade)
-
-        @nextcord.ui.button(label="💰 Iron Ore Price Upgrade", style=nextcord.ButtonStyle.gray, row=4)
-        async def buy_iron_ore_price(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "iron_ore_price_upgrade_level", 100, iron_ore_price_upgrade)
-
-        @nextcord.ui.button(label="💰 Silver Ore Price Upgrade", style=nextcord.ButtonStyle.gray, row=4)
-        async def buy_silver_ore_price(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "silver_ore_price_upgrade_level", 100, silver_ore_price_upgrade)
-
-        @nextcord.ui.button(label="💰 Gold Ore Price Upgrade", style=nextcord.ButtonStyle.gray, row=4)
-        async def buy_gold_ore_price(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-            await self.purchase_upgrade(interaction, "gold_ore_price_upgrade_level", 100, gold_ore_price_upgrade)
-
-
-    # Adjusting buttons visibility based on rebirths
     shop_message = await interaction.response.send_message(
         generate_shop_message(player_data), view=ShopView(None), ephemeral=True
     )
 
     shop_view = ShopView(shop_message)
-    # Disable buttons if player has reached max level for each upgrade
-    if player_data["farming_cooldown_level"] >= 20:
-        shop_view.children[0].disabled = True
-    if player_data["wheat_upgrade_level"] >= 100:
-        shop_view.children[1].disabled = True
-    if player_data["wood_upgrade_level"] >= 100:
-        shop_view.children[2].disabled = True
-    if player_data["stone_upgrade_level"] >= 100:
-        shop_view.children[3].disabled = True
-    if player_data["hardwood_upgrade_level"] >= 100:
-        shop_view.children[4].disabled = True
-    if player_data["iron_ore_upgrade_level"] >= 100:
-        shop_view.children[5].disabled = True
-    if player_data["silver_ore_upgrade_level"] >= 100:
-        shop_view.children[6].disabled = True
-    if player_data["gold_ore_upgrade_level"] >= 100:
-        shop_view.children[7].disabled = True
-
-    # Disable price upgrade buttons if the player has reached max price level
-    if player_data["wheat_price_upgrade_level"] >= 100:
-        shop_view.children[8].disabled = True
-    if player_data["wood_price_upgrade_level"] >= 100:
-        shop_view.children[9].disabled = True
-    if player_data["stone_price_upgrade_level"] >= 100:
-        shop_view.children[10].disabled = True
-    if player_data["hardwood_price_upgrade_level"] >= 100:
-        shop_view.children[11].disabled = True
-    if player_data["iron_ore_price_upgrade_level"] >= 100:
-        shop_view.children[12].disabled = True
-    if player_data["silver_ore_price_upgrade_level"] >= 100:
-        shop_view.children[13].disabled = True
-    if player_data["gold_ore_price_upgrade_level"] >= 100:
-        shop_view.children[14].disabled = True
-
-    # Disable buttons based on rebirths
-    if player_data["rebirths"] < 5:
-        shop_view.children[3].disabled = True  # Stone Yield Upgrade
-        shop_view.children[10].disabled = True  # Stone Price Upgrade
-    if player_data["rebirths"] < 10:
-        shop_view.children[4].disabled = True  # Hardwood Yield Upgrade
-        shop_view.children[11].disabled = True  # Hardwood Price Upgrade
-    if player_data["rebirths"] < 15:
-        shop_view.children[5].disabled = True  # Iron Ore Yield Upgrade
-        shop_view.children[12].disabled = True  # Iron Ore Price Upgrade
-    if player_data["rebirths"] < 20:
-        shop_view.children[6].disabled = True  # Silver Ore Yield Upgrade
-        shop_view.children[13].disabled = True  # Silver Ore Price Upgrade
-    if player_data["rebirths"] < 25:
-        shop_view.children[7].disabled = True  # Gold Ore Yield Upgrade
-        shop_view.children[14].disabled = True  # Gold Ore Price Upgrade
-
     await shop_message.edit(view=shop_view)
 
 
-def generate_shop_message(player_data):
-    balance_display = f"💰 **Current Balance:** {player_data['money']} coins\n\n"
-
-    prices = [
-        f"💰 **Current Balance:** {player_data['money']} coins\n\n"
-        f"🛠️ **Cooldown Upgrade**: {cooldown_upgrade_price(player_data['farming_cooldown_level'])} coins (Level {player_data['farming_cooldown_level']})",
-        f"🔄 **Current Cooldown:** {round(5 - player_data['farming_cooldown_level'] * 0.2, 1)} seconds",
-        "\n━━━━━━━━━━━━━━━━━━\n",  # Separator
-        f"🌾 **Wheat Yield Upgrade**: {wheat_upgrade_price(player_data['wheat_upgrade_level'])} coins (Level {player_data['wheat_upgrade_level']})",
-        f"🌲 **Wood Yield Upgrade**: {wood_upgrade_price(player_data['wood_upgrade_level'])} coins (Level {player_data['wood_upgrade_level']})",
-    ]
-
-    if player_data["rebirths"] >= 5:
-        prices.append(f"⛏️ **Stone Yield Upgrade**: {stone_upgrade_price(player_data['stone_upgrade_level'])} coins (Level {player_data['stone_upgrade_level']})")
-        
-    if player_data["rebirths"] >= 10:
-        prices.append(f"🌳 **Hardwood Yield Upgrade**: {hardwood_upgrade_price(player_data['hardwood_upgrade_level'])} coins (Level {player_data['hardwood_upgrade_level']})")
-        
-    if player_data["rebirths"] >= 15:
-        prices.append(f"⛏️ **Iron Ore Yield Upgrade**: {iron_ore_upgrade_price(player_data['iron_ore_upgrade_level'])} coins (Level {player_data['iron_ore_upgrade_level']})")
-        
-    if player_data["rebirths"] >= 20:
-        prices.append(f"💎 **Silver Ore Yield Upgrade**: {silver_ore_upgrade_price(player_data['silver_ore_upgrade_level'])} coins (Level {player_data['silver_ore_upgrade_level']})")
-        
-    if player_data["rebirths"] >= 25:
-        prices.append(f"🏆 **Gold Ore Yield Upgrade**: {gold_ore_upgrade_price(player_data['gold_ore_upgrade_level'])} coins (Level {player_data['gold_ore_upgrade_level']})")
-        
-    prices.append("\n━━━━━━━━━━━━━━━━━━\n")  # Separator
+# Shop layout: quantity buttons on the top row, then (upgrade, emoji, style, row) for each upgrade button
+SHOP_QUANTITIES = [("Buy x1", 1), ("Buy x10", 10), ("Buy Max", None)]
+
+SHOP_BUTTONS = [
+    ("farming_cooldown_level", "🛠️", nextcord.ButtonStyle.green, 0),
+
+    # Resource yield upgrades (blurple buttons)
+    ("wheat_upgrade_level", "🌾", nextcord.ButtonStyle.blurple, 1),
+    ("wood_upgrade_level", "🌲", nextcord.ButtonStyle.blurple, 1),
+    ("stone_upgrade_level", "⛏️", nextcord.ButtonStyle.blurple, 1),
+    ("hardwood_upgrade_level", "🌳", nextcord.ButtonStyle.blurple, 1),
+    ("iron_ore_upgrade_level", "⛏️", nextcord.ButtonStyle.blurple, 2),
+    ("silver_ore_upgrade_level", "💎", nextcord.ButtonStyle.blurple, 2),
+    ("gold_ore_upgrade_level", "🏆", nextcord.ButtonStyle.blurple, 2),
+
+    # Price upgrades (gray buttons)
+    ("wheat_price_upgrade_level", "💰", nextcord.ButtonStyle.gray, 3),
+    ("wood_price_upgrade_level", "💰", nextcord.ButtonStyle.gray, 3),
+    ("stone_price_upgrade_level", "💰", nextcord.ButtonStyle.gray, 3),
+    ("hardwood_price_upgrade_level", "💰", nextcord.ButtonStyle.gray, 3),
+    ("iron_ore_price_upgrade_level", "💰", nextcord.ButtonStyle.gray, 4),
+    ("silver_ore_price_upgrade_level", "💰", nextcord.ButtonStyle.gray, 4),
+    ("gold_ore_price_upgrade_level", "💰", nextcord.ButtonStyle.gray, 4),
+]
 
-    # Price upgrades
-    prices.append(f"💰 **Wheat Price Upgrade**: {wheat_price_upgrade(player_data['wheat_price_upgrade_level'])} coins (Level {player_data['wheat_price_upgrade_level']})")
-    prices.append(f"📈 **New Base Price:** {1 + player_data['wheat_price_upgrade_level'] * 2}")
+# New base sell price shown under each price upgrade: (upgrade, base, per level)
+SHOP_BASE_PRICES = {f"{resource}_price_upgrade_level": prices for resource, prices in SELL_PRICES.items()}
 
-    prices.append(f"💰 **Wood Price Upgrade**: {wood_price_upgrade(player_data['wood_price_upgrade_level'])} coins (Level {player_data['wood_price_upgrade_level']})")
-    prices.append(f"📈 **New Base Price:** {5 + player_data['wood_price_upgrade_level'] * 3}")
 
-    if player_data["rebirths"] >= 5:
-        prices.append(f"💰 **Stone Price Upgrade**: {stone_price_upgrade(player_data['stone_price_upgrade_level'])} coins (Level {player_data['stone_price_upgrade_level']})")
-        prices.append(f"📈 **New Base Price:** {25 + player_data['stone_price_upgrade_level'] * 10}")
+def format_upgrade_cost(player_data, upgrade_key, quantity=1):
+    """Price line for an upgrade: the next level, or the levels a multi-buy click would get."""
+    upgrade = UPGRADES[upgrade_key]
+    level = player_data[upgrade_key]
+    if level >= upgrade.max_level:
+        return f"MAXED (Level {level})"
+    if quantity == 1:
+        return f"{upgrade.prices[level]} coins (Level {level})"
 
-    if player_data["rebirths"] >= 10:
-        prices.append(f"💰 **Hardwood Price Upgrade**: {hardwood_price_upgrade(player_data['hardwood_price_upgrade_level'])} coins (Level {player_data['hardwood_price_upgrade_level']})")
-        prices.append(f"📈 **New Base Price:** {100 + player_data['hardwood_price_upgrade_level'] * 20}")
+    if quantity is None:
+        count = upgrade.affordable(level, player_data.money)
+    else:
+        count = min(quantity, upgrade.max_level - level)
+    if count == 0:
+        return f"{upgrade.prices[level]} coins (Level {level}, can't afford any)"
+    return f"{upgrade.cost(level, count)} coins for {count} level{'s' if count != 1 else ''} (Level {level})"
 
-    if player_data["rebirths"] >= 15:
-        prices.append(f"💰 **Iron Ore Price Upgrade**: {iron_ore_price_upgrade(player_data['iron_ore_price_upgrade_level'])} coins (Level {player_data['iron_ore_price_upgrade_level']})")
-        prices.append(f"📈 **New Base Price:** {300 + player_data['iron_ore_price_upgrade_level'] * 35}")
 
-    if player_data["rebirths"] >= 20:
-        prices.append(f"💰 **Silver Ore Price Upgrade**: {silver_ore_price_upgrade(player_data['silver_ore_price_upgrade_level'])} coins (Level {player_data['silver_ore_price_upgrade_level']})")
-        prices.append(f"📈 **New Base Price:** {750 + player_data['silver_ore_price_upgrade_level'] * 45}")
+def generate_shop_message(player_data, quantity=1):
+    prices = [
+        f"💰 **Current Balance:** {player_data.money} coins\n\n"
+        f"🛠️ **Cooldown Upgrade**: {format_upgrade_cost(player_data, 'farming_cooldown_level', quantity)}",
+        f"🔄 **Current Cooldown:** {round(5 - player_data.farming_cooldown_level * 0.2, 1)} seconds",
+        "\n━━━━━━━━━━━━━━━━━━\n",  # Separator
+    ]
 
-    if player_data["rebirths"] >= 25:
-        prices.append(f"💰 **Gold Ore Price Upgrade**: {gold_ore_price_upgrade(player_data['gold_ore_price_upgrade_level'])} coins (Level {player_data['gold_ore_price_upgrade_level']})")
-        prices.append(f"📈 **New Base Price:** {2000 + player_data['gold_ore_price_upgrade_level'] * 120}")
+    for upgrade_key, emoji, _, _ in SHOP_BUTTONS[1:]:
+        upgrade = UPGRADES[upgrade_key]
+        if player_data.rebirths < upgrade.unlock_rebirths:
+            continue
+        if upgrade_key == "wheat_price_upgrade_level":
+            prices.append("\n━━━━━━━━━━━━━━━━━━\n")  # Separator between yield and price upgrades
 
+        prices.append(f"{emoji} **{upgrade.name}**: {format_upgrade_cost(player_data, upgrade_key, quantity)}")
+        if upgrade_key in SHOP_BASE_PRICES:
+            base, per_level = SHOP_BASE_PRICES[upgrade_key]
+            prices.append(f"📈 **New Base Price:** {base + player_data[upgrade_key] * per_level}")
 
     return "\n".join(prices)
 
 
 
-
-# Price Scaling Functions (Updated with Specific Prices)
-def cooldown_upgrade_price(level):
-    return int(250 * (1.5 ** level) + (level * 100))
-
-def wheat_upgrade_price(level):
-    return int(50 * (1.3 ** level) + (level * 10))  # Base price for wheat yield upgrade
-
-def wood_upgrade_price(level):
-    return int(80 * (1.3 ** level) + (level * 20))  # Wood yield upgrade price
-
-def stone_upgrade_price(level):
-    return int(120 * (1.4 ** level) + (level * 30))  # Stone yield upgrade price
-
-def hardwood_upgrade_price(level):
-    return int(160 * (1.4 ** level) + (level * 40))  # Hardwood yield upgrade price
-
-def iron_ore_upgrade_price(level):
-    return int(200 * (1.5 ** level) + (level * 50))  # Iron Ore yield upgrade price
-
-def silver_ore_upgrade_price(level):
-    return int(250 * (1.6 ** level) + (level * 60))  # Silver Ore yield upgrade price
-
-def gold_ore_upgrade_price(level):
-    return int(300 * (1.7 ** level) + (level * 70))  # Gold Ore yield upgrade price
-
-def wheat_price_upgrade(level):
-    return int(50 * (1.4 ** level) + (level * 10))  # Wheat price upgrade
-
-def wood_price_upgrade(level):
-    return int(80 * (1.4 ** level) + (level * 15))  # Wood price upgrade
-
-def stone_price_upgrade(level):
-    return int(120 * (1.5 ** level) + (level * 25))  # Stone price upgrade
-
-def hardwood_price_upgrade(level):
-    return int(160 * (1.5 ** level) + (level * 35))  # Hardwood price upgrade
-
-def iron_ore_price_upgrade(level):
-    return int(200 * (1.6 ** level) + (level * 45))  # Iron Ore price upgrade
-
-def silver_ore_price_upgrade(level):
-    return int(250 * (1.7 ** level) + (level * 55))  # Silver Ore price upgrade
-
-def gold_ore_price_upgrade(level):
-    return int(300 * (1.8 ** level) + (level * 65))  # Gold Ore price upgrade
-
-
-
-@client.slash_command(name="cowshop", description="Buy cows and upgrade milk prices!")
-async def cowshop(interaction: nextcord.Interaction):
-    user_id = interaction.user.id
-    data = load_json(DATA_FILE)  # Load player data
-
-    # Check if the user is registered
-    if not is_registered(user_id, data):
-        await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
-        return
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
-
-    player_data = data["players"][str(user_id)]  # Get player data
-
-    # Initialize missing keys if they don't exist yet
-    player_data.setdefault("cow_owned", False)  # Default to False if the player doesn't have a cow
-    player_data.setdefault("milk", 0)  # Initialize milk amount to 0
-    player_data.setdefault("milk_price_upgrade_level", 0)  # Initialize upgrade level to 0
-    player_data.setdefault("money", 0)  # Ensure player has money initialized
-    player_data.setdefault("stored_milk", 0)  # Ensure stored milk is initialized
+@player_command(name="cowshop", description="Buy cows and upgrade milk prices!")
+async def cowshop(ctx):
+    interaction, user_id, player_data = ctx.interaction, ctx.user_id, ctx.player
 
     class CowShopView(nextcord.ui.View):
         def __init__(self, message):
@@ -1698,47 +1446,49 @@ async def cowshop(interaction: nextcord.Interaction):
             self.message = message  # Store the message object for editing later
 
             # Disable the "Buy Cow" button if the player already owns a cow
-            if player_data["cow_owned"]:
+            if player_data.cow_owned:
                 self.children[0].disabled = True  # Disable "Buy Cow" button
             
             # Disable the "Upgrade Milk Price" button if the player reached level 50
-            if player_data["milk_price_upgrade_level"] >= 50:
+            if player_data.milk_price_upgrade_level >= UPGRADES["milk_price_upgrade_level"].max_level:
                 self.children[1].disabled = True  # Disable milk price upgrade button
 
         async def purchase_cow(self, interaction):
-            if player_data["cow_owned"]:
-                await interaction.response.send_message("❌ You already own a cow!", ephemeral=True)
-                return
+            async with store.transaction(user_id) as player_data:
+                if player_data.cow_owned:
+                    await interaction.response.send_message("❌ You already own a cow!", ephemeral=True)
+                    return
 
-            if player_data["money"] < 50000:
-                await interaction.response.send_message("❌ Not enough money to buy a cow!", ephemeral=True)
-                return
+                if player_data.money < 50000:
+                    await interaction.response.send_message("❌ Not enough money to buy a cow!", ephemeral=True)
+                    return
+
+                # Deduct money and grant the cow
+                player_data.money -= 50000
+                player_data.cow_owned = True
+                player_data.milk = 0  # Initialize the milk amount to 0 when the cow is bought
 
-            # Deduct money and grant the cow
-            player_data["money"] -= 50000
-            player_data["cow_owned"] = True
-            player_data["milk"] = 0  # Initialize the milk amount to 0 when the cow is bought
-            save_json(DATA_FILE, data)
-            await self.update_cowshop_message(interaction)
+            await self.update_cowshop_message(interaction, player_data)
 
         async def upgrade_milk_price(self, interaction):
-            price = milk_price_upgrade_cost(player_data["milk_price_upgrade_level"])
+            async with store.transaction(user_id) as player_data:
+                upgrade = UPGRADES["milk_price_upgrade_level"]
+                if player_data.milk_price_upgrade_level >= upgrade.max_level:
+                    await interaction.response.send_message("❌ Maximum upgrade level reached for milk price!", ephemeral=True)
+                    return
 
-            if player_data["money"] < price:
-                await interaction.response.send_message("❌ Not enough money to upgrade milk price!", ephemeral=True)
-                return
+                price = upgrade.prices[player_data.milk_price_upgrade_level]
+                if player_data.money < price:
+                    await interaction.response.send_message("❌ Not enough money to upgrade milk price!", ephemeral=True)
+                    return
 
-            if player_data["milk_price_upgrade_level"] >= 50:
-                await interaction.response.send_message("❌ Maximum upgrade level reached for milk price!", ephemeral=True)
-                return
+                # Deduct money and upgrade milk price
+                player_data.money -= price
+                player_data.milk_price_upgrade_level += 1
 
-            # Deduct money and upgrade milk price
-            player_data["money"] -= price
-            player_data["milk_price_upgrade_level"] += 1
-            save_json(DATA_FILE, data)
-            await self.update_cowshop_message(interaction)
+            await self.update_cowshop_message(interaction, player_data)
 
-        async def update_cowshop_message(self, interaction):
+        async def update_cowshop_message(self, interaction, player_data):
             updated_message = generate_cowshop_message(player_data)
             await self.message.edit(content=updated_message, view=self)
             await interaction.response.defer()  # Prevents "Interaction failed" errors
@@ -1765,17 +1515,17 @@ async def cowshop(interaction: nextcord.Interaction):
 # Function to generate the cowshop message dynamically
 def generate_cowshop_message(player_data):
     prices = [
-        f"💸 **Your Balance:** {player_data['money']} coins\n\n",
+        f"💸 **Your Balance:** {player_data.money} coins\n\n",
         "🛒 **Welcome to the Cow Shop!**\n*Buy a cow and upgrade milk prices!*",
         "\n",  # Blank row
-        f"🐄 **Buy Cow (50,000 coins):** {'✅ Purchased' if player_data['cow_owned'] else '❌ Not Owned'}",
-        f"💰 Milk Price Upgrade: {milk_price_upgrade_cost(player_data['milk_price_upgrade_level'])} coins (Level {player_data['milk_price_upgrade_level']})"
+        f"🐄 **Buy Cow (50,000 coins):** {'✅ Purchased' if player_data.cow_owned else '❌ Not Owned'}",
+        f"💰 Milk Price Upgrade: {format_upgrade_cost(player_data, 'milk_price_upgrade_level')}"
     ]
     
     # If player owns a cow, display the milk price without decimals
-    if player_data['cow_owned']:
-        milk_price = int(150 * (1.2 ** player_data['milk_price_upgrade_level']))
-        prices.append(f"**Milk Price:** {milk_price} coins per milk")
+    if player_data.cow_owned:
+        price_per_milk = int(milk_price(player_data.milk_price_upgrade_level, player_data.rebirth_multiplier))
+        prices.append(f"**Milk Price:** {price_per_milk} coins per milk")
     else:
         prices.append("**Milk Price:** Not yet available until you buy a cow!")
 
@@ -1783,50 +1533,48 @@ def generate_cowshop_message(player_data):
 
 
 
-# Define the price and upgrade function for milk price upgrade
-def milk_price_upgrade(level):
-    base_price = 150  # Base price of milk
-    return int(base_price * (1.2 ** level))  # Prices increase with each level
+# A streak is lost if the next claim doesn't happen by the end of the following UTC day
+def schedule_streak_expiry(user_id, player_data):
+    """Queue the UTC midnight at which the player's current daily streak runs out."""
+    last_claim = player_data.last_daily_claim
+    expires = datetime.strptime(last_claim, "%Y-%m-%d").replace(tzinfo=timezone.utc) + timedelta(days=2)
+    scheduler.schedule("streak_expiry", str(user_id), expires.timestamp(), last_claim)
 
-def milk_price_upgrade_cost(level):
-    return int(300 * (1.6 ** level) + (level * 75))  # MILK!!!
+async def on_streak_expiry(user_id, last_claim):
+    if store.get(user_id) is None:
+        return
+    async with store.transaction(user_id) as player_data:
+        # Only reset if they haven't claimed again since this was scheduled
+        if player_data.last_daily_claim == last_claim:
+            player_data.daily_streak = 0
 
+scheduler.register("streak_expiry", on_streak_expiry)
 
 
+def rebuild_schedule():
+    """Recreate the timed events from player data, replacing any saved copies of them."""
+    for user_id, player_data in store.players():
+        if player_data.production_on and player_data.cow_time_started is not None:
+            store.get(user_id)  # Snapshot first, so a cow that settles to the same state isn't rewritten
+            settle_milk(player_data)
+            schedule_milk_full(user_id, player_data)
+            store.mark_dirty(user_id)
+        if player_data.last_daily_claim and player_data.daily_streak > 0:
+            schedule_streak_expiry(user_id, player_data)
 
-@client.slash_command(name="daily", description="Claim your daily reward!")
-async def daily(interaction: nextcord.Interaction):
-    user_id = interaction.user.id
-    data = load_json("data.json")
+# schedule.json is only saved every so often, so after a crash it can miss events scheduled just before.
+# Every event follows from player data, which is saved far more often, so rebuild them on every start.
+scheduler.load()
+rebuild_schedule()
 
-    # Check if the user is registered
-    if not is_registered(user_id, data):
-        await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
-        return
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
 
-    player_data = data["players"][str(user_id)]
-
-    # Initialize missing keys if they don't exist
-    player_data.setdefault("last_daily_claim", None)
-    player_data.setdefault("daily_streak", 0)
-    player_data.setdefault("longest_streak", 0)
-    player_data.setdefault("total_claims", 0)
-    player_data.setdefault("money", 0)
-    player_data.setdefault("wheat", 0)
-    player_data.setdefault("wood", 0)
-    player_data.setdefault("stone", 0)
-    player_data.setdefault("hardwood", 0)
-    player_data.setdefault("iron_ore", 0)
-    player_data.setdefault("silver_ore", 0)
-    player_data.setdefault("gold_ore", 0)
+@player_command(name="daily", description="Claim your daily reward!", writes=True)
+async def daily(ctx):
+    interaction, user_id, player_data = ctx.interaction, ctx.user_id, ctx.player
 
     # Get current date in UTC
     today = datetime.now(timezone.utc).date()
-    last_claim_str = player_data["last_daily_claim"]
+    last_claim_str = player_data.last_daily_claim
 
     # Check if last claim exists and is valid
     last_claim = datetime.strptime(last_claim_str, "%Y-%m-%d").date() if last_claim_str else None
@@ -1836,43 +1584,33 @@ async def daily(interaction: nextcord.Interaction):
 
     # Check if the streak is maintained or reset
     if last_claim and last_claim + timedelta(days=1) == today:
-        player_data["daily_streak"] += 1  # Increase streak
+        player_data.daily_streak += 1  # Increase streak
     else:
-        player_data["daily_streak"] = 1  # Reset streak if a day was missed
+        player_data.daily_streak = 1  # Reset streak if a day was missed
 
-    streak = player_data["daily_streak"]
+    streak = player_data.daily_streak
 
     # Update longest streak if current streak exceeds it
-    player_data["longest_streak"] = max(player_data["longest_streak"], streak)
+    player_data.longest_streak = max(player_data.longest_streak, streak)
 
     # Increment the total dailies claimed
-    player_data["total_claims"] += 1
+    player_data.total_claims += 1
 
     # Unlock resources based on rebirths
-    rebirths = player_data.get("rebirths", 0)
-    rebirth_multiplier = player_data.get("rebirth_multiplier", 1.0)
-
-    # Calculate base rewards, then apply streak and rebirth multiplier
-    wheat_reward = round(random.randint(2, 5) * (1 + streak / 2) * rebirth_multiplier)
-    wood_reward = round(random.randint(2, 5) * (1 + streak / 2.5) * rebirth_multiplier)
-    stone_reward = round(random.randint(1, 3) * (1 + streak / 3) * rebirth_multiplier)
-    hardwood_reward = iron_ore_reward = silver_ore_reward = gold_ore_reward = 0
-
-    # Unlock resources based on rebirth requirements
-    if rebirths >= 5:
-        hardwood_reward = round(random.randint(0, 2) * (1 + streak / 3.5) * rebirth_multiplier)
-    if rebirths >= 10:
-        iron_ore_reward = round(random.randint(0, 2) * (1 + streak / 3.5) * rebirth_multiplier)
-    if rebirths >= 15:
-        silver_ore_reward = round(random.randint(0, 2) * (1 + streak / 4) * rebirth_multiplier)
-    if rebirths >= 20:
-        gold_ore_reward = round(random.randint(0, 2) * (1 + streak / 4) * rebirth_multiplier)
+    rebirths = player_data.rebirths
+    rebirth_multiplier = player_data.rebirth_multiplier
+
+    # Calculate base rewards, then apply streak and rebirth multiplier (resources unlock with rebirths)
+    rewards = {}
+    for key, low, high, divisor, unlock_rebirths in DAILY_RESOURCES:
+        rewards[key] = daily_reward(random.randint(low, high), streak, divisor, rebirth_multiplier) if rebirths >= unlock_rebirths else 0
 
     # Calculate the money reward with the same scaling
-    money_reward = round(random.uniform(50, 100) * (1 + streak / 1.5) * rebirth_multiplier)
+    low, high, divisor = DAILY_MONEY
+    money_reward = daily_reward(random.uniform(low, high), streak, divisor, rebirth_multiplier)
 
     # Check if the user has any debt
-    debt = player_data.get("debt", 0)
+    debt = player_data.debt
 
     # Initialize the debt message to an empty string
     debt_cleared_message = ""
@@ -1881,39 +1619,33 @@ async def daily(interaction: nextcord.Interaction):
     if debt > 0:
         if money_reward >= debt:
             remaining_money = money_reward - debt  # Money after clearing debt
-            player_data["money"] += remaining_money  # Add the remaining money after clearing debt
-            player_data["debt"] = 0  # Clear the debt
+            player_data.money += remaining_money  # Add the remaining money after clearing debt
+            player_data.debt = 0  # Clear the debt
             debt_cleared_message = f"Your debt of {debt} coins has been **cleared**!"
         else:
-            player_data["debt"] -= money_reward  # Reduce the debt by the money rewarded
-            player_data["money"] = 0  # Money stays 0 since debt is still present
-            debt_cleared_message = f"Your remaining debt is **{player_data['debt']} coins**."
+            player_data.debt -= money_reward  # Reduce the debt by the money rewarded
+            player_data.money = 0  # Money stays 0 since debt is still present
+            debt_cleared_message = f"Your remaining debt is **{player_data.debt} coins**."
     else:
-        player_data["money"] += money_reward  # No debt, just add the money reward
+        player_data.money += money_reward  # No debt, just add the money reward
 
     # Update player stats
-    player_data["wheat"] += wheat_reward
-    player_data["wood"] += wood_reward
-    player_data["stone"] += stone_reward
-    player_data["hardwood"] += hardwood_reward
-    player_data["iron_ore"] += iron_ore_reward
-    player_data["silver_ore"] += silver_ore_reward
-    player_data["gold_ore"] += gold_ore_reward
-    player_data["last_daily_claim"] = today.strftime("%Y-%m-%d")
-
-    save_json("data.json", data)
+    for key, reward in rewards.items():
+        player_data[key] += reward
+    player_data.last_daily_claim = today.strftime("%Y-%m-%d")
+    schedule_streak_expiry(user_id, player_data)
 
     # Create response message
     reward_message = (
         f"🎉 **Daily Reward Claimed!** (Streak: {streak} days) 🎉\n"
         f"💰 **Money:** +${money_reward}\n"
-        f"🌾 **Wheat:** +{wheat_reward}\n"
-        f"🌲 **Wood:** +{wood_reward}\n"
-        f"⛏️ **Stone:** +{stone_reward}\n"
-        f"🌳 **Hardwood:** +{hardwood_reward}\n"
-        f"⚒️ **Iron Ore:** +{iron_ore_reward}\n"
-        f"💎 **Silver Ore:** +{silver_ore_reward}\n"
-        f"🏅 **Gold Ore:** +{gold_ore_reward}\n"
+        f"🌾 **Wheat:** +{rewards['wheat']}\n"
+        f"🌲 **Wood:** +{rewards['wood']}\n"
+        f"⛏️ **Stone:** +{rewards['stone']}\n"
+        f"🌳 **Hardwood:** +{rewards['hardwood']}\n"
+        f"⚒️ **Iron Ore:** +{rewards['iron_ore']}\n"
+        f"💎 **Silver Ore:** +{rewards['silver_ore']}\n"
+        f"🏅 **Gold Ore:** +{rewards['gold_ore']}\n"
         f"\n{debt_cleared_message}\n"  # Add message about clearing debt or remaining debt
         f"Claim again tomorrow to increase your streak! 🔥\n"
     )
@@ -1923,31 +1655,14 @@ async def daily(interaction: nextcord.Interaction):
 
 
 
-@client.slash_command(name="streak", description="Check your daily streak information.")
-async def streak(interaction: nextcord.Interaction):
-    user_id = interaction.user.id
-    data = load_json("data.json")
-
-    # Check if the user is registered
-    if not is_registered(user_id, data):
-        await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
-        return
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
-
-    player_data = data["players"][str(user_id)]
-
-    # Initialize missing keys if they don't exist
-    player_data.setdefault("daily_streak", 0)
-    player_data.setdefault("longest_streak", 0)
-    player_data.setdefault("total_claims", 0)
+@player_command(name="streak", description="Check your daily streak information.")
+async def streak(ctx):
+    interaction, player_data = ctx.interaction, ctx.player
 
     # Retrieve current streak, longest streak, and total claims
-    current_streak = player_data["daily_streak"]
-    longest_streak = player_data["longest_streak"]
-    total_claims = player_data["total_claims"]
+    current_streak = player_data.daily_streak
+    longest_streak = player_data.longest_streak
+    total_claims = player_data.total_claims
 
     # Create response message
     streak_message = (
@@ -1960,31 +1675,67 @@ async def streak(interaction: nextcord.Interaction):
     await interaction.response.send_message(streak_message, ephemeral=True)
 
 
-@client.slash_command(name="plinko", description="Gamble your money and try to win big!")
-async def plinko(interaction: nextcord.Interaction, amount: int):
-    user_id = interaction.user.id
+# Rendered /economy message: (columns version, render time, message)
+economy_cache = None
+
+def render_economy():
+    """Economy overview from the store's stat columns, re-rendered at most every LEADERBOARD_MIN_REFRESH seconds."""
+    global economy_cache
+    columns = store.columns
+    now = time.monotonic()
+    if economy_cache is not None and (economy_cache[0] == columns.version or now - economy_cache[1] < LEADERBOARD_MIN_REFRESH):
+        return economy_cache[2]
+
+    money = columns.summary("money")
+    debt = columns.summary("debt")
+    money_percentiles = columns.percentiles("money", (50, 90, 99))
+    gambled = columns.summary("total_gambled")
+    gambling_net = columns.summary("total_earned_or_lost")
+    rebirths = sorted(columns.distribution("rebirths").items())
+
+    rebirth_lines = "\n".join(f"🔹 **{int(count)} rebirths:** {players:,} players" for count, players in rebirths[-5:])
+    message = (
+        f"📊 **Economy Overview** 📊\n\n"
+        f"👥 **Players:** {money['count']:,}\n"
+        f"💰 **Money Supply:** {money['total']:,.0f} coins\n"
+        f"💸 **Total Debt:** {debt['total']:,.0f} coins\n"
+        f"⚖️ **Average Balance:** {money['mean']:,.0f} coins\n"
+        f"📈 **Median / Top 10% / Top 1%:** {money_percentiles[50]:,.0f} / {money_percentiles[90]:,.0f} / {money_percentiles[99]:,.0f} coins\n"
+        f"🏭 **All-Time Sales:** {columns.summary('total_earnings')['total']:,.0f} coins over {columns.summary('farm_usage_count')['total']:,.0f} farms\n"
+        f"🎰 **Gambled:** {gambled['total']:,.0f} coins (players net {gambling_net['total']:+,.0f})\n\n"
+        f"🔄 **Highest Rebirth Counts:**\n{rebirth_lines}\n"
+    )
+    economy_cache = (columns.version, now, message)
+    return message
+
 
-    # Load player data
-    data = load_json(DATA_FILE)
+@player_command(name="economy", description="See the money supply and how wealth is spread across players.", cost=2)
+async def economy(ctx):
+    interaction = ctx.interaction
 
-    if not is_registered(user_id, data):
-        await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
+    if store.columns is None:
+        await interaction.response.send_message("❌ Economy stats aren't available (numpy isn't installed).", ephemeral=True)
         return
 
-    player_data = data["players"].get(str(user_id), {})
+    await interaction.response.send_message(render_economy())
+
+
+@player_command(name="plinko", description="Gamble your money and try to win big!", writes=True)
+async def plinko(ctx, amount: int):
+    interaction, player_data = ctx.interaction, ctx.player
 
     # Check if the user has at least 7 rebirths
-    if player_data["rebirths"] < 7:
-        await interaction.response.send_message("⚠️ You need at least 7 rebirths to play the plinko! Keep rebirthing to unlock this.", ephemeral=True)
+    if player_data.rebirths < PLINKO_REBIRTHS:
+        await interaction.response.send_message(f"⚠️ You need at least {PLINKO_REBIRTHS} rebirths to play the plinko! Keep rebirthing to unlock this.", ephemeral=True)
         return
 
     # Retrieve user balance and debt
-    money = player_data.get("money", 0)
-    total_debt = player_data.get("debt", 0)
+    money = player_data.money
+    total_debt = player_data.debt
 
 
      # **NEW**: Limit betting if the user is in debt
-    max_bet_if_in_debt = 25000
+    max_bet_if_in_debt = MAX_BET_IN_DEBT
     if (total_debt > 0 or money <= 0) and amount > max_bet_if_in_debt:
         await interaction.response.send_message(
             f"🚫 You are in debt! While in debt, you can only bet up to **{max_bet_if_in_debt} coins**.",
@@ -1992,25 +1743,9 @@ async def plinko(interaction: nextcord.Interaction, amount: int):
         )
         return
 
-    player_data.setdefault("total_gambled", 0)
-    player_data.setdefault("total_earned_or_lost", 0.0)
-
-
-    # Gambling multipliers
-    outcome = random.choices(
-        ["25x", "10x", "5x", "3x", "2x", "1.5x", "1x", "0.5x", "0.2x", "0x", "-5x"],
-        weights=[0.1, 0.4, 1.5, 2, 5, 10, 19, 19, 33, 7, 3],
-        k=1
-    )[0]
 
-
-    multipliers = {
-        "25x": 25, "10x": 10, "5x": 5, "3x": 3, "2x": 2,
-        "1.5x": 1.5, "1x": 1, "0.5x": 0.5, "0.2x": 0.2,
-        "0x": 0, "-5x": -5
-    }
-
-    multiplier = multipliers[outcome]
+    # Gambling multipliers (odds in game_rules.py)
+    outcome, multiplier, _ = random.choices(PLINKO_OUTCOMES, weights=PLINKO_WEIGHTS, k=1)[0]
     earnings = amount * multiplier
     net_gain_or_loss = earnings - amount  # The actual change in money
 
@@ -2035,10 +1770,10 @@ async def plinko(interaction: nextcord.Interaction, amount: int):
         money += earnings  # No debt, just add winnings
 
     # Update player data
-    player_data["money"] = money
-    player_data["debt"] = total_debt
-    player_data["total_gambled"] += 1
-    player_data["total_earned_or_lost"] += net_gain_or_loss
+    player_data.money = money
+    player_data.debt = total_debt
+    player_data.total_gambled += 1
+    player_data.total_earned_or_lost += net_gain_or_loss
 
     # 🔥 NEW: Dynamic message formatting for clarity 🔥
     if net_gain_or_loss > 0:
@@ -2069,12 +1804,10 @@ async def plinko(interaction: nextcord.Interaction, amount: int):
     # Send message to user
     await interaction.response.send_message(final_message, ephemeral=True)
 
-    # Save the data
-    save_json(DATA_FILE, data)
 
-@client.slash_command(name="coinflip", description="Flip a coin and try your luck!")
+@player_command(name="coinflip", description="Flip a coin and try your luck!", writes=True)
 async def coinflip(
-    interaction: nextcord.Interaction,
+    ctx,
     bet: str = nextcord.SlashOption(
         name="bet",
         description="Choose what to bet on",
@@ -2087,37 +1820,19 @@ async def coinflip(
         required=True
     )
 ):
-    user_id = interaction.user.id
-
-    # Load player data
-    data = load_json(DATA_FILE)
-
-    # Check if the user is registered
-    if not is_registered(user_id, data):
-        await interaction.response.send_message("⚠️ You need to register first! Please use `/register` to create an account.", ephemeral=True)
-        return
-    
-    if is_banned(user_id, data):
-        await interaction.response.send_message("⛔ You are banned from using this bot.", ephemeral=True)
-        return
-
-    player_data = data["players"].get(str(user_id), {})
-
-    # Ensure the player has necessary attributes
-    player_data.setdefault("total_earned_or_lost", 0)
-    player_data.setdefault("coinflip_uses", 0)
+    interaction, player_data = ctx.interaction, ctx.player
 
     # Check if the user has at least 12 rebirths
-    if player_data["rebirths"] < 12:
-        await interaction.response.send_message("⚠️ You need at least 12 rebirths to play the coinflip game. Keep rebirthing to unlock this.", ephemeral=True)
+    if player_data.rebirths < COINFLIP_REBIRTHS:
+        await interaction.response.send_message(f"⚠️ You need at least {COINFLIP_REBIRTHS} rebirths to play the coinflip game. Keep rebirthing to unlock this.", ephemeral=True)
         return
 
     # Retrieve user balance and debt
-    money = player_data.get("money", 0)
-    total_debt = player_data.get("debt", 0)
+    money = player_data.money
+    total_debt = player_data.debt
 
     # **NEW**: Limit betting if the user is in debt
-    max_bet_if_in_debt = 25000
+    max_bet_if_in_debt = MAX_BET_IN_DEBT
     if (total_debt > 0 or money <= 0) and amount > max_bet_if_in_debt:
         await interaction.response.send_message(
             f"🚫 You are in debt! While in debt, you can only bet up to **{max_bet_if_in_debt} coins**.",
@@ -2125,26 +1840,11 @@ async def coinflip(
         )
         return
 
-    # Define the odds and multipliers for the bets
-    if bet == "Heads":
-        odds = {"Heads": 19.99, "Tails": 80, "Side": 0.01}
-        win_multiplier = 2.5
-        lose_multiplier = 4
-    elif bet == "Tails":
-        odds = {"Heads": 80, "Tails": 19.99, "Side": 0.01}
-        win_multiplier = 2.5
-        lose_multiplier = 4
-    elif bet == "Side":
-        odds = {"Heads": 50, "Tails": 49.99, "Side": 0.01}
-        win_multiplier = 1000  # 1000x reward
-        lose_multiplier = 24   # 24x loss
+    # The odds and multipliers for the bet (see game_rules.py)
+    weights, win_multiplier, lose_multiplier = COINFLIP_BETS[bet]
 
     # Flip the coin
-    outcome = random.choices(
-        list(odds.keys()), 
-        weights=[odds["Heads"], odds["Tails"], odds["Side"]], 
-        k=1
-    )[0]
+    outcome = random.choices(COINFLIP_SIDES, weights=weights, k=1)[0]
 
     # Handle betting
     if money < amount:
@@ -2160,7 +1860,7 @@ async def coinflip(
     if outcome == bet:
         winnings = amount * win_multiplier
         money += winnings
-        player_data["total_earned_or_lost"] += winnings  # Track earnings
+        player_data.total_earned_or_lost += winnings  # Track earnings
         result_message += f" 🎉 **JACKPOT!** You won **{winnings} coins**!"
     else:
         loss = amount * lose_multiplier
@@ -2171,7 +1871,7 @@ async def coinflip(
             debt_increase = loss - money
             total_debt += debt_increase  # Add the missing amount to debt
             money = 0
-        player_data["total_earned_or_lost"] -= total_loss  # Track losses
+        player_data.total_earned_or_lost -= total_loss  # Track losses
         result_message += f" 💀 **OUCH!** You lost **{total_loss} coins**!"
 
     # Handle debt repayment
@@ -2184,9 +1884,9 @@ async def coinflip(
             money = 0
 
     # Update player data
-    player_data["money"] = money
-    player_data["debt"] = total_debt
-    player_data["coinflip_uses"] += 1  # Increment usage count
+    player_data.money = money
+    player_data.debt = total_debt
+    player_data.coinflip_uses += 1  # Increment usage count
 
     # Final message formatting
     final_message = (
@@ -2196,8 +1896,11 @@ async def coinflip(
 
     await interaction.response.send_message(final_message, ephemeral=True)
 
-    # Save the data
-    save_json(DATA_FILE, data)
-
 
 client.run(config.get("token"))
+
+# Write out anything still pending once the bot shuts down
+lag_monitor.close()
+store.close()
+scheduler.close()
+farming_cooldowns.close()
@@ -0,0 +1,268 @@
+import copy
+import datetime
+import math
+import mmap
+import os
+import struct
+
+import json_codec
+from player_schema import PLAYER_DEFAULTS
+from player_store import save_json
+
+
+MAGIC = b"BGTP"
+HEADER = struct.Struct("<4sI")  # Magic, record size
+HEADER_SIZE = 64  # Records start here
+MIN_CAPACITY = 1024  # Slots in a new file; the file doubles whenever it runs out
+
+# Fields kept in the side table instead of the record file
+SIDE_FIELDS = ("username",)
+
+# Fields stored as float64; the rest are int64 (booleans as 0/1)
+FLOAT_FIELDS = ("money", "debt", "total_earned_or_lost", "rebirth_multiplier")
+DATE_FIELDS = ("last_daily_claim",)  # "YYYY-MM-DD" or None, stored as a date ordinal (0 = None)
+TIME_FIELDS = ("cow_time_started",)  # Timestamp or None, stored as float64 (NaN = None)
+
+
+def _kind(name, default):
+    if name in FLOAT_FIELDS:
+        return "float"
+    if name in DATE_FIELDS:
+        return "date"
+    if name in TIME_FIELDS:
+        return "time"
+    if isinstance(default, bool):
+        return "bool"
+    return "int"
+
+
+# (field, kind) for every slot of a record, in file order
+LAYOUT = [(name, _kind(name, default)) for name, default in PLAYER_DEFAULTS.items() if name not in SIDE_FIELDS]
+LAYOUT.append(("schema_version", "int"))
+
+_INT64 = (-2 ** 63, 2 ** 63)
+_EXACT_FLOAT = 2 ** 53  # Larger ints don't survive a round trip through float64
+
+
+class RecordFormat:
+    """Packs a player record into a fixed-width struct and back, for one field layout.
+
+    Every field takes 8 bytes, so a record is a flat run of int64/float64 values
+    that struct.pack_into can write straight into the mapped file. The record
+    starts with a bit mask marking the float fields that held an int, so money
+    that was 5 comes back as 5 rather than 5.0. A value that doesn't fit its slot
+    (a string in a counter, an int beyond 64 bits, ...) is left for the side
+    table and its slot is written as 0.
+    """
+
+    def __init__(self, layout):
+        self.layout = [tuple(field) for field in layout]
+        assert len(self.layout) <= 64, "the int mask has one bit per field"
+        self.names = [name for name, _ in self.layout]
+        self.struct = struct.Struct("<Q" + "".join("d" if kind in ("float", "time") else "q" for _, kind in self.layout))
+        self.size = self.struct.size
+        self.fields = set(self.names)
+        self.defaults = [PLAYER_DEFAULTS.get(name, 0) for name in self.names]
+        # Fields whose stored value needs converting; plain ints come out of unpack as they are
+        self.special = [(i, name, kind) for i, (name, kind) in enumerate(self.layout) if kind != "int"]
+        self.ints = [(i, name) for i, (name, kind) in enumerate(self.layout) if kind == "int"]
+
+    def encode(self, player_data):
+        """Return (values for the struct, {field: value} of what has to go to the side table)."""
+        values = [player_data.get(name, default) for name, default in zip(self.names, self.defaults)]
+        extra = {key: value for key, value in player_data.items() if key not in self.fields}
+        mask = 0
+
+        for i, name in self.ints:
+            value = values[i]
+            if type(value) is not int or not _INT64[0] <= value < _INT64[1]:
+                extra[name] = value
+                values[i] = 0
+
+        for i, name, kind in self.special:
+            value = values[i]
+            if kind == "bool" and type(value) is bool:
+                values[i] = int(value)
+            elif kind == "date" and (value is None or type(value) is str):
+                try:
+                    day = datetime.date.fromisoformat(value) if value is not None else None
+                except ValueError:
+                    day = None
+                if value is None:
+                    values[i] = 0
+                elif day is not None and day.isoformat() == value:
+                    values[i] = day.toordinal()
+                else:
+                    extra[name] = value
+                    values[i] = 0
+            elif kind == "time" and value is None:
+                values[i] = math.nan
+            elif kind in ("float", "time") and type(value) is float and not math.isnan(value):
+                pass
+            elif kind in ("float", "time") and type(value) is int and -_EXACT_FLOAT <= value <= _EXACT_FLOAT:
+                values[i] = float(value)
+                mask |= 1 << i
+            else:
+                extra[name] = value
+                values[i] = 0
+        return [mask, *values], extra
+
+    def decode(self, buffer, offset, extra=None):
+        """Rebuild the record stored at offset, laying the side-table fields over it."""
+        values = self.struct.unpack_from(buffer, offset)
+        mask = values[0]
+        player_data = dict(zip(self.names, values[1:]))
+        for i, name, kind in self.special:
+            value = values[i + 1]
+            if kind == "bool":
+                player_data[name] = bool(value)
+            elif kind == "date":
+                player_data[name] = datetime.date.fromordinal(value).isoformat() if value else None
+            elif kind == "time" and math.isnan(value):
+                player_data[name] = None
+            elif mask >> i & 1:
+                player_data[name] = int(value)
+        if extra:
+            player_data.update(extra)
+        return player_data
+
+
+class BinaryBackend:
+    """Stores the numeric player fields as fixed-width records in a memory-mapped file.
+
+    Each player owns a slot in records_path, so writing a dirty player is a
+    struct.pack_into at that slot's offset instead of re-serializing everyone;
+    only the pages that changed go back to disk. The side table (side_path, a
+    JSON file) maps user IDs to slots and holds the usernames, any value that
+    doesn't fit its slot and the top-level settings (self.meta) such as the bot
+    token. It is only rewritten when one of those changes, e.g. when someone
+    registers.
+
+    The side table records the field layout; if PLAYER_DEFAULTS has gained or
+    lost fields since the file was written, load() rewrites it in the new layout.
+    """
+
+    def __init__(self, records_path, side_path):
+        self.records_path = records_path
+        self.side_path = side_path
+        self.format = RecordFormat(LAYOUT)
+
+        try:
+            with open(side_path, 'rb') as file:
+                side = json_codec.loads(file.read())
+        except FileNotFoundError:
+            side = {}
+        self.meta = side.get("meta", {})
+        self._saved_meta = copy.deepcopy(self.meta)  # meta as last saved, to notice changes made through self.meta
+        self.slots = side.get("slots", {})  # user_id -> slot
+        self.extra = side.get("extra", {})  # user_id -> {field: value} kept out of the record file
+        self._stored_format = self.format
+        if "fields" in side and [tuple(field) for field in side["fields"]] != self.format.layout:
+            self._stored_format = RecordFormat(side["fields"])  # Until load() rewrites the file
+
+        self._file = None
+        self._map = None
+        self._open(self._stored_format)
+
+        # write() only needs the dirty players, and records are updated in place
+        self.incremental = True
+        self.snapshot_compaction = False
+
+    def _open(self, record_format):
+        if not os.path.exists(self.records_path):
+            with open(self.records_path, 'wb') as file:
+                file.write(HEADER.pack(MAGIC, record_format.size).ljust(HEADER_SIZE, b"\0"))
+                file.truncate(HEADER_SIZE + MIN_CAPACITY * record_format.size)
+
+        self._file = open(self.records_path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or size != record_format.size:
+            self.close()
+            raise ValueError(f"{self.records_path} is not a player record file for this layout")
+
+    def _capacity(self):
+        return (len(self._map) - HEADER_SIZE) // self.format.size
+
+    def _grow(self, slots):
+        capacity = self._capacity()
+        while capacity < slots:
+            capacity *= 2
+        self._map.close()
+        self._file.truncate(HEADER_SIZE + capacity * self.format.size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def _offset(self, slot, record_format=None):
+        return HEADER_SIZE + slot * (record_format or self.format).size
+
+    def _save_side(self):
+        side = {"meta": self.meta, "fields": self.format.layout, "slots": self.slots, "extra": self.extra}
+        save_json(self.side_path, side, None)
+        self._saved_meta = copy.deepcopy(self.meta)
+
+    def load(self):
+        """Read the settings and every record into a data.json-shaped dict."""
+        record_format, buffer, extra = self._stored_format, self._map, self.extra
+        data = dict(self.meta)
+        data["players"] = {
+            user_id: record_format.decode(buffer, self._offset(slot, record_format), extra.get(user_id))
+            for user_id, slot in self.slots.items()
+        }
+
+        if record_format.layout != self.format.layout:
+            # Written by a version with different fields: start over in the current layout
+            self.close()
+            os.replace(self.records_path, self.records_path + ".old")
+            self.slots, self.extra = {}, {}
+            self._stored_format = self.format
+            self._open(self.format)
+            self.write(data, data["players"])
+            os.remove(self.records_path + ".old")
+        return data
+
+    def write(self, data, dirty):
+        """Write the records of the players whose IDs are in dirty into their slots."""
+        if self._stored_format is not self.format:
+            raise RuntimeError(f"{self.records_path} is in an older layout; load() it first")
+
+        players = data["players"]
+        record_struct = self.format.struct
+        side_changed = False
+
+        for user_id in dirty:
+            player_data = players.get(user_id)
+            if player_data is None:
+                continue
+
+            slot = self.slots.get(user_id)
+            if slot is None:
+                slot = self.slots[user_id] = len(self.slots)
+                if slot >= self._capacity():
+                    self._grow(slot + 1)
+                side_changed = True
+
+            values, extra = self.format.encode(player_data)
+            record_struct.pack_into(self._map, self._offset(slot), *values)
+            if extra != self.extra.get(user_id, {}):
+                if extra:
+                    self.extra[user_id] = extra
+                else:
+                    self.extra.pop(user_id, None)
+                side_changed = True
+
+        # Records first: a crash before the side table is saved only loses the slots of brand new players
+        self._map.flush()
+        if side_changed or self.meta != self._saved_meta:
+            self._save_side()
+
+    def compact(self, data):
+        pass  # Records are rewritten in place, so there is nothing to fold
+
+    def close(self):
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,98 @@
+import time
+
+from player_store import load_json, save_json
+
+
+class CooldownStore:
+    """Per-key cooldowns that drop out once they expire, so memory follows the active keys.
+
+    Deadlines are kept on the monotonic clock, so they keep their sub-second
+    precision and aren't thrown off by changes to the system time. Each key is
+    also filed in a time bucket (bucket_width seconds wide) by its deadline;
+    every call sweeps away the buckets that have fully passed, so a key that
+    was used once is forgotten shortly after its cooldown ends instead of
+    staying in the map forever.
+
+    If file_path is given, save() writes the running cooldowns there (as
+    wall-clock deadlines, since the monotonic clock restarts with the process)
+    and load() restores the ones that haven't ended yet.
+    """
+
+    def __init__(self, file_path=None, bucket_width=1.0):
+        self.file_path = file_path
+        self.bucket_width = bucket_width
+
+        self._deadlines = {}  # key -> time.monotonic() deadline
+        self._buckets = {}  # bucket index -> set of keys whose deadline falls in it
+        self._swept = self._bucket(time.monotonic())  # Every bucket before this one is empty
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def __contains__(self, key):
+        return self.remaining(key) > 0
+
+    def _bucket(self, deadline):
+        return int(deadline // self.bucket_width)
+
+    def start(self, key, duration):
+        """Put key on cooldown for duration seconds from now, replacing any running cooldown."""
+        now = time.monotonic()
+        self._sweep(now)
+
+        old = self._deadlines.get(key)
+        if old is not None:
+            self._buckets[self._bucket(old)].discard(key)
+        deadline = self._deadlines[key] = now + duration
+        self._buckets.setdefault(self._bucket(deadline), set()).add(key)
+
+    def remaining(self, key):
+        """Seconds left on key's cooldown, or 0 if it isn't on cooldown."""
+        now = time.monotonic()
+        self._sweep(now)
+        deadline = self._deadlines.get(key)
+        return deadline - now if deadline is not None and deadline > now else 0
+
+    def clear(self):
+        self._deadlines.clear()
+        self._buckets.clear()
+
+    def _sweep(self, now):
+        current = self._bucket(now)
+        if current <= self._swept:
+            return
+        # Walk the passed bucket indexes, or just the existing buckets if the bot sat idle for a while
+        if current - self._swept <= len(self._buckets):
+            passed = [index for index in range(self._swept, current) if index in self._buckets]
+        else:
+            passed = [index for index in self._buckets if index < current]
+        for index in passed:
+            for key in self._buckets.pop(index):
+                del self._deadlines[key]
+        self._swept = current
+
+    def load(self):
+        """Restore the cooldowns saved by a previous run that are still running. Returns False if there was no file."""
+        if not self.file_path:
+            return False
+        saved = load_json(self.file_path).get("cooldowns")
+        if saved is None:
+            return False
+        now = time.time()
+        for key, wall_deadline in saved:
+            if wall_deadline > now:
+                self.start(key, wall_deadline - now)
+        return True
+
+    def save(self):
+        """Write the running cooldowns to file_path."""
+        if not self.file_path:
+            return
+        now, wall_now = time.monotonic(), time.time()
+        self._sweep(now)
+        # [key, deadline] pairs rather than a dict, so integer user IDs come back as integers
+        saved = [[key, wall_now + deadline - now] for key, deadline in self._deadlines.items() if deadline > now]
+        save_json(self.file_path, {"cooldowns": saved})
+
+    def close(self):
+        self.save()
@@ -0,0 +1,182 @@
+import random
+from bisect import bisect_right
+from operator import attrgetter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class FarmResource:
+    """One resource /farm hands out: a base roll of low..high, raised by its yield upgrade."""
+
+    def __init__(self, key, label, low, high, unlock_rebirths=0):
+        self.key = key  # Amount field in the player's data
+        self.label = label
+        self.low = low
+        self.span = high - low + 1  # A uniform u in [0, 1) rolls low + int(u * span), like randint(low, high)
+        self.unlock_rebirths = unlock_rebirths
+        self.level_key = f"{key}_upgrade_level"
+        self.line = f"**{label}:** {{}} (*Total:* {{}})"  # Formatted with the amount gathered and the new total
+
+
+class RareDrop:
+    """An item that drops on a 1-in-one_in chance per farm."""
+
+    def __init__(self, key, total_key, one_in, message):
+        self.key = key
+        self.total_key = total_key
+        self.chance = 1 / one_in
+        self.message = message  # Formatted with the player's current and total counts
+
+
+# Every /farm resource, in message order
+FARM_RESOURCES = (
+    FarmResource("wheat", "🌾 Wheat", 1, 10),
+    FarmResource("wood", "🪵 Wood", 0, 4),
+    FarmResource("stone", "🪨 Stone", 0, 2, unlock_rebirths=5),
+    FarmResource("hardwood", "🌲 Hardwood", 0, 2, unlock_rebirths=10),
+    FarmResource("iron_ore", "⛏️ Iron Ore", 0, 2, unlock_rebirths=15),
+    FarmResource("silver_ore", "🥈 Silver Ore", 0, 1, unlock_rebirths=20),
+    FarmResource("gold_ore", "🥇 Gold Ore", 0, 1, unlock_rebirths=25),
+)
+
+# Every rare /farm drop, in message order; each is rolled independently of the others
+RARE_DROPS = (
+    RareDrop("cucumber", "total_cucumber", 100, "🥒 **Wow! You found Larry the Cucumber! How the fuck can he talk..** \n   **Current Amount:** {} | **Total cucumber Found:** {}"),
+    RareDrop("candy", "total_candy", 250, "🍬 **Nice!! You found some Candy!** \n   **Current Amount:** {} | **Total Candy Found:** {}"),
+    RareDrop("weed", "total_weed", 500, "🍃 **Congratulations!!! You found some Weed!** \n   **Current Amount:** {} | **Total Weed Found:** {}"),
+    RareDrop("rare_artifacts", "total_rare_artifacts", 1000, "🎉 **OH MY GOD!!!!! You found a Rare Artifact!** 🏺 \n   **Current Amount:** {} | **Total Rare Artifacts Found:** {}"),
+)
+
+
+class DropTable:
+    """Resolves a set of independent drops with one uniform draw.
+
+    Every combination of drops (none, just candy, candy and weed, ...) gets its
+    probability under independent rolls, and the combinations are laid end to
+    end on [0, 1), most likely first. A single draw then picks a combination by
+    bisecting the cumulative thresholds, with the same odds as rolling each drop
+    separately.
+    """
+
+    def __init__(self, drops):
+        self.drops = tuple(drops)
+        outcomes = []
+        for mask in range(1 << len(self.drops)):
+            chosen = tuple(drop for i, drop in enumerate(self.drops) if mask >> i & 1)
+            probability = 1.0
+            for drop in self.drops:
+                probability *= drop.chance if drop in chosen else 1 - drop.chance
+            outcomes.append((probability, chosen))
+        outcomes.sort(key=lambda outcome: -outcome[0])
+
+        self.outcomes = [chosen for _, chosen in outcomes]
+        self.probabilities = [probability for probability, _ in outcomes]
+        self.thresholds = []
+        total = 0.0
+        for probability in self.probabilities:
+            total += probability
+            self.thresholds.append(total)
+        self.thresholds[-1] = 1.0  # Absorb the rounding, so every draw in [0, 1) lands somewhere
+
+    def draw(self, u):
+        """The drops (in table order) for a uniform draw u in [0, 1)."""
+        if u < self.thresholds[0]:
+            return self.outcomes[0]  # Nothing dropped, the usual case
+        return self.outcomes[bisect_right(self.thresholds, u)]
+
+
+class RandomPool:
+    """Uniform floats in [0, 1), drawn pool_size at a time and handed out in runs."""
+
+    def __init__(self, pool_size=8192, seed=None):
+        self.pool_size = pool_size
+        # NumPy fills the pool in one call; without it the pool comes from random.Random
+        self._generator = np.random.default_rng(seed) if np is not None else random.Random(seed)
+        self._values = []
+        self._next = 0
+
+    def take(self, count):
+        """The next count uniforms."""
+        start = self._next
+        if start + count > len(self._values):
+            self._refill()
+            start = 0
+        self._next = start + count
+        return self._values[start:start + count]
+
+    def _refill(self):
+        if np is not None:
+            self._values = self._generator.random(self.pool_size).tolist()
+        else:
+            draw = self._generator.random
+            self._values = [draw() for _ in range(self.pool_size)]
+
+
+class FarmRoller:
+    """Rolls the outcome of a /farm: one uniform per resource plus one for every rare drop.
+
+    Uniforms normally come from a shared RandomPool. With a seed, every farm
+    gets its own stream seeded from (seed, user ID, farm number) instead, so any
+    farm can be replayed exactly; that costs a few microseconds more per farm.
+    """
+
+    def __init__(self, resources=FARM_RESOURCES, drops=RARE_DROPS, seed=None):
+        self.resources = resources
+        self.table = DropTable(drops)
+        self.seed = seed
+        self.pool = RandomPool()
+        self._draws = len(resources) + 1
+        # Plain tuples for the per-farm loop, which attribute lookups would otherwise dominate
+        self._specs = [(resource.low, resource.span, resource.unlock_rebirths) for resource in resources]
+        self._level_keys = [resource.level_key for resource in resources]
+        self._read_fields = attrgetter("rebirths", "rebirth_multiplier", *self._level_keys)
+
+    def uniforms(self, user_id, farm_number):
+        if self.seed is None:
+            return self.pool.take(self._draws)
+        stream = random.Random(f"{self.seed}:{user_id}:{farm_number}")
+        return [stream.random() for _ in range(self._draws)]
+
+    def roll(self, player_data, user_id=None, farm_number=0):
+        """Return (the amount of each resource, in resources order; the rare drops that came up).
+
+        A resource earns int((roll + level // 5) * rebirth multiplier) + level * 2, where
+        level is its yield upgrade, and nothing until the player has enough rebirths.
+        """
+        draws = self.uniforms(user_id, farm_number)
+        try:
+            rebirths, multiplier, *levels = self._read_fields(player_data)  # One call for a Player
+        except AttributeError:
+            rebirths, multiplier = player_data.get("rebirths", 0), player_data.get("rebirth_multiplier", 1)
+            levels = [player_data.get(level_key, 0) for level_key in self._level_keys]
+        amounts = []
+        for (low, span, unlock_rebirths), level, u in zip(self._specs, levels, draws):
+            if rebirths < unlock_rebirths:
+                amounts.append(0)
+                continue
+            amounts.append(int((low + int(u * span) + level // 5) * multiplier) + level * 2)
+        return amounts, self.table.draw(draws[-1])
+
+
+if __name__ == "__main__":
+    # Microbenchmark: python drop_table.py
+    import timeit
+    from player_schema import Player, new_player
+
+    player_data = Player.from_dict({**new_player("bench"), "rebirths": 25, "rebirth_multiplier": 2.5, **{resource.level_key: 10 for resource in FARM_RESOURCES}})
+
+    def separate_rolls():
+        # What /farm did before: a randint per resource and per rare drop
+        for resource in FARM_RESOURCES:
+            random.randint(resource.low, resource.low + resource.span - 1)
+        for drop in RARE_DROPS:
+            random.randint(1, round(1 / drop.chance))
+
+    count = 200_000
+    for name, roller in (("separate randint rolls", None), ("FarmRoller, shared pool", FarmRoller()), ("FarmRoller, seeded", FarmRoller(seed=1))):
+        farm = separate_rolls if roller is None else lambda: roller.roll(player_data, 1, 1)
+        seconds = min(timeit.repeat(farm, number=count, repeat=3)) / count
+        print(f"{name:24} {seconds * 1e6:6.2f} us  {1 / seconds:10,.0f} farms/s")
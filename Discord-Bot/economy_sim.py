@@ -0,0 +1,341 @@
+"""Offline economy simulator: runs virtual players through the game's formulas as NumPy arrays.
+
+Usage: python economy_sim.py [--players N] [--days D] [--ramp DAYS] [--seed S] [--report DAYS]
+
+Every simulated day each player farms, claims /daily, sells everything, buys
+upgrades, rebirths and gambles as the strategy they were assigned says (see
+STRATEGIES). Players sign up evenly over the first --ramp days. The formulas
+come from game_rules.py, upgrades.py and drop_table.py, the same ones the bot
+runs, so a balance change can be tried here first: edit the constant, re-run,
+and compare how fast the money supply and data.json grow. Cows and milk are
+left out. Needs NumPy.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import json_codec
+from drop_table import FARM_RESOURCES, RARE_DROPS
+from game_rules import (COINFLIP_BETS, COINFLIP_REBIRTHS, COINFLIP_SIDES, DAILY_MONEY, DAILY_RESOURCES, MAX_BET_IN_DEBT,
+                        PLINKO_OUTCOMES, PLINKO_REBIRTHS, PLINKO_WEIGHTS, REBIRTH_MULTIPLIER, TREASURE_PRICES,
+                        rebirth_price, sell_price)
+from player_schema import new_player, pack_player
+from upgrades import UPGRADES
+
+
+SECONDS_PER_DAY = 86400
+MAX_REBIRTHS = 300  # Size of the rebirth price table; nobody gets anywhere near it
+RECORD_SAMPLE = 1000  # Players serialized to estimate the size of data.json
+
+
+class Strategy:
+    """How one group of virtual players plays each day."""
+
+    def __init__(self, name, share, farms_per_day, daily_chance, upgrade_budget, rebirths=True,
+                 plinko_bets=0, coinflip_bets=0, bet_share=0.0):
+        self.name = name
+        self.share = share  # Fraction of all players
+        self.farms_per_day = farms_per_day  # Mean; each player's count is Poisson around it
+        self.daily_chance = daily_chance  # Chance of claiming /daily on a given day
+        self.upgrade_budget = upgrade_budget  # Fraction of the money after selling spent on upgrades
+        self.rebirths = rebirths  # Rebirth as soon as the money covers it
+        self.plinko_bets = plinko_bets  # Bets a day, once plinko is unlocked
+        self.coinflip_bets = coinflip_bets  # Bets a day on heads, once coinflip is unlocked
+        self.bet_share = bet_share  # Fraction of the balance staked per bet
+
+
+STRATEGIES = (
+    Strategy("casual", 0.6, farms_per_day=30, daily_chance=0.4, upgrade_budget=0.5),
+    Strategy("grinder", 0.3, farms_per_day=400, daily_chance=0.95, upgrade_budget=0.8),
+    Strategy("gambler", 0.1, farms_per_day=80, daily_chance=0.7, upgrade_budget=0.3,
+             plinko_bets=10, coinflip_bets=3, bet_share=0.05),
+)
+
+# Every upgrade the simulated players buy, and the cumulative price tables to buy them with
+SIM_UPGRADES = [upgrade for upgrade in UPGRADES.values() if upgrade.key != "milk_price_upgrade_level"]
+UPGRADE_CUMULATIVE = {upgrade.key: np.array(upgrade.cumulative, dtype=np.float64) for upgrade in SIM_UPGRADES}
+REBIRTH_PRICES = np.array([float(rebirth_price(rebirths)) for rebirths in range(MAX_REBIRTHS)])
+
+# Fields a rebirth resets (as /rebirth does), besides money and debt
+REBIRTH_RESETS = (*(resource.key for resource in FARM_RESOURCES), *(drop.key for drop in RARE_DROPS),
+                  *(upgrade.key for upgrade in SIM_UPGRADES))
+
+
+class EconomySim:
+    """The whole player base as one array per player field, stepped a day at a time."""
+
+    def __init__(self, players, seed=None, ramp=0):
+        self.rng = np.random.default_rng(seed)
+        self.count = players
+        self.joined = self.rng.integers(0, ramp + 1, players) if ramp else np.zeros(players, dtype=np.int64)
+
+        strategy = self.rng.choice(len(STRATEGIES), players, p=[s.share for s in STRATEGIES])
+        self.strategy = strategy
+
+        def per_player(attribute):
+            return np.array([getattr(s, attribute) for s in STRATEGIES])[strategy]
+        self.farms_per_day = per_player("farms_per_day")
+        self.daily_chance = per_player("daily_chance")
+        self.upgrade_budget = per_player("upgrade_budget")
+        self.rebirths_wanted = per_player("rebirths")
+        self.plinko_bets = per_player("plinko_bets")
+        self.coinflip_bets = per_player("coinflip_bets")
+        self.bet_share = per_player("bet_share")
+
+        zeros = lambda dtype=np.int64: np.zeros(players, dtype=dtype)
+        self.money = zeros(np.float64)
+        self.debt = zeros(np.float64)
+        self.rebirths = zeros()
+        self.rebirth_multiplier = np.ones(players)
+        self.fields = {key: zeros() for key in REBIRTH_RESETS}
+        for key in ("farm_usage_count", "daily_streak", "longest_streak", "total_claims", "total_gambled",
+                    "coinflip_uses", *(drop.total_key for drop in RARE_DROPS)):
+            self.fields[key] = zeros()
+        self.total_earnings = zeros(np.float64)
+        self.total_earned_or_lost = zeros(np.float64)
+        self.claimed_yesterday = zeros(bool)
+
+        # Money created (+) or destroyed (-) per source, summed over the run
+        self.flows = dict.fromkeys(("farm sales", "treasure sales", "daily", "gambling", "upgrades", "rebirths"), 0.0)
+
+    # --- One day -------------------------------------------------------------------------
+
+    def step(self, day):
+        active = self.joined <= day
+        self.farm(active)
+        self.daily(active)
+        self.sell(active)
+        self.buy_upgrades(active)
+        self.rebirth(active)
+        self.gamble(active)
+
+    def farm(self, active):
+        """A day of /farm: per-farm yields summed over the day's farms."""
+        cooldown = np.maximum(1, 5 - self.fields["farming_cooldown_level"] * 0.2)
+        farms = np.minimum(self.rng.poisson(self.farms_per_day), SECONDS_PER_DAY // cooldown).astype(np.int64)
+        farms[~active] = 0
+        self.fields["farm_usage_count"] += farms
+
+        for resource in FARM_RESOURCES:
+            unlocked = active & (self.rebirths >= resource.unlock_rebirths)
+            if not unlocked.any():
+                continue
+            # A farm's yield only depends on the upgrade level and the rebirths (which fix the multiplier),
+            # so work out its distribution once per distinct pair rather than once per player
+            pairs, inverse = np.unique(self.fields[resource.level_key] * MAX_REBIRTHS + self.rebirths, return_inverse=True)
+            level, rebirths = (pairs // MAX_REBIRTHS)[:, None], pairs % MAX_REBIRTHS
+            multiplier = REBIRTH_MULTIPLIER ** rebirths[:, None]
+            # One farm yields amounts[:, v] for a roll of low + v, each v equally likely. The day's total
+            # is drawn from a normal with the exact mean and variance of the sum over the day's farms.
+            rolls = resource.low + np.arange(resource.span)[None, :]
+            amounts = np.floor((rolls + level // 5) * multiplier) + level * 2
+            mean, variance = amounts.mean(axis=1)[inverse], amounts.var(axis=1)[inverse]
+            total = self.rng.normal(farms * mean, np.sqrt(farms * variance))
+            total = np.clip(np.rint(total), farms * amounts.min(axis=1)[inverse], farms * amounts.max(axis=1)[inverse])
+            self.fields[resource.key] += np.where(unlocked, total, 0).astype(np.int64)
+
+        for drop in RARE_DROPS:
+            found = self.rng.binomial(farms, drop.chance)
+            self.fields[drop.key] += found
+            self.fields[drop.total_key] += found
+
+    def daily(self, active):
+        claimed = active & (self.rng.random(self.count) < self.daily_chance)
+        streak = self.fields["daily_streak"]
+        streak[:] = np.where(claimed, np.where(self.claimed_yesterday, streak + 1, 1), 0)
+        np.maximum(self.fields["longest_streak"], streak, out=self.fields["longest_streak"])
+        self.fields["total_claims"] += claimed
+        self.claimed_yesterday = claimed
+
+        multiplier = self.rebirth_multiplier
+        for key, low, high, divisor, unlock_rebirths in DAILY_RESOURCES:
+            rolls = self.rng.integers(low, high + 1, self.count)
+            reward = np.round(rolls * (1 + streak / divisor) * multiplier)
+            self.fields[key] += np.where(claimed & (self.rebirths >= unlock_rebirths), reward, 0).astype(np.int64)
+
+        low, high, divisor = DAILY_MONEY
+        reward = np.round(self.rng.uniform(low, high, self.count) * (1 + streak / divisor) * multiplier)
+        reward[~claimed] = 0
+        self.flows["daily"] += reward.sum()
+        self._credit(reward)
+
+    def sell(self, active):
+        """/sell everything, then /treasuresell everything."""
+        multiplier = self.rebirth_multiplier
+        earnings = np.zeros(self.count)
+        for resource in FARM_RESOURCES:
+            amount = np.where(active, self.fields[resource.key], 0)
+            price = sell_price(resource.key, self.fields[f"{resource.key}_price_upgrade_level"])
+            earnings += np.floor(amount * price * multiplier)
+            self.fields[resource.key] -= amount
+        self.total_earnings += earnings
+        self.flows["farm sales"] += earnings.sum()
+        self._credit(earnings)
+
+        earnings = np.zeros(self.count)
+        for key, price in TREASURE_PRICES.items():
+            amount = np.where(active, self.fields[key], 0)
+            earnings += np.floor(amount * price * multiplier)
+            self.fields[key] -= amount
+        self.total_earnings += earnings
+        self.flows["treasure sales"] += earnings.sum()
+        self._credit(earnings)
+
+    def _credit(self, earnings):
+        """Add earnings the way /sell and /daily do: debt is paid off first."""
+        in_debt = self.debt > 0
+        cleared = in_debt & (earnings >= self.debt)
+        self.money = np.where(in_debt, np.where(cleared, self.money + earnings - self.debt, 0), self.money + earnings)
+        self.debt = np.where(in_debt, np.where(cleared, 0, self.debt - earnings), self.debt)
+
+    def buy_upgrades(self, active):
+        """Split the day's upgrade budget evenly over the unlocked upgrades, buying as many levels as each share covers."""
+        budget = np.where(active, np.maximum(self.money, 0) * self.upgrade_budget, 0)
+        unlocked = [self.rebirths >= upgrade.unlock_rebirths for upgrade in SIM_UPGRADES]
+        share = budget / np.maximum(1, np.sum(unlocked, axis=0))
+        spent = np.zeros(self.count)
+        for upgrade, available in zip(SIM_UPGRADES, unlocked):
+            cumulative = UPGRADE_CUMULATIVE[upgrade.key]
+            level = self.fields[upgrade.key]
+            # Only players who can afford the next level need the binary search (the same one as Upgrade.affordable)
+            rows = np.flatnonzero(available & (level < upgrade.max_level))
+            rows = rows[share[rows] >= cumulative[level[rows] + 1] - cumulative[level[rows]]]
+            count = np.searchsorted(cumulative, share[rows] + cumulative[level[rows]], side="right") - 1 - level[rows]
+            spent[rows] += cumulative[level[rows] + count] - cumulative[level[rows]]
+            level[rows] += count
+        self.money -= spent
+        self.flows["upgrades"] -= spent.sum()
+
+    def rebirth(self, active):
+        price = REBIRTH_PRICES[np.minimum(self.rebirths, MAX_REBIRTHS - 1)]
+        rebirthing = active & self.rebirths_wanted & (self.money >= price)
+        if not rebirthing.any():
+            return
+        # /rebirth takes the price, then resets money (and everything else) to 0
+        self.flows["rebirths"] -= self.money[rebirthing].sum()
+        self.money[rebirthing] = 0
+        self.debt[rebirthing] = 0
+        for key in REBIRTH_RESETS:
+            self.fields[key][rebirthing] = 0
+        self.rebirths += rebirthing
+        self.rebirth_multiplier[rebirthing] *= REBIRTH_MULTIPLIER
+
+    def gamble(self, active):
+        before = (self.money - self.debt).sum()
+        weights = np.array(PLINKO_WEIGHTS) / sum(PLINKO_WEIGHTS)
+        payouts = np.array([multiplier for _, multiplier, _ in PLINKO_OUTCOMES], dtype=np.float64)
+        for bet in range(self.plinko_bets.max(initial=0)):
+            playing = active & (self.rebirths >= PLINKO_REBIRTHS) & (self.plinko_bets > bet)
+            if playing.any():
+                self._plinko(playing, self._stake(playing), payouts[self.rng.choice(len(payouts), self.count, p=weights)])
+
+        side_weights, win_multiplier, lose_multiplier = COINFLIP_BETS["Heads"]
+        heads_chance = side_weights[COINFLIP_SIDES.index("Heads")] / sum(side_weights)
+        for bet in range(self.coinflip_bets.max(initial=0)):
+            playing = active & (self.rebirths >= COINFLIP_REBIRTHS) & (self.coinflip_bets > bet)
+            if playing.any():
+                won = self.rng.random(self.count) < heads_chance
+                self._coinflip(playing, self._stake(playing), won, win_multiplier, lose_multiplier)
+        self.flows["gambling"] += (self.money - self.debt).sum() - before
+
+    def _stake(self, playing):
+        amount = np.floor(np.maximum(self.money, 0) * self.bet_share)
+        amount = np.where((self.debt > 0) | (self.money <= 0), np.minimum(np.maximum(amount, 1000), MAX_BET_IN_DEBT), amount)
+        return np.where(playing, amount, 0)
+
+    def _plinko(self, playing, amount, payout):
+        """/plinko's arithmetic, for every player at once."""
+        money, debt = self.money, self.debt
+        earnings = amount * payout
+        short = money < amount
+        debt = np.where(short, debt + amount - money, debt)
+        money = np.where(short, 0, money - amount)
+        in_debt = debt > 0
+        cleared = in_debt & (earnings >= debt)
+        money = np.where(in_debt, np.where(cleared, earnings - debt, 0), money + earnings)
+        debt = np.where(in_debt, np.where(cleared, 0, debt - earnings), debt)
+
+        self.money = np.where(playing, money, self.money)
+        self.debt = np.where(playing, debt, self.debt)
+        self.fields["total_gambled"] += playing
+        self.total_earned_or_lost += np.where(playing, earnings - amount, 0)
+
+    def _coinflip(self, playing, amount, won, win_multiplier, lose_multiplier):
+        """/coinflip's arithmetic, for every player at once."""
+        money, debt = self.money, self.debt
+        short = money < amount
+        debt = np.where(short, debt + amount - money, debt)
+        money = np.where(short, 0, money - amount)
+
+        loss = amount * lose_multiplier
+        covered = money >= loss
+        debt = np.where(won | covered, debt, debt + loss - money)
+        money = np.where(won, money + amount * win_multiplier, np.where(covered, money - loss, 0))
+        repaid = np.where(debt > 0, np.minimum(money, debt), 0)
+        money, debt = money - repaid, debt - repaid
+
+        self.money = np.where(playing, money, self.money)
+        self.debt = np.where(playing, debt, self.debt)
+        self.fields["coinflip_uses"] += playing
+        self.total_earned_or_lost += np.where(playing, np.where(won, amount * win_multiplier, -(loss + amount)), 0)
+
+    # --- Reporting -----------------------------------------------------------------------
+
+    def record(self, row):
+        """Player row as the bot would store it."""
+        player_data = new_player(f"player{row}")
+        player_data["has_registered"] = True
+        for key, values in self.fields.items():
+            player_data[key] = int(values[row])
+        for key, values in (("money", self.money), ("debt", self.debt), ("total_earnings", self.total_earnings),
+                            ("total_earned_or_lost", self.total_earned_or_lost)):
+            value = float(values[row])
+            player_data[key] = int(value) if value.is_integer() else value
+        player_data["rebirths"] = int(self.rebirths[row])
+        player_data["rebirth_multiplier"] = float(self.rebirth_multiplier[row])
+        return player_data
+
+    def data_file_size(self, active):
+        """Estimated bytes of a compact data.json holding every active player."""
+        rows = np.flatnonzero(active)
+        if not len(rows):
+            return 0
+        sample = self.rng.choice(rows, min(RECORD_SAMPLE, len(rows)), replace=False)
+        # Discord user IDs are 18-19 digit snowflakes
+        sizes = [len(json_codec.dumps({str(10 ** 17 + int(row)): pack_player(self.record(row))})) - 1 for row in sample]
+        return int(np.mean(sizes) * len(rows)) + len('{"players":{}}')
+
+
+def run(players, days, seed=None, ramp=0, report=1):
+    sim = EconomySim(players, seed=seed, ramp=ramp)
+    print(f"{players:,} players ({', '.join(f'{s.share:.0%} {s.name}' for s in STRATEGIES)}), {days} days, signups over {ramp} days")
+    print(f"{'day':>4} {'players':>10} {'money supply':>16} {'debt':>14} {'median':>10} {'p99':>12} "
+          f"{'rebirths':>8} {'max':>4} {'data.json':>10} {'s/day':>6}")
+    for day in range(days):
+        started = time.perf_counter()
+        sim.step(day)
+        elapsed = time.perf_counter() - started
+        if (day + 1) % report and day != days - 1:
+            continue
+        active = sim.joined <= day
+        money = sim.money[active]
+        median, p99 = np.percentile(money, (50, 99)) if len(money) else (0, 0)
+        print(f"{day + 1:>4} {active.sum():>10,} {money.sum():>16,.0f} {sim.debt[active].sum():>14,.0f} {median:>10,.0f} {p99:>12,.0f} "
+              f"{sim.rebirths[active].mean():>8.2f} {sim.rebirths.max():>4} {sim.data_file_size(active) / 2 ** 20:>8.1f}MB {elapsed:>6.2f}")
+
+    print("\nMoney created (+) and destroyed (-) by source:")
+    for source, amount in sim.flows.items():
+        print(f"  {source:15} {amount:>20,.0f}")
+    return sim
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate the game economy offline.")
+    parser.add_argument("--players", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--ramp", type=int, default=0, help="days over which players sign up (0: all on day 1)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--report", type=int, default=1, help="print a row every this many days")
+    args = parser.parse_args()
+    run(args.players, args.days, seed=args.seed, ramp=args.ramp, report=args.report)
@@ -0,0 +1,87 @@
+# Economy formulas shared by the bot (Biggeth-T.py) and the offline simulator (economy_sim.py).
+# Farm yields live in drop_table.py and upgrade prices in upgrades.py.
+
+# Sell price of each resource: key -> (base price, added per price upgrade level)
+SELL_PRICES = {
+    "wheat": (1, 2),
+    "wood": (5, 3),
+    "stone": (25, 10),
+    "hardwood": (100, 20),
+    "iron_ore": (300, 35),
+    "silver_ore": (750, 45),
+    "gold_ore": (2000, 120),
+}
+
+# Fixed sell price of each rare item (/treasuresell)
+TREASURE_PRICES = {
+    "rare_artifacts": 50000,
+    "candy": 10000,
+    "weed": 25000,
+    "cucumber": 5000,
+}
+
+MILK_BASE_PRICE = 150
+MILK_PRICE_PER_LEVEL = 100
+
+REBIRTH_BASE_PRICE = 100000
+REBIRTH_GROWTH = 1.4
+REBIRTH_MULTIPLIER = 1.1  # Each rebirth multiplies the rebirth multiplier by this
+
+# /daily resources: (key, lowest roll, highest roll, streak divisor, rebirths needed)
+DAILY_RESOURCES = (
+    ("wheat", 2, 5, 2, 0),
+    ("wood", 2, 5, 2.5, 0),
+    ("stone", 1, 3, 3, 0),
+    ("hardwood", 0, 2, 3.5, 5),
+    ("iron_ore", 0, 2, 3.5, 10),
+    ("silver_ore", 0, 2, 4, 15),
+    ("gold_ore", 0, 2, 4, 20),
+)
+DAILY_MONEY = (50, 100, 1.5)  # Uniform money roll between the first two, and its streak divisor
+
+# Gambling: the most a player in debt (or broke) may bet
+MAX_BET_IN_DEBT = 25000
+
+PLINKO_REBIRTHS = 7
+# (label, payout multiplier, weight)
+PLINKO_OUTCOMES = (
+    ("25x", 25, 0.1),
+    ("10x", 10, 0.4),
+    ("5x", 5, 1.5),
+    ("3x", 3, 2),
+    ("2x", 2, 5),
+    ("1.5x", 1.5, 10),
+    ("1x", 1, 19),
+    ("0.5x", 0.5, 19),
+    ("0.2x", 0.2, 33),
+    ("0x", 0, 7),
+    ("-5x", -5, 3),
+)
+PLINKO_WEIGHTS = [weight for _, _, weight in PLINKO_OUTCOMES]
+
+COINFLIP_REBIRTHS = 12
+COINFLIP_SIDES = ("Heads", "Tails", "Side")
+# bet -> (weights of COINFLIP_SIDES, win multiplier, loss multiplier)
+COINFLIP_BETS = {
+    "Heads": ((19.99, 80, 0.01), 2.5, 4),
+    "Tails": ((80, 19.99, 0.01), 2.5, 4),
+    "Side": ((50, 49.99, 0.01), 1000, 24),
+}
+
+
+def sell_price(resource, price_level):
+    """Base sell price of one unit of resource, before the rebirth multiplier."""
+    base, per_level = SELL_PRICES[resource]
+    return base + price_level * per_level
+
+def milk_price(price_level, rebirth_multiplier):
+    return (MILK_BASE_PRICE + price_level * MILK_PRICE_PER_LEVEL) * rebirth_multiplier
+
+def rebirth_price(rebirths):
+    """Price of the next rebirth, rounded to the nearest 1000 coins."""
+    price = int(REBIRTH_BASE_PRICE * (REBIRTH_GROWTH ** rebirths))
+    return round(price / 1000) * 1000
+
+def daily_reward(roll, streak, divisor, rebirth_multiplier):
+    """A /daily reward: the roll scaled up by the streak and the rebirth multiplier."""
+    return round(roll * (1 + streak / divisor) * rebirth_multiplier)
@@ -0,0 +1,126 @@
+"""JSON encoding for the data files, using orjson when it is installed.
+
+orjson is several times faster than the standard library in both directions but
+is optional; without it everything falls back to the json module. dumps() always
+returns bytes so callers can write files in binary mode either way.
+
+stream_json() reads a large JSON object file a chunk at a time and yields the
+entries of its players map one by one, so the file's text and the full object
+tree never need to be in memory together.
+"""
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CODEC = "orjson" if orjson is not None else "json"
+
+STREAM_CHUNK = 1 << 20  # Characters read per step by stream_json
+
+
+def loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent=None):
+    """Serialize obj to bytes. indent=None is compact; orjson only indents by 2 spaces."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            pass  # e.g. an integer beyond 64 bits, which only the json module can write
+    if indent is None:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    return json.dumps(obj, indent=indent).encode()
+
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+_VALUE_ENDS = frozenset(" \t\n\r,:}]")
+
+
+class _ChunkReader:
+    """A sliding window over a text file for parsing one JSON value at a time."""
+
+    def __init__(self, file):
+        self.file = file
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Drop what has been parsed and append the next chunk. Returns False at end of file."""
+        chunk = self.file.read(STREAM_CHUNK)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character ("" at end of file)."""
+        while True:
+            self.pos = _whitespace.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self):
+        """Parse the next complete JSON value, reading more of the file as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+                # A number cut off by the end of the buffer (e.g. "12." or "12") may continue in the next chunk
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in _VALUE_ENDS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def stream_json(file_path, nested="players"):
+    """Yield (section, key, value) for a JSON object file, reading it a chunk at a time.
+
+    Top-level entries come out as (None, key, value), except the object under
+    the nested key, whose entries come out one by one as (nested, key, value).
+    """
+    with open(file_path, 'r', encoding="utf-8") as file:
+        reader = _ChunkReader(file)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if key == nested and reader.peek() == "{":
+                reader.expect("{")
+                while reader.peek() != "}":
+                    entry_key = reader.value()
+                    reader.expect(":")
+                    yield nested, entry_key, reader.value()
+                    if reader.peek() != ",":
+                        break
+                    reader.pos += 1
+                reader.expect("}")
+            else:
+                yield None, key, reader.value()
+
+            if reader.peek() != ",":
+                break
+            reader.pos += 1
+        reader.expect("}")
@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+
+class LagMonitor:
+    """Measures how late the event loop wakes up, i.e. how long something blocked it.
+
+    Every interval seconds it sleeps and checks how much later than asked it got
+    control back. The worst lag since the last report is kept in max_lag, and any
+    single lag above warn_after seconds is printed.
+    """
+
+    def __init__(self, interval=0.1, warn_after=0.25):
+        self.interval = interval
+        self.warn_after = warn_after
+
+        self.last_lag = 0.0
+        self.max_lag = 0.0  # Worst lag since the last reset()
+        self.samples = 0
+        self._task = None
+
+    def start(self):
+        """Start measuring (safe to call more than once)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self.samples += 1
+            if lag > self.warn_after:
+                print(f"⚠️ Event loop was blocked for {lag * 1000:.0f} ms")
+
+    def reset(self):
+        """Return the worst lag seen so far and start a new measurement window."""
+        worst, self.max_lag = self.max_lag, 0.0
+        return worst
+
+    def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
@@ -0,0 +1,194 @@
+from bisect import bisect_left, insort
+
+
+class RankIndex:
+    """Players ordered by one stat, highest first, kept up to date as values change.
+
+    Entries live in a list of small sorted buckets (like a B-tree with one level),
+    and a Fenwick tree over the bucket sizes turns "how many players are ahead of
+    this one" into an O(log n) sum. Updates, rank lookups and reading a slice of
+    the leaderboard never sort the whole player base.
+    """
+
+    BUCKET_SIZE = 1000
+
+    def __init__(self, category):
+        self.category = category
+        self.version = 0  # Bumped whenever the order changes
+
+        self._values = {}  # user_id -> value currently in the index
+        self._buckets = []  # Sorted lists of (-value, user_id)
+        self._maxes = []  # Last key of each bucket
+        self._tree = []  # Fenwick tree over len(bucket)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, user_id):
+        return user_id in self._values
+
+    def build(self, items):
+        """Replace the index contents with (user_id, value) pairs in one sort."""
+        self._values = {user_id: value or 0 for user_id, value in items}
+        keys = sorted((-value, user_id) for user_id, value in self._values.items())
+        size = self.BUCKET_SIZE
+        self._buckets = [keys[i:i + size] for i in range(0, len(keys), size)]
+        self._rebuild()
+
+    def update(self, user_id, value):
+        """Set a player's value, moving them in the order if it changed."""
+        value = value or 0
+        if user_id in self._values:
+            old = self._values[user_id]
+            if old == value:
+                return
+            self._remove_key((-old, user_id))
+        self._values[user_id] = value
+        self._insert_key((-value, user_id))
+        self.version += 1
+
+    def remove(self, user_id):
+        if user_id in self._values:
+            self._remove_key((-self._values.pop(user_id), user_id))
+            self.version += 1
+
+    def value(self, user_id):
+        return self._values.get(user_id)
+
+    def rank(self, user_id):
+        """0-based position of the player (0 is first place), or None if not indexed."""
+        if user_id not in self._values:
+            return None
+        key = (-self._values[user_id], user_id)
+        b = bisect_left(self._maxes, key)
+        return self._prefix(b) + bisect_left(self._buckets[b], key)
+
+    def top_percent(self, user_id):
+        """Share of players ranked at or above this player, in percent (small is good)."""
+        rank = self.rank(user_id)
+        if rank is None:
+            return None
+        return 100 * (rank + 1) / len(self._values)
+
+    def slice(self, start, stop):
+        """Return (user_id, value) pairs for positions start..stop-1."""
+        start = max(0, start)
+        stop = min(stop, len(self._values))
+        if start >= stop:
+            return []
+
+        b, offset = self._locate(start)
+        result = []
+        while len(result) < stop - start:
+            bucket = self._buckets[b]
+            for neg_value, user_id in bucket[offset:offset + stop - start - len(result)]:
+                result.append((user_id, -neg_value))
+            b, offset = b + 1, 0
+        return result
+
+    def top(self, limit=10):
+        return self.slice(0, limit)
+
+    # Bucket bookkeeping
+
+    def _insert_key(self, key):
+        if not self._buckets:
+            self._buckets.append([key])
+            self._rebuild()
+            return
+
+        b = min(bisect_left(self._maxes, key), len(self._buckets) - 1)
+        bucket = self._buckets[b]
+        insort(bucket, key)
+        self._maxes[b] = bucket[-1]
+
+        if len(bucket) > 2 * self.BUCKET_SIZE:
+            self._buckets[b:b + 1] = [bucket[:self.BUCKET_SIZE], bucket[self.BUCKET_SIZE:]]
+            self._rebuild()
+        else:
+            self._add(b, 1)
+
+    def _remove_key(self, key):
+        b = bisect_left(self._maxes, key)
+        bucket = self._buckets[b]
+        del bucket[bisect_left(bucket, key)]
+
+        if not bucket:
+            del self._buckets[b]
+            self._rebuild()
+        else:
+            self._maxes[b] = bucket[-1]
+            self._add(b, -1)
+
+    def _rebuild(self):
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._tree = [0] * len(self._buckets)
+        for b, bucket in enumerate(self._buckets):
+            self._add(b, len(bucket))
+
+    def _add(self, b, delta):
+        b += 1
+        while b <= len(self._tree):
+            self._tree[b - 1] += delta
+            b += b & -b
+
+    def _prefix(self, b):
+        """Number of entries in buckets 0..b-1."""
+        total = 0
+        while b > 0:
+            total += self._tree[b - 1]
+            b -= b & -b
+        return total
+
+    def _locate(self, position):
+        """Find (bucket, offset) of a position by walking down the Fenwick tree."""
+        b = 0
+        step = 1 << len(self._tree).bit_length()
+        while step:
+            if b + step <= len(self._tree) and self._tree[b + step - 1] <= position:
+                b += step
+                position -= self._tree[b - 1]
+            step >>= 1
+        return b, position
+
+
+if __name__ == "__main__":
+    # Benchmark against sorting every player: python leaderboard_index.py [players]
+    import random
+    import sys
+    import time
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(1)
+    players = {str(10**17 + i): {"money": rng.randint(0, 10**9), "rebirths": rng.randint(0, 40)} for i in range(count)}
+    changed = rng.sample(list(players), 10_000)
+
+    for category in ("money", "rebirths"):
+        started = time.perf_counter()
+        top = sorted(players.items(), key=lambda x: x[1].get(category, 0), reverse=True)[:10]
+        sort_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index = RankIndex(category)
+        index.build((user_id, player_data[category]) for user_id, player_data in players.items())
+        build_seconds = time.perf_counter() - started
+        assert [value for _, value in index.top(10)] == [player_data[category] for _, player_data in top]
+
+        started = time.perf_counter()
+        for _ in range(1000):
+            index.top(10)
+        top_seconds = (time.perf_counter() - started) / 1000
+
+        high = 10**9 if category == "money" else 40
+        started = time.perf_counter()
+        for user_id in changed:
+            index.update(user_id, rng.randint(0, high))
+        update_seconds = (time.perf_counter() - started) / len(changed)
+
+        started = time.perf_counter()
+        for user_id in changed:
+            index.rank(user_id)
+        rank_seconds = (time.perf_counter() - started) / len(changed)
+
+        print(f"{category:8} {count:,} players: sorted() top 10 {sort_seconds * 1e3:.0f} ms | index build {build_seconds:.2f} s, "
+              f"top 10 {top_seconds * 1e6:.1f} us, update {update_seconds * 1e6:.1f} us, rank {rank_seconds * 1e6:.1f} us")
@@ -0,0 +1,40 @@
+"""One-shot import of data.json into the binary record backend.
+
+Usage: python migrate_to_binary.py [data.json] [players.bin] [players.side.json]
+
+Run it while the bot is offline, then set STORAGE_BACKEND = "binary" in Biggeth-T.py.
+"""
+import sys
+
+from binary_backend import BinaryBackend
+from json_codec import stream_json
+from player_schema import migrate_player
+
+
+def migrate(json_path, records_path, side_path):
+    backend = BinaryBackend(records_path, side_path)
+    backend.load()  # Brings existing files up to the current layout before anything is added
+
+    # Every record becomes a fixed-width slot, so bring it up to the current schema first
+    players = {}
+    try:
+        for section, key, value in stream_json(json_path):
+            if section is None:
+                backend.meta[key] = value
+            else:
+                migrate_player(value)
+                players[key] = value
+    except FileNotFoundError:
+        pass
+
+    backend.write({"players": players}, players)
+    backend.close()
+    return len(players)
+
+
+if __name__ == "__main__":
+    json_path = sys.argv[1] if len(sys.argv) > 1 else "data.json"
+    records_path = sys.argv[2] if len(sys.argv) > 2 else "players.bin"
+    side_path = sys.argv[3] if len(sys.argv) > 3 else "players.side.json"
+    count = migrate(json_path, records_path, side_path)
+    print(f"Imported {count} players from {json_path} into {records_path}")
@@ -0,0 +1,54 @@
+"""One-shot import of data.json into the SQLite backend.
+
+Usage: python migrate_to_sqlite.py [data.json] [data.db]
+
+Run it while the bot is offline, then set STORAGE_BACKEND = "sqlite" in Biggeth-T.py.
+"""
+import itertools
+import sys
+
+from json_codec import stream_json
+from player_schema import pack_player
+from sqlite_backend import SqliteBackend
+
+BATCH_SIZE = 1000
+
+
+def iter_players(json_path, backend):
+    """Yield (user_id, record) pairs from the players map, streaming the file.
+
+    Everything except the players map (e.g. the bot token) goes straight to the meta table.
+    """
+    try:
+        for section, key, value in stream_json(json_path):
+            if section is None:
+                backend.write_meta(key, value)
+            else:
+                yield key, value
+    except FileNotFoundError:
+        return
+
+
+def migrate(json_path, db_path):
+    backend = SqliteBackend(db_path, pack=pack_player)
+
+    # The file is read a chunk at a time, so only one batch of players is in memory at once
+    players = iter_players(json_path, backend)
+    imported = 0
+    while True:
+        batch = list(itertools.islice(players, BATCH_SIZE))
+        if not batch:
+            break
+        backend.write_players(batch)
+        imported += len(batch)
+
+    backend.compact(None)
+    backend.close()
+    return imported
+
+
+if __name__ == "__main__":
+    json_path = sys.argv[1] if len(sys.argv) > 1 else "data.json"
+    db_path = sys.argv[2] if len(sys.argv) > 2 else "data.db"
+    count = migrate(json_path, db_path)
+    print(f"Imported {count} players from {json_path} into {db_path}")
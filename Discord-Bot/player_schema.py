@@ -0,0 +1,291 @@
+from collections.abc import Mapping, MutableMapping
+from operator import attrgetter
+
+# Bump SCHEMA_VERSION and add a step to MIGRATIONS whenever the player record changes shape
+SCHEMA_VERSION = 1
+
+# Every field of a player record and its starting value
+PLAYER_DEFAULTS = {
+    # General player information
+    "has_registered": False,
+    "banned": False,
+    "username": "",  # Display name, can be added later
+    "total_earnings": 0,
+
+    # Resources
+    "wheat": 0,
+    "wood": 0,
+    "stone": 0,
+    "hardwood": 0,
+    "iron_ore": 0,
+    "silver_ore": 0,
+    "gold_ore": 0,
+    "money": 0,
+    "debt": 0,
+
+    # Upgrade levels
+    "farming_cooldown_level": 0,
+    "wheat_upgrade_level": 0,
+    "wood_upgrade_level": 0,
+    "stone_upgrade_level": 0,
+    "hardwood_upgrade_level": 0,
+    "iron_ore_upgrade_level": 0,
+    "silver_ore_upgrade_level": 0,
+    "gold_ore_upgrade_level": 0,
+    "wheat_price_upgrade_level": 0,
+    "wood_price_upgrade_level": 0,
+    "stone_price_upgrade_level": 0,
+    "hardwood_price_upgrade_level": 0,
+    "iron_ore_price_upgrade_level": 0,
+    "silver_ore_price_upgrade_level": 0,
+    "gold_ore_price_upgrade_level": 0,
+    "milk_price_upgrade_level": 0,
+
+    # Rebirth & multipliers
+    "rebirths": 0,
+    "rebirth_multiplier": 1,
+
+    # Rare items
+    "candy": 0,
+    "weed": 0,
+    "rare_artifacts": 0,
+    "cucumber": 0,
+    "total_candy": 0,
+    "total_weed": 0,
+    "total_rare_artifacts": 0,
+    "total_cucumber": 0,
+
+    # Farming stats
+    "farm_usage_count": 0,
+
+    # Daily streaks and claims
+    "daily_streak": 0,
+    "longest_streak": 0,
+    "total_claims": 0,
+    "last_daily_claim": None,
+
+    # Milk stats
+    "milk": 0,
+    "stored_milk": 0,
+    "total_milk": 0,
+
+    # Cow ownership & production status
+    "cow_owned": False,
+    "production_on": False,
+    "cow_time_started": None,
+
+    # Gambling stats
+    "total_gambled": 0,
+    "total_earned_or_lost": 0,
+    "coinflip_uses": 0,
+}
+
+
+def new_player(username=""):
+    """A fresh record at the current schema version."""
+    return {**PLAYER_DEFAULTS, "username": username, "schema_version": SCHEMA_VERSION}
+
+
+def _fill_defaults(player_data):
+    # Version 0 records were created by different commands with different subsets of fields
+    for key, value in PLAYER_DEFAULTS.items():
+        player_data.setdefault(key, value)
+
+
+# MIGRATIONS[n] upgrades a record from version n to n + 1
+MIGRATIONS = {
+    0: _fill_defaults,
+}
+
+
+def migrate_player(player_data):
+    """Upgrade one loaded record in place to SCHEMA_VERSION. Returns True if it had to be upgraded.
+
+    Also puts back the fields a sparse record (see pack_player) left out; that
+    alone doesn't count as a change.
+    """
+    version = player_data.get("schema_version", 0)
+    upgraded = version < SCHEMA_VERSION
+    while version < SCHEMA_VERSION:
+        MIGRATIONS[version](player_data)
+        version += 1
+    player_data["schema_version"] = version
+
+    # Rebuilding the dict in one go is much cheaper than filling in the missing keys one by one
+    full = {**PLAYER_DEFAULTS, **player_data}
+    player_data.clear()
+    player_data.update(full)
+    return upgraded
+
+
+_MISSING = object()
+
+def pack_player(player_data):
+    """The record as written to disk: only the fields that differ from PLAYER_DEFAULTS."""
+    packed = {}
+    for key, value in player_data.items():
+        default = PLAYER_DEFAULTS.get(key, _MISSING)
+        # Compare types too, so e.g. 0.0 or False don't come back as a different type on load
+        if value != default or type(value) is not type(default):
+            packed[key] = value
+    return packed
+
+
+# Every field of a current record, in PLAYER_DEFAULTS order
+FIELDS = (*PLAYER_DEFAULTS, "schema_version")
+_FIELD_SET = frozenset(FIELDS)
+_get_fields = attrgetter(*FIELDS)
+
+
+class Player(MutableMapping):
+    """One player's record as kept in memory, with a slot per schema field instead of a dict.
+
+    Commands read and write fields as attributes (player_data.wheat += 5), which
+    skips the per-record hash table and takes a fraction of a dict's memory. It
+    is still a mapping, so code written against the persisted form (pack_player,
+    rank indexes, player_data[upgrade_key]) keeps working. Fields outside the
+    schema go to a small overflow dict.
+    """
+
+    __slots__ = (*FIELDS, "_extra")
+
+    @classmethod
+    def from_dict(cls, player_data):
+        """Build a Player from a persisted (migrated) record."""
+        player = cls.__new__(cls)
+        player._extra = None
+        for key, value in player_data.items():
+            try:
+                setattr(player, key, value)
+            except AttributeError:
+                player[key] = value  # Not a schema field
+        return player
+
+    def to_dict(self):
+        """The record as a plain dict, as the backends store it."""
+        try:
+            player_data = dict(zip(FIELDS, _get_fields(self)))
+        except AttributeError:
+            # Only while a field is missing, e.g. halfway through a rollback
+            player_data = {name: getattr(self, name) for name in FIELDS if hasattr(self, name)}
+        if self._extra:
+            player_data.update(self._extra)
+        return player_data
+
+    def read_only(self):
+        return PlayerView(self)
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if not self._extra or key not in self._extra:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def get(self, key, default=None):
+        # Mapping.get would go through __getitem__ and an exception for every miss
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra else default
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        elif self._extra is None:
+            self._extra = {key: value}
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def __repr__(self):
+        return f"Player({self.to_dict()!r})"
+
+
+class PlayerView(Mapping):
+    """Read-only stand-in for a Player, as returned by PlayerStore.view()."""
+
+    __slots__ = ("_player",)
+
+    def __init__(self, player):
+        object.__setattr__(self, "_player", player)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"can't set {name} through a read-only player view")
+
+    def __getitem__(self, key):
+        return self._player[key]
+
+    def __iter__(self):
+        return iter(self._player)
+
+    def __len__(self):
+        return len(self._player)
+
+
+# A read-only property per field; much faster than falling back to __getattr__
+for _name in FIELDS:
+    setattr(PlayerView, _name, property(attrgetter(f"_player.{_name}")))
+del _name
+
+
+if __name__ == "__main__":
+    # Benchmark: python player_schema.py [players]
+    import sys
+    import time
+    import timeit
+
+    import json_codec
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    fields = ("money", "wheat", "rebirths", "rebirth_multiplier", "daily_streak", "cow_owned")
+
+    # Per command: what every command did before the migration (a setdefault per field, then .get
+    # reads) against reading the fields of a migrated record directly
+    legacy = dict(PLAYER_DEFAULTS)
+    player = Player.from_dict(new_player("bench"))
+
+    def setdefault_chain():
+        for key, value in PLAYER_DEFAULTS.items():
+            legacy.setdefault(key, value)
+        return [legacy.get(field, 0) for field in fields]
+
+    def direct_fields():
+        return (player.money, player.wheat, player.rebirths, player.rebirth_multiplier, player.daily_streak, player.cow_owned)
+
+    for name, command in (("setdefault chain + get()", setdefault_chain), ("migrated, direct fields", direct_fields)):
+        seconds = min(timeit.repeat(command, number=100_000, repeat=3)) / 100_000
+        print(f"per command, {name:26} {seconds * 1e6:6.2f} us")
+
+    # Load and save: migrate version 0 records once, then pack them for the data file
+    records = {str(10**17 + i): {"has_registered": True, "username": f"player{i}", "money": i, "wheat": i % 97} for i in range(count)}
+    started = time.perf_counter()
+    players = {}
+    for user_id, player_data in records.items():
+        migrate_player(player_data)
+        players[user_id] = Player.from_dict(player_data)
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    data = json_codec.dumps({"players": {user_id: pack_player(player.to_dict()) for user_id, player in players.items()}})
+    save_seconds = time.perf_counter() - started
+    print(f"load {count:,} version 0 records (migrate + Player): {load_seconds:.2f} s, "
+          f"save them (pack + dumps): {save_seconds:.2f} s, {len(data) / count:.0f} B per player")
@@ -0,0 +1,554 @@
+import asyncio
+import contextlib
+import copy
+import heapq
+import json
+import os
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+import json_codec
+import stat_columns
+from leaderboard_index import RankIndex
+
+
+# Load and save JSON functions
+def load_json(file_path, streaming=False):
+    # streaming=True parses the players map one record at a time instead of reading the whole text first
+    try:
+        if streaming:
+            data = {"players": {}}
+            for section, key, value in json_codec.stream_json(file_path):
+                if section is None:
+                    data[key] = value
+                else:
+                    data[section][key] = value
+            return data
+        with open(file_path, 'rb') as file:
+            return json_codec.loads(file.read())
+    except FileNotFoundError:
+        return {"players": {}}
+    except json.JSONDecodeError:
+        return {"players": {}}
+
+def save_json(file_path, data, indent=4):
+    # Write to a temporary file and swap it in, so a crash mid-write can't truncate the original
+    # indent=None writes compact JSON with no whitespace at all
+    temp_path = file_path + ".tmp"
+    try:
+        with open(temp_path, 'wb') as file:
+            file.write(json_codec.dumps(data, indent))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+    except Exception as e:
+        print(f"Error saving data to {file_path}: {e}")
+
+
+class JsonBackend:
+    """Stores everything in one JSON file, optionally with an append-only journal.
+
+    Without a journal every write rewrites the whole data file. With a journal each
+    write appends one line per changed player (fsynced once per batch), and
+    compact() folds the journal into a fresh snapshot of the data file.
+
+    If pack is given, each record is passed through it before being written
+    (e.g. to leave out fields at their default value); records are loaded back
+    as written, so the store's migrate hook has to fill them in again. indent is
+    passed to save_json; None writes a compact data file. streaming=True loads the
+    data file with json_codec.stream_json, which needs far less peak memory for
+    big files.
+
+    If watch is True, the backend keeps a fingerprint of every record it last read
+    from or wrote to the data file. When the file's mtime moves without the
+    backend writing it, read_edits() returns just the records that were edited by
+    hand, so players whose newer progress is only in the journal aren't rolled back.
+    """
+
+    def __init__(self, file_path, journal_path=None, pack=None, indent=4, streaming=False, watch=False):
+        self.file_path = file_path
+        self.journal_path = journal_path
+        self.pack = pack
+        self.indent = indent
+        self.streaming = streaming
+        self.watch = watch
+        self._journal = None
+        self._mtime = None  # mtime of the data file as this backend last read or wrote it
+        self._fingerprints = {}  # user_id -> hash of the record as this backend last read or wrote it
+
+        # With a journal, write() only looks at the dirty players and compact() needs everything;
+        # without one, write() rewrites the whole file and compact() has nothing to do
+        self.incremental = journal_path is not None
+        self.snapshot_compaction = journal_path is not None
+
+    def load(self):
+        """Read the snapshot and replay the journal tail on top of it."""
+        data = load_json(self.file_path, self.streaming)
+        data.setdefault("players", {})
+        if self.watch:
+            self._mtime = self._stat()
+            self._fingerprints = _fingerprints(data["players"])
+
+        if self.journal_path:
+            torn = self._replay_journal(data["players"])
+            self._journal = open(self.journal_path, 'ab')
+            if torn:
+                self._journal.write(b"\n")  # Keep new records off the torn line
+        return data
+
+    def write(self, data, dirty):
+        """Persist the players whose IDs are in dirty."""
+        if self._journal is None:
+            self._save(data)
+            return
+
+        # One small record per changed player, with a single fsync for the whole batch
+        players = data["players"]
+        pack = self.pack or (lambda player_data: player_data)
+        lines = [
+            json_codec.dumps({"id": user_id, "player": pack(players[user_id])}) + b"\n"
+            for user_id in dirty if user_id in players
+        ]
+        self._journal.writelines(lines)
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def compact(self, data):
+        """Fold the journal into a fresh snapshot of the data file and start a new journal."""
+        if self._journal is None:
+            return
+
+        # The caller has journaled everything first, so the journal and the snapshot agree if we crash halfway
+        self._save(data)
+        self._journal.close()
+        self._journal = open(self.journal_path, 'wb')
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def changed_on_disk(self):
+        """True if something other than this backend has modified the data file (only with watch=True)."""
+        return self.watch and self._stat() != self._mtime
+
+    def read_edits(self):
+        """Re-read the data file and return (top-level settings, {user_id: record}) for what was edited by hand."""
+        self._mtime = self._stat()
+        try:
+            # Read strictly: a file caught half-saved by an editor must not look like every record was deleted
+            with open(self.file_path, 'rb') as file:
+                data = json_codec.loads(file.read())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}, {}
+
+        players = data.pop("players", {})
+        edited = {}
+        for user_id, player_data in players.items():
+            fingerprint = _fingerprint(player_data)
+            if self._fingerprints.get(user_id) != fingerprint:
+                self._fingerprints[user_id] = fingerprint
+                edited[user_id] = player_data
+        return data, edited
+
+    def _stat(self):
+        try:
+            return os.stat(self.file_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _save(self, data):
+        # Saving over a hand edit would lose it; the store has to read_edits() and apply them first
+        if self.changed_on_disk():
+            raise RuntimeError(f"{self.file_path} was edited since it was last read; read_edits() it before saving")
+        packed = self._packed(data)
+        save_json(self.file_path, packed, self.indent)
+        if self.watch:
+            mtime = self._stat()
+            if mtime != self._mtime:  # save_json only prints when it fails; keep the old fingerprints then
+                self._mtime = mtime
+                self._fingerprints = _fingerprints(packed["players"])
+
+    def _packed(self, data):
+        """data with every record passed through pack (a shallow copy; data itself is untouched)."""
+        if self.pack is None:
+            return data
+        pack = self.pack
+        return {**data, "players": {user_id: pack(player_data) for user_id, player_data in data["players"].items()}}
+
+    def _replay_journal(self, players):
+        """Apply journal records written after the last snapshot. Returns True if the last line was torn."""
+        line = b"\n"
+        try:
+            with open(self.journal_path, 'rb') as journal:
+                for line in journal:
+                    try:
+                        record = json_codec.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn line from a crash mid-append
+                    players[record["id"]] = record["player"]
+        except FileNotFoundError:
+            pass
+        return not line.endswith(b"\n")
+
+
+def _fingerprint(player_data):
+    return hash(json_codec.dumps(player_data))
+
+def _fingerprints(players):
+    return {user_id: _fingerprint(player_data) for user_id, player_data in players.items()}
+
+
+class PlayerStore:
+    """Keeps every player in memory and writes changed players back in the background.
+
+    Persistence is delegated to a backend (JsonBackend or SqliteBackend) with
+    load(), write(data, dirty), compact(data) and close() methods, and two flags:
+    incremental (write() only reads the dirty players from data) and
+    snapshot_compaction (compact() needs the full data).
+
+    Backend calls run on a single writer thread, in the order they were queued,
+    so serializing and fsyncing never blocks the event loop. The background loop
+    hands the writer copies of the changed records (or a full copy of data, taken
+    a chunk of players per event-loop step) and waits for each write to finish
+    before starting the next. While the writer is busy, changes pile up in the
+    dirty set, where repeated changes to one player collapse into a single write.
+
+    Every stat in ranked_stats gets a RankIndex that is updated whenever a player
+    is marked dirty, so leaderboards and rank lookups never sort all players.
+    Likewise, if NumPy is installed, the stats in column_stats are mirrored into a
+    StatColumns (self.columns) for store-wide totals and percentiles; without
+    NumPy, self.columns is None. For every field in flag_fields (e.g. "banned"),
+    self.flagged[field] is the set of user IDs whose value is truthy, so checking
+    a flag for a player is a set lookup.
+
+    If the backend watches its files for hand edits (JsonBackend(watch=True)), the
+    background loop applies edited records to the in-memory players; see
+    reload_edits().
+
+    If migrate is given, it is called once on every record at load and returns
+    True for records it upgraded; those are written back straight away.
+
+    If record is given (e.g. Player.from_dict), every loaded record is turned
+    into record(player_data) after migration, and so is any plain dict passed to
+    add(). Those objects must provide to_dict() for the form handed to the
+    backend and read_only() for view().
+    """
+
+    SNAPSHOT_CHUNK = 2000  # Records copied per event-loop step when taking a full copy of data
+
+    def __init__(self, backend, flush_interval=10, compact_interval=300, ranked_stats=(), migrate=None, record=None,
+                 column_stats=(), flag_fields=()):
+        self.backend = backend
+        self.record = record
+        self.migrate = migrate
+        self.flush_interval = flush_interval  # Seconds between background flushes
+        self.compact_interval = compact_interval  # Seconds between compactions
+
+        # Read the backend once; every command is served from this copy
+        self.data = backend.load()
+
+        self._dirty = set()
+        self._snapshots = {}  # user_id -> copy of the record taken on its first get() since the last flush
+        self._write_task = None
+
+        # Every backend call runs on this one thread
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="player-writer")
+
+        # One lock per player, dropped automatically once nobody is waiting on it
+        self._locks = weakref.WeakValueDictionary()
+
+        # Bring old records up to date once, so commands can rely on every field existing
+        if migrate is not None:
+            self._dirty.update(user_id for user_id, player in self.players() if migrate(player))
+
+        if record is not None:
+            players = self.data["players"]
+            for user_id in players:
+                players[user_id] = record(players[user_id])
+
+        self.indexes = {}
+        for category in ranked_stats:
+            index = self.indexes[category] = RankIndex(category)
+            index.build((user_id, player.get(category, 0)) for user_id, player in self.players())
+
+        self.columns = None
+        if column_stats and stat_columns.AVAILABLE:
+            self.columns = stat_columns.StatColumns(column_stats)
+            self.columns.build(self.players())
+
+        self.flagged = {field: set() for field in flag_fields}
+        for field, user_ids in self.flagged.items():
+            user_ids.update(user_id for user_id, player in self.players() if player.get(field))
+
+        if self._dirty:
+            print(f"Migrated {len(self._dirty)} player records")
+            self.compact()
+
+    def get(self, user_id):
+        """Return the player's record for reading and writing, or None if they have never played.
+
+        Callers that change the record must call mark_dirty() afterwards. A copy of
+        the record is kept until the next flush, so a player marked dirty whose
+        fields all end up unchanged is not written out.
+        """
+        user_id = str(user_id)
+        player_data = self.data["players"].get(user_id)
+        if player_data is not None and user_id not in self._snapshots:
+            self._snapshots[user_id] = self._persisted(player_data)
+        return player_data
+
+    def view(self, user_id):
+        """Return a read-only view of the player's record, or None if they have never played."""
+        player_data = self.data["players"].get(str(user_id))
+        if player_data is None:
+            return None
+        return MappingProxyType(player_data) if self.record is None else player_data.read_only()
+
+    def add(self, user_id, player_data):
+        """Store a (new) record for a player."""
+        if self.record is not None and isinstance(player_data, dict):
+            player_data = self.record(player_data)
+        self.data["players"][str(user_id)] = player_data
+        self.mark_dirty(user_id)
+        return player_data
+
+    def players(self):
+        """Iterate over (user_id, record) pairs for every player."""
+        return self.data["players"].items()
+
+    def top(self, category, limit=10):
+        """Return the (user_id, record) pairs with the highest value for category."""
+        players = self.data["players"]
+
+        if category in self.indexes:
+            return [(user_id, players[user_id]) for user_id, _ in self.indexes[category].top(limit)]
+
+        if hasattr(self.backend, "top"):
+            # Let the backend answer from its index; it must see the latest values first
+            self.flush()
+            return [(user_id, players[user_id]) for user_id in self.backend.top(category, limit) if user_id in players]
+
+        return heapq.nlargest(limit, players.items(), key=lambda x: x[1].get(category, 0))
+
+    @contextlib.asynccontextmanager
+    async def transaction(self, user_id):
+        """Lock a player and yield their current record for a read-modify-write.
+
+        Use this whenever an update spans an await (button callbacks, background
+        tasks). The player is marked dirty when the block finishes having changed
+        something; if it raises, the record is restored to how it was when the
+        transaction started.
+        """
+        user_id = str(user_id)
+        lock = self._locks.get(user_id)
+        if lock is None:
+            lock = self._locks[user_id] = asyncio.Lock()
+
+        async with lock:
+            player_data = self.get(user_id)  # Re-read after waiting for the lock
+            before = self._persisted(player_data)
+            try:
+                yield player_data
+            except BaseException:
+                player_data.clear()
+                player_data.update(before)
+                raise
+            if self._persisted(player_data) != before:
+                self.mark_dirty(user_id)
+
+    def mark_dirty(self, user_id):
+        """Remember that a player changed so the next flush writes it out."""
+        user_id = str(user_id)
+        self._dirty.add(user_id)
+
+        player_data = self.data["players"].get(user_id)
+        for category, index in self.indexes.items():
+            if player_data is None:
+                index.remove(user_id)
+            else:
+                index.update(user_id, player_data.get(category, 0))
+        if self.columns is not None:
+            if player_data is None:
+                self.columns.remove(user_id)
+            else:
+                self.columns.update(user_id, player_data)
+        for field, user_ids in self.flagged.items():
+            if player_data is not None and player_data.get(field):
+                user_ids.add(user_id)
+            else:
+                user_ids.discard(user_id)
+
+    def _take_dirty(self):
+        """Swap out the dirty set and return copies of the records that really changed."""
+        snapshots, self._snapshots = self._snapshots, {}
+        dirty, self._dirty = self._dirty, set()
+
+        # Drop players that were marked dirty but ended up exactly as they were.
+        # Records are flat, so a shallow copy is enough to hand to the writer thread.
+        players = self.data["players"]
+        changed = {}
+        for user_id in dirty:
+            if user_id in players:
+                player_data = self._persisted(players[user_id])
+                if user_id not in snapshots or player_data != snapshots[user_id]:
+                    changed[user_id] = player_data
+        return changed
+
+    def _persisted(self, player_data):
+        """A plain dict copy of a record, as the backend gets it."""
+        return dict(player_data) if self.record is None else player_data.to_dict()
+
+    def _persisted_data(self):
+        """data with plain dict records, for the blocking calls that hand the backend everything."""
+        if self.record is None:
+            return self.data
+        return {**self.data, "players": {user_id: player.to_dict() for user_id, player in self.data["players"].items()}}
+
+    async def _copy_data(self):
+        """Copy all of data for the writer thread, yielding to the event loop between chunks.
+
+        A player changed after their record was copied is in the dirty set, so the
+        next write picks the change up.
+        """
+        copied = {key: copy.deepcopy(value) for key, value in self.data.items() if key != "players"}
+        players = copied["players"] = {}
+        source = self.data["players"]
+        user_ids = list(source)  # Players can be added while we yield, so don't iterate the dict itself
+        for start in range(0, len(user_ids), self.SNAPSHOT_CHUNK):
+            for user_id in user_ids[start:start + self.SNAPSHOT_CHUNK]:
+                players[user_id] = self._persisted(source[user_id])
+            await asyncio.sleep(0)
+        return copied
+
+    def flush(self):
+        """Persist every player that changed since the last flush, blocking until it is written."""
+        try:
+            self._reload_edits_now()  # Before anything can save over them
+        except Exception as e:
+            print(f"Error reading edits to player data: {e}")
+        changed = self._take_dirty()
+        if not changed:
+            return
+
+        data = {"players": changed} if self.backend.incremental else self._persisted_data()
+        try:
+            self._writer.submit(self.backend.write, data, set(changed)).result()
+        except Exception as e:
+            print(f"Error saving players: {e}")
+            self._dirty.update(changed)  # Try again on the next flush
+
+    async def flush_async(self):
+        """Like flush(), but the write happens on the writer thread while the event loop carries on."""
+        changed = self._take_dirty()
+        if not changed:
+            return
+
+        try:
+            data = {"players": changed} if self.backend.incremental else await self._copy_data()
+            await asyncio.wrap_future(self._writer.submit(self.backend.write, data, set(changed)))
+        except asyncio.CancelledError:
+            self._dirty.update(changed)  # Whoever flushes next (e.g. close()) writes these
+            raise
+        except Exception as e:
+            print(f"Error saving players: {e}")
+            self._dirty.update(changed)  # Try again on the next flush
+
+    async def reload_edits(self):
+        """Apply records that were edited by hand in the backend's files, e.g. a ban added to data.json.
+
+        Each edited record replaces the player's in-memory fields as a whole (after
+        migration) and is then written back like any other change. Returns the
+        number of players updated.
+        """
+        if not self._edited_on_disk():
+            return 0
+
+        settings, edited = await asyncio.wrap_future(self._writer.submit(self.backend.read_edits))
+        self.data.update(settings)
+        for count, (user_id, player_data) in enumerate(edited.items(), 1):
+            self._apply_edit(user_id, player_data)
+            if count % self.SNAPSHOT_CHUNK == 0:
+                await asyncio.sleep(0)
+
+        if edited:
+            print(f"Picked up hand edits to {len(edited)} player records")
+        return len(edited)
+
+    def _reload_edits_now(self):
+        """Like reload_edits(), but blocking, for flush() and close()."""
+        if not self._edited_on_disk():
+            return 0
+
+        settings, edited = self._writer.submit(self.backend.read_edits).result()
+        self.data.update(settings)
+        for user_id, player_data in edited.items():
+            self._apply_edit(user_id, player_data)
+
+        if edited:
+            print(f"Picked up hand edits to {len(edited)} player records")
+        return len(edited)
+
+    def _edited_on_disk(self):
+        changed_on_disk = getattr(self.backend, "changed_on_disk", None)
+        return changed_on_disk is not None and changed_on_disk()
+
+    def _apply_edit(self, user_id, player_data):
+        if self.migrate is not None:
+            self.migrate(player_data)
+        current = self.data["players"].get(user_id)
+        if current is None:
+            self.add(user_id, player_data)
+        else:
+            current.update(player_data)
+            self._snapshots.pop(user_id, None)  # Make sure the next flush writes it
+            self.mark_dirty(user_id)
+
+    def compact(self):
+        """Flush, then let the backend fold its incremental writes into a snapshot, blocking until done."""
+        self.flush()
+        data = self._persisted_data() if self.backend.snapshot_compaction else None
+        self._writer.submit(self.backend.compact, data).result()
+
+    async def compact_async(self):
+        """Like compact(), but copies data in chunks and compacts on the writer thread."""
+        await self.flush_async()
+        data = await self._copy_data() if self.backend.snapshot_compaction else None
+        try:
+            await asyncio.wrap_future(self._writer.submit(self.backend.compact, data))
+        except Exception as e:
+            print(f"Error compacting players: {e}")
+
+    def start(self):
+        """Start the background write task (safe to call more than once)."""
+        if self._write_task is None or self._write_task.done():
+            self._write_task = asyncio.create_task(self._write_loop())
+
+    async def _write_loop(self):
+        # One task does both, so a flush and a compaction never race each other to the writer
+        next_compact = time.monotonic() + self.compact_interval
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # Pick up hand edits first: a flush without a journal, or a compaction, rewrites the data file
+            try:
+                await self.reload_edits()
+            except Exception as e:
+                print(f"Error reading edits to player data: {e}")
+
+            if time.monotonic() >= next_compact:
+                await self.compact_async()
+                next_compact = time.monotonic() + self.compact_interval
+            else:
+                await self.flush_async()
+
+    def close(self):
+        """Stop the background tasks, force a final flush and compaction, and close the backend."""
+        if self._write_task is not None and not self._write_task.done():
+            self._write_task.cancel()
+        self._write_task = None
+
+        self.compact()
+        self._writer.submit(self.backend.close).result()
+        self._writer.shutdown()
@@ -0,0 +1,81 @@
+import time
+
+
+class TokenBucket:
+    """Holds up to capacity tokens and refills at rate tokens per second."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def wait_time(self, cost):
+        """Seconds until cost tokens will be available (after a refill)."""
+        return max(0, (cost - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """Token buckets per user and one shared by everyone, checked before a command does any work.
+
+    A command costs some number of tokens; it is let through only if both the
+    caller's bucket and the global bucket hold that many, and then both are
+    charged. The per-user bucket stops one player from spamming, the global one
+    caps the total load (e.g. during a raid of alt accounts). A user's bucket is
+    dropped once it has refilled, since a full bucket behaves the same as a new
+    one, so memory follows the recently active users.
+    """
+
+    def __init__(self, user_rate, user_burst, global_rate, global_burst, sweep_interval=60):
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.sweep_interval = sweep_interval  # Seconds between sweeps for refilled user buckets
+
+        now = time.monotonic()
+        self.global_bucket = TokenBucket(global_rate, global_burst, now)
+        self._buckets = {}  # user_id -> TokenBucket
+        self._next_sweep = now + sweep_interval
+        self.rejected = {"user": 0, "global": 0}
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def check(self, user_id, cost=1):
+        """Charge cost tokens and return None, or return "user" or "global" (charging nothing) if a bucket is short.
+
+        A cost above the user's burst is capped at it, so such a command can still run from a full bucket.
+        """
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            bucket = self._buckets[user_id] = TokenBucket(self.user_rate, self.user_burst, now)
+        cost = min(cost, self.user_burst)
+        if bucket.refill(now) < cost:
+            self.rejected["user"] += 1
+            return "user"
+        if self.global_bucket.refill(now) < cost:
+            self.rejected["global"] += 1
+            return "global"
+        bucket.tokens -= cost
+        self.global_bucket.tokens -= cost
+        return None
+
+    def wait_time(self, user_id, cost=1):
+        """Seconds until user_id could afford cost again, going by both buckets as of the last check."""
+        bucket = self._buckets.get(user_id)
+        wait = bucket.wait_time(min(cost, self.user_burst)) if bucket is not None else 0
+        return max(wait, self.global_bucket.wait_time(cost))
+
+    def _sweep(self, now):
+        self._buckets = {user_id: bucket for user_id, bucket in self._buckets.items() if bucket.refill(now) < bucket.capacity}
+        self._next_sweep = now + self.sweep_interval
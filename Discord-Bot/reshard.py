@@ -0,0 +1,70 @@
+"""Offline conversion of data.json, or of an existing shard directory, into N shard files.
+
+Usage: python reshard.py SOURCE DEST SHARD_COUNT
+
+SOURCE is either a data.json file or a shard directory; DEST may be the same
+directory as SOURCE. The new shards are built next to DEST and swapped in only
+once they are complete. Run it while the bot is offline, then set
+STORAGE_BACKEND = "sharded" (and SHARD_DIR to DEST) in Biggeth-T.py.
+"""
+import os
+import shutil
+import sys
+
+from json_codec import stream_json
+from player_schema import pack_player
+from player_store import save_json
+from sharded_backend import read_manifest, shard_name, shard_of, write_manifest
+
+
+def iter_source(source):
+    """Yield (section, key, value) entries like json_codec.stream_json, from a file or a shard directory."""
+    if not os.path.isdir(source):
+        yield from stream_json(source)
+        return
+
+    manifest = read_manifest(source)
+    if manifest is None:
+        raise SystemExit(f"{source} has no manifest")
+    for key, value in manifest.get("meta", {}).items():
+        yield None, key, value
+    for name in manifest["shards"]:
+        path = os.path.join(source, name)
+        if os.path.exists(path):
+            yield from stream_json(path)
+
+
+def reshard(source, dest, shard_count):
+    meta = {}
+    shards = [{} for _ in range(shard_count)]
+    for section, key, value in iter_source(source):
+        if section is None:
+            meta[key] = value
+        else:
+            shards[shard_of(key, shard_count)][key] = pack_player(value)
+
+    # Build the new layout beside DEST, then swap it in, so a crash never leaves a half-written DEST
+    build = dest.rstrip(os.sep) + ".new"
+    shutil.rmtree(build, ignore_errors=True)
+    os.makedirs(build)
+    for index, shard in enumerate(shards):
+        save_json(os.path.join(build, shard_name(index)), {"players": shard}, None)
+    write_manifest(build, shard_count, meta)
+
+    if os.path.exists(dest):
+        old = dest.rstrip(os.sep) + ".old"
+        shutil.rmtree(old, ignore_errors=True)
+        os.rename(dest, old)
+        os.rename(build, dest)
+        shutil.rmtree(old)
+    else:
+        os.rename(build, dest)
+    return sum(len(shard) for shard in shards)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        raise SystemExit(__doc__)
+    source, dest, shard_count = sys.argv[1], sys.argv[2], int(sys.argv[3])
+    count = reshard(source, dest, shard_count)
+    print(f"Wrote {count} players from {source} into {shard_count} shards in {dest}")
@@ -0,0 +1,155 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+from player_store import load_json, save_json
+
+
+class Scheduler:
+    """Runs every timed game event from one heap, driven by a single asyncio task.
+
+    Each event has a kind (e.g. "streak_expiry"), a key (usually a user ID), a
+    wall-clock deadline and an optional JSON payload. Scheduling the same kind and
+    key again replaces the earlier event. Pending events are saved to file_path so
+    they survive a restart; anything that came due while the bot was down fires as
+    soon as the scheduler starts.
+    """
+
+    def __init__(self, file_path=None, save_interval=60):
+        self.file_path = file_path
+        self.save_interval = save_interval  # Seconds between saves of the pending events
+
+        self._heap = []  # (deadline, seq, kind, key)
+        self._events = {}  # (kind, key) -> (deadline, seq, payload) for the live event
+        self._handlers = {}
+        self._counter = itertools.count()
+        self._wakeup = None
+        self._task = None
+        self._dirty = False
+
+    def register(self, kind, handler):
+        """Call `await handler(key, payload)` when an event of this kind comes due."""
+        self._handlers[kind] = handler
+
+    def schedule(self, kind, key, deadline, payload=None):
+        """Add or replace the event for (kind, key) at the given time.time() deadline."""
+        seq = next(self._counter)
+        self._events[(kind, key)] = (deadline, seq, payload)
+        heapq.heappush(self._heap, (deadline, seq, kind, key))
+        self._changed()
+
+        # Replaced events stay in the heap until they surface; rebuild if they pile up
+        if len(self._heap) > 2 * len(self._events) + 64:
+            self._heap = [(deadline, seq, kind, key) for (kind, key), (deadline, seq, _) in self._events.items()]
+            heapq.heapify(self._heap)
+
+    def cancel(self, kind, key):
+        """Drop the pending event for (kind, key), if there is one."""
+        if self._events.pop((kind, key), None) is not None:
+            self._changed()
+
+    def pending(self, kind, key):
+        """Return the deadline of the pending event for (kind, key), or None."""
+        event = self._events.get((kind, key))
+        return event[0] if event else None
+
+    def __len__(self):
+        return len(self._events)
+
+    def _changed(self):
+        self._dirty = True
+        if self._wakeup is not None:
+            self._wakeup.set()  # The earliest deadline may have moved
+
+    def load(self):
+        """Restore pending events saved by a previous run. Returns False if there was no file."""
+        if not self.file_path:
+            return False
+        saved = load_json(self.file_path).get("events")
+        if saved is None:
+            return False
+        for kind, key, deadline, payload in saved:
+            self.schedule(kind, key, deadline, payload)
+        self._dirty = False
+        return True
+
+    def save(self):
+        """Write the pending events to file_path if they changed."""
+        if not self.file_path or not self._dirty:
+            return
+        self._dirty = False
+        save_json(self.file_path, {"events": self._saved_events()})
+
+    async def save_async(self):
+        """Like save(), but serializes and writes the file on a worker thread."""
+        if not self.file_path or not self._dirty:
+            return
+        self._dirty = False
+        await asyncio.to_thread(save_json, self.file_path, {"events": self._saved_events()})
+
+    def _saved_events(self):
+        # Fresh lists, so the worker thread never sees the live event table
+        return [[kind, key, deadline, payload] for (kind, key), (deadline, _, payload) in self._events.items()]
+
+    def start(self):
+        """Start the scheduler task (safe to call more than once)."""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        next_save = time.monotonic() + self.save_interval
+        while True:
+            head = self._peek()
+            now = time.time()
+            if head is not None and head[0] <= now:
+                _, _, kind, key = heapq.heappop(self._heap)
+                _, _, payload = self._events.pop((kind, key))
+                self._dirty = True
+                await self._fire(kind, key, payload)
+                # A handler that never suspends (e.g. an uncontended transaction) would otherwise let a
+                # batch of events due at the same moment, like every streak at UTC midnight, hog the loop
+                await asyncio.sleep(0)
+                continue
+
+            if time.monotonic() >= next_save:
+                await self.save_async()
+                next_save = time.monotonic() + self.save_interval
+
+            # Sleep until the next deadline, the next save, or until something is (re)scheduled
+            timeout = next_save - time.monotonic()
+            if head is not None:
+                timeout = min(timeout, head[0] - now)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0, timeout))
+            except asyncio.TimeoutError:
+                pass
+
+    def _peek(self):
+        """Return the earliest live heap entry, dropping replaced or cancelled ones."""
+        while self._heap:
+            _, seq, kind, key = self._heap[0]
+            event = self._events.get((kind, key))
+            if event is not None and event[1] == seq:
+                return self._heap[0]
+            heapq.heappop(self._heap)
+        return None
+
+    async def _fire(self, kind, key, payload):
+        handler = self._handlers.get(kind)
+        if handler is None:
+            print(f"No handler registered for scheduled event {kind}")
+            return
+        try:
+            await handler(key, payload)
+        except Exception as e:
+            print(f"Error running scheduled event {kind} for {key}: {e}")
+
+    def close(self):
+        """Stop the scheduler task and save the pending events."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self.save()
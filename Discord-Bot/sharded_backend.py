@@ -0,0 +1,109 @@
+import os
+import zlib
+
+import json_codec
+from player_store import load_json, save_json
+
+
+MANIFEST_FILE = "manifest.json"
+
+
+def shard_of(user_id, shard_count):
+    """Index of the shard a player lives in."""
+    return zlib.crc32(str(user_id).encode()) % shard_count
+
+def shard_name(index):
+    return f"players-{index:04d}.json"
+
+
+def read_manifest(directory):
+    """Return the manifest of a shard directory, or None if there isn't one."""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), 'rb') as file:
+            return json_codec.loads(file.read())
+    except FileNotFoundError:
+        return None
+
+def write_manifest(directory, shard_count, meta):
+    manifest = {
+        "shard_count": shard_count,
+        "hash": "crc32",
+        "shards": [shard_name(index) for index in range(shard_count)],
+        "meta": meta,  # Top-level settings such as the bot token
+    }
+    save_json(os.path.join(directory, MANIFEST_FILE), manifest)
+    return manifest
+
+
+class ShardedJsonBackend:
+    """Stores players in shard_count JSON files, picked by a CRC32 of the user ID.
+
+    manifest.json in the directory lists the shard files and holds the top-level
+    settings (e.g. the bot token). A write rewrites only the shards that hold a
+    dirty player. The backend keeps its own copy of every shard's records (as
+    written to disk) so it can rewrite a shard; load() fills it in from the same
+    parse that builds the players it returns. Use reshard.py to change the shard count offline.
+
+    If pack is given, records are passed through it before being written, as with
+    JsonBackend.
+    """
+
+    def __init__(self, directory, shard_count=16, pack=None, indent=None):
+        self.directory = directory
+        self.pack = pack
+        self.indent = indent
+
+        manifest = read_manifest(directory)
+        if manifest is None:
+            os.makedirs(directory, exist_ok=True)
+            manifest = write_manifest(directory, shard_count, {})
+        self.shard_count = manifest["shard_count"]
+        self.shards = manifest["shards"]
+        self.meta = manifest.get("meta", {})
+
+        self._loaded = {}  # Shard index -> {user_id: record as on disk}
+
+        # write() only needs the dirty players, and there is nothing to compact
+        self.incremental = True
+        self.snapshot_compaction = False
+
+    def _path(self, index):
+        return os.path.join(self.directory, self.shards[index])
+
+    def _shard(self, index):
+        shard = self._loaded.get(index)
+        if shard is None:
+            # Only if write() comes before load()
+            shard = self._loaded[index] = load_json(self._path(index)).get("players", {})
+        return shard
+
+    def load(self):
+        """Read the settings and every shard into a data.json-shaped dict."""
+        data = dict(self.meta)
+        players = data["players"] = {}
+        for index in range(self.shard_count):
+            shard = self._loaded[index] = load_json(self._path(index)).get("players", {})
+            # The store migrates the returned records in place, so hand it copies and keep the on-disk form
+            players.update((user_id, dict(player_data)) for user_id, player_data in shard.items())
+        return data
+
+    def write(self, data, dirty):
+        """Rewrite the shards that hold the players whose IDs are in dirty."""
+        players = data["players"]
+        touched = {}
+        for user_id in dirty:
+            if user_id in players:
+                touched.setdefault(shard_of(user_id, self.shard_count), []).append(user_id)
+
+        pack = self.pack or (lambda player_data: player_data)
+        for index, user_ids in touched.items():
+            shard = self._shard(index)
+            for user_id in user_ids:
+                shard[user_id] = pack(players[user_id])
+            save_json(self._path(index), {"players": shard}, self.indent)
+
+    def compact(self, data):
+        pass  # Every write already replaces whole shard files
+
+    def close(self):
+        self._loaded.clear()
@@ -0,0 +1,100 @@
+import sqlite3
+
+import json_codec
+
+
+# Player stats that get their own indexed column, so leaderboards can ORDER BY them
+INDEXED_STATS = ("money", "rebirths", "daily_streak")
+
+# The range SQLite can store as an INTEGER
+MIN_INTEGER, MAX_INTEGER = -2**63, 2**63 - 1
+
+
+def _column_value(value):
+    """A stat as bound to its indexed column.
+
+    Python ints outside SQLite's 64-bit range (money after enough rebirths and
+    plinko wins) can't be bound and would fail the whole batch, so they go in as
+    REAL, which still sorts correctly against the INTEGER rows. The record in the
+    data column keeps the value as written.
+    """
+    if isinstance(value, int) and not MIN_INTEGER <= value <= MAX_INTEGER:
+        return float(value)
+    return value
+
+
+class SqliteBackend:
+    """Stores one row per player in a SQLite database (WAL mode).
+
+    The full record lives in the JSON "data" column; the leaderboard stats are
+    mirrored into indexed columns. Top-level settings such as the bot token live
+    in the "meta" table. If pack is given, the JSON column holds pack(record)
+    instead of the full record.
+    """
+
+    def __init__(self, db_path, pack=None):
+        self.db_path = db_path
+        self.pack = pack
+        # Every write happens on the store's writer thread, not the thread that opened the connection
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+        # write() only needs the dirty players and compact() just checkpoints the WAL
+        self.incremental = True
+        self.snapshot_compaction = False
+
+    def _create_tables(self):
+        stat_columns = "".join(f", {stat} NUMERIC NOT NULL DEFAULT 0" for stat in INDEXED_STATS)
+        with self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS players (user_id TEXT PRIMARY KEY{stat_columns}, data TEXT NOT NULL)")
+            for stat in INDEXED_STATS:
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS players_{stat} ON players ({stat})")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def load(self):
+        """Read every player (and the meta settings) into a data.json-shaped dict."""
+        data = {key: json_codec.loads(value) for key, value in self.conn.execute("SELECT key, value FROM meta")}
+        data["players"] = {user_id: json_codec.loads(player) for user_id, player in self.conn.execute("SELECT user_id, data FROM players")}
+        return data
+
+    def write(self, data, dirty):
+        """Upsert the rows of the players whose IDs are in dirty, in one transaction."""
+        players = data["players"]
+        self.write_players((user_id, players[user_id]) for user_id in dirty if user_id in players)
+
+    def write_players(self, items):
+        """Upsert (user_id, record) pairs in one transaction."""
+        columns = ", ".join(INDEXED_STATS)
+        placeholders = ", ".join("?" for _ in INDEXED_STATS)
+        updates = ", ".join(f"{stat} = excluded.{stat}" for stat in INDEXED_STATS)
+        sql = (
+            f"INSERT INTO players (user_id, {columns}, data) VALUES (?, {placeholders}, ?) "
+            f"ON CONFLICT(user_id) DO UPDATE SET {updates}, data = excluded.data"
+        )
+        pack = self.pack or (lambda player: player)
+        rows = (
+            (user_id, *(_column_value(player.get(stat, 0)) for stat in INDEXED_STATS), json_codec.dumps(pack(player)).decode())
+            for user_id, player in items
+        )
+        with self.conn:
+            self.conn.executemany(sql, rows)
+
+    def write_meta(self, key, value):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json_codec.dumps(value).decode()))
+
+    def top(self, category, limit=10):
+        """Return the user IDs with the highest value for an indexed stat."""
+        if category not in INDEXED_STATS:
+            raise ValueError(f"{category} is not an indexed stat")
+        rows = self.conn.execute(f"SELECT user_id FROM players ORDER BY {category} DESC LIMIT ?", (limit,))
+        return [user_id for (user_id,) in rows]
+
+    def compact(self, data):
+        # Fold the WAL back into the main database file
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        self.conn.close()
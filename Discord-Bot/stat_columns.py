@@ -0,0 +1,135 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+AVAILABLE = np is not None
+
+
+class StatColumns:
+    """One NumPy array per stat, a row per player, for store-wide questions.
+
+    Top-k, percentiles and totals are vectorized over the arrays, so they cost
+    milliseconds even at a million players instead of a Python loop over every
+    record. Values are held as float64 (exact for counts up to 2**53); anything
+    that isn't a number is kept as NaN and left out of the results. The store
+    calls update() whenever a player is marked dirty, as it does for its RankIndex
+    objects. Needs NumPy; check AVAILABLE first.
+    """
+
+    MIN_CAPACITY = 1024
+
+    def __init__(self, stats):
+        if np is None:
+            raise RuntimeError("StatColumns needs numpy")
+        self.stats = tuple(stats)
+        self.version = 0  # Bumped on every change, so callers can cache results
+
+        self._rows = {}  # user_id -> row
+        self._user_ids = []  # row -> user_id
+        self._columns = {stat: np.zeros(self.MIN_CAPACITY) for stat in self.stats}
+
+    def __len__(self):
+        return len(self._user_ids)
+
+    def __contains__(self, user_id):
+        return user_id in self._rows
+
+    def build(self, players):
+        """Replace the contents with (user_id, record) pairs, one column at a time."""
+        # Two flat lists rather than a list of pairs: a million tuples would set off
+        # full garbage collections over every player record while this runs
+        user_ids, records = [], []
+        for user_id, player_data in players:
+            user_ids.append(user_id)
+            records.append(player_data)
+        self._user_ids = user_ids
+        self._rows = dict(zip(user_ids, range(len(user_ids))))
+
+        capacity = max(self.MIN_CAPACITY, len(records))
+        for stat in self.stats:
+            column = self._columns[stat] = np.zeros(capacity)
+            values = [player_data.get(stat, 0) for player_data in records]
+            try:
+                column[:len(records)] = values
+            except (TypeError, ValueError, OverflowError):
+                column[:len(records)] = [_number(value) for value in values]  # Some value isn't a plain number
+        self.version += 1
+
+    def update(self, user_id, player_data):
+        """Copy a player's stats into their row, adding the row if they are new."""
+        row = self._rows.get(user_id)
+        if row is None:
+            row = self._rows[user_id] = len(self._user_ids)
+            self._user_ids.append(user_id)
+            if row == len(self._columns[self.stats[0]]):
+                for stat, column in self._columns.items():
+                    self._columns[stat] = np.concatenate((column, np.zeros(len(column))))
+        for stat, column in self._columns.items():
+            column[row] = _number(player_data.get(stat, 0))
+        self.version += 1
+
+    def remove(self, user_id):
+        """Drop a player, moving the last row into their place."""
+        row = self._rows.pop(user_id, None)
+        if row is None:
+            return
+        last = len(self._user_ids) - 1
+        moved = self._user_ids.pop()
+        if row != last:
+            self._user_ids[row] = moved
+            self._rows[moved] = row
+            for column in self._columns.values():
+                column[row] = column[last]
+        self.version += 1
+
+    def column(self, stat):
+        """The live values of stat, one per player (a view; don't modify it)."""
+        return self._columns[stat][:len(self._user_ids)]
+
+    def top(self, stat, limit=10):
+        """(user_id, value) pairs for the highest values of stat, highest first."""
+        values = self.column(stat)
+        limit = min(limit, len(values))
+        if limit == 0:
+            return []
+        # argpartition finds the top rows in linear time; only those get sorted. NaN sorts last.
+        keys = -values
+        rows = np.argpartition(keys, limit - 1)[:limit] if limit < len(values) else np.arange(len(values))
+        rows = rows[np.argsort(keys[rows], kind="stable")]
+        return [(self._user_ids[row], values[row].item()) for row in rows if not np.isnan(values[row])]
+
+    def percentiles(self, stat, percents=(50, 90, 99)):
+        """{percent: value} for stat across all players."""
+        values = self.column(stat)
+        if not len(values):
+            return {percent: 0.0 for percent in percents}
+        results = np.nanpercentile(values, percents)
+        return {percent: result.item() for percent, result in zip(percents, results)}
+
+    def summary(self, stat):
+        """Player count, total, mean, min and max of stat."""
+        values = self.column(stat)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return {"count": 0, "total": 0.0, "mean": 0.0, "min": 0.0, "max": 0.0}
+        return {
+            "count": len(values),
+            "total": values.sum().item(),
+            "mean": values.mean().item(),
+            "min": values.min().item(),
+            "max": values.max().item(),
+        }
+
+    def distribution(self, stat):
+        """{value: number of players} for a stat with few distinct values, e.g. rebirths."""
+        values = self.column(stat)
+        values, counts = np.unique(values[~np.isnan(values)], return_counts=True)
+        return {value.item(): count.item() for value, count in zip(values, counts)}
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        return float("nan")
@@ -0,0 +1,108 @@
+"""Stress test for PlayerStore.transaction(): no update may be lost under interleaved coroutines.
+
+Usage: python stress_test.py (or collect it with pytest)
+
+Farm, sell and milk-collect coroutines for a handful of players are fired all
+at once, each awaiting in the middle of its read-modify-write the way the
+commands and button callbacks do, while the store flushes and compacts in the
+background. Every coroutine adds the delta it applied to a tally once its
+transaction has committed, and at the end each player's fields, in memory and
+reloaded from disk, must equal the sum of those deltas.
+"""
+import asyncio
+import os
+import random
+import tempfile
+
+from player_schema import Player, migrate_player, new_player, pack_player
+from player_store import JsonBackend, PlayerStore
+
+
+PLAYERS = 20
+OPERATIONS = 3000
+WHEAT_PRICE = 3
+TALLIED = ("wheat", "money", "milk", "farm_usage_count")
+
+
+async def _pause(rng):
+    # Hands the event loop to the other coroutines halfway through an update
+    await asyncio.sleep(rng.random() * 0.001)
+
+
+async def _farm(store, user_id, rng, tally):
+    gathered = rng.randint(1, 10)
+    async with store.transaction(user_id) as player_data:
+        wheat = player_data.wheat
+        await _pause(rng)
+        player_data.wheat = wheat + gathered
+        player_data.farm_usage_count += 1
+    tally[user_id]["wheat"] += gathered
+    tally[user_id]["farm_usage_count"] += 1
+
+
+async def _sell(store, user_id, rng, tally):
+    async with store.transaction(user_id) as player_data:
+        wheat = player_data.wheat
+        await _pause(rng)
+        player_data.wheat -= wheat
+        player_data.money += wheat * WHEAT_PRICE
+    tally[user_id]["wheat"] -= wheat
+    tally[user_id]["money"] += wheat * WHEAT_PRICE
+
+
+async def _collect(store, user_id, rng, tally):
+    async with store.transaction(user_id) as player_data:
+        await _pause(rng)
+        player_data.milk += 1
+    tally[user_id]["milk"] += 1
+
+
+def _open_store(directory):
+    backend = JsonBackend(os.path.join(directory, "data.json"), journal_path=os.path.join(directory, "data.json.journal"),
+                          pack=pack_player)
+    return PlayerStore(backend, flush_interval=0.01, compact_interval=0.05, migrate=migrate_player, record=Player.from_dict)
+
+
+def _check(store, tally, where):
+    for user_id, expected in tally.items():
+        player_data = store.view(user_id)
+        for field in TALLIED:
+            assert player_data[field] == expected[field], f"{where}: player {user_id} has {field}={player_data[field]}, expected {expected[field]}"
+
+
+async def _run(store, seed):
+    rng = random.Random(seed)
+    tally = {}
+    for number in range(PLAYERS):
+        user_id = str(number)
+        store.add(user_id, new_player(f"player{number}"))
+        tally[user_id] = dict.fromkeys(TALLIED, 0)
+
+    store.start()  # Flushes and compactions run in between the transactions
+    operations = [rng.choice((_farm, _sell, _collect))(store, rng.choice(list(tally)), rng, tally) for _ in range(OPERATIONS)]
+    await asyncio.gather(*operations)
+    _check(store, tally, "in memory")
+    return tally
+
+
+def run_stress_test(seed=1):
+    """Run the test and return the tally of applied deltas per player."""
+    with tempfile.TemporaryDirectory() as directory:
+        store = _open_store(directory)
+        tally = asyncio.run(_run(store, seed))
+        store.close()
+
+        store = _open_store(directory)
+        _check(store, tally, "after reloading")
+        store.close()
+    return tally
+
+
+def test_no_lost_updates():
+    run_stress_test()
+
+
+if __name__ == "__main__":
+    tally = run_stress_test()
+    farms = sum(expected["farm_usage_count"] for expected in tally.values())
+    print(f"{OPERATIONS} interleaved operations across {PLAYERS} players ({farms} farms), no lost updates")
@@ -0,0 +1,63 @@
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class Upgrade:
+    """One shop upgrade, priced as int(base * growth ** level + level * linear).
+
+    Prices and running totals for every level are worked out once, so the cost of
+    buying several levels, or how many levels a balance can afford, is a lookup
+    instead of a loop over price calls.
+    """
+
+    def __init__(self, key, name, base, growth, linear, max_level, unlock_rebirths=0):
+        self.key = key  # Level field in the player's data
+        self.name = name
+        self.base = base
+        self.growth = growth
+        self.linear = linear
+        self.max_level = max_level
+        self.unlock_rebirths = unlock_rebirths
+
+        self.prices = [self.price(level) for level in range(max_level)]
+        self.cumulative = [0, *accumulate(self.prices)]  # cumulative[n] = cost of levels 0..n-1
+
+    def price(self, level):
+        """Price of going from level to level + 1."""
+        return int(self.base * (self.growth ** level) + (level * self.linear))
+
+    def cost(self, level, count):
+        """Total price of buying count levels starting at level."""
+        return self.cumulative[level + count] - self.cumulative[level]
+
+    def affordable(self, level, money, limit=None):
+        """How many levels (up to limit and the max level) money buys starting at level."""
+        level = min(level, self.max_level)
+        count = bisect_right(self.cumulative, money + self.cumulative[level]) - 1 - level
+        if limit is not None:
+            count = min(count, limit)
+        return max(0, count)
+
+
+# Every upgrade, declared once, in shop order
+UPGRADES = {upgrade.key: upgrade for upgrade in (
+    Upgrade("farming_cooldown_level", "Cooldown Upgrade", 250, 1.5, 100, 20),
+
+    Upgrade("wheat_upgrade_level", "Wheat Yield Upgrade", 50, 1.3, 10, 100),
+    Upgrade("wood_upgrade_level", "Wood Yield Upgrade", 80, 1.3, 20, 100),
+    Upgrade("stone_upgrade_level", "Stone Yield Upgrade", 120, 1.4, 30, 100, unlock_rebirths=5),
+    Upgrade("hardwood_upgrade_level", "Hardwood Yield Upgrade", 160, 1.4, 40, 100, unlock_rebirths=10),
+    Upgrade("iron_ore_upgrade_level", "Iron Ore Yield Upgrade", 200, 1.5, 50, 100, unlock_rebirths=15),
+    Upgrade("silver_ore_upgrade_level", "Silver Ore Yield Upgrade", 250, 1.6, 60, 100, unlock_rebirths=20),
+    Upgrade("gold_ore_upgrade_level", "Gold Ore Yield Upgrade", 300, 1.7, 70, 100, unlock_rebirths=25),
+
+    Upgrade("wheat_price_upgrade_level", "Wheat Price Upgrade", 50, 1.4, 10, 100),
+    Upgrade("wood_price_upgrade_level", "Wood Price Upgrade", 80, 1.4, 15, 100),
+    Upgrade("stone_price_upgrade_level", "Stone Price Upgrade", 120, 1.5, 25, 100, unlock_rebirths=5),
+    Upgrade("hardwood_price_upgrade_level", "Hardwood Price Upgrade", 160, 1.5, 35, 100, unlock_rebirths=10),
+    Upgrade("iron_ore_price_upgrade_level", "Iron Ore Price Upgrade", 200, 1.6, 45, 100, unlock_rebirths=15),
+    Upgrade("silver_ore_price_upgrade_level", "Silver Ore Price Upgrade", 250, 1.7, 55, 100, unlock_rebirths=20),
+    Upgrade("gold_ore_price_upgrade_level", "Gold Ore Price Upgrade", 300, 1.8, 65, 100, unlock_rebirths=25),
+
+    Upgrade("milk_price_upgrade_level", "Milk Price Upgrade", 300, 1.6, 75, 50),
+)}